@@ -0,0 +1,29 @@
+# -*- coding: utf-8 -*-
+"""
+Command line tools, run as ``python -m papersizes <command>``.
+"""
+import argparse
+import sys
+
+from . import catalogfile
+from . import scan
+from . import service
+
+def main(argv=None):
+    """Parses the command line and runs the command it names."""
+    parser = argparse.ArgumentParser(
+        prog='python -m papersizes',
+        description='Tools for working with paper sizes.')
+    commands = parser.add_subparsers(dest='command', metavar='command')
+    scan.add_command(commands)
+    service.add_command(commands)
+    catalogfile.add_command(commands)
+
+    args = parser.parse_args(argv)
+    if args.command is None:
+        parser.print_help()
+        return 2
+    return args.run(args)
+
+if __name__ == '__main__':
+    sys.exit(main())
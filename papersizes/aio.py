@@ -0,0 +1,284 @@
+# -*- coding: utf-8 -*-
+"""
+Batched size resolution for ``asyncio`` programs.
+
+When many coroutines each need one size parsed or classified, calling
+the scalar functions one at a time misses the savings of the batch
+functions, which handle repeated values once and share their setup.
+:class:`AsyncSizeResolver` collects the requests made within a short
+window, or until a batch is full, resolves them together, and gives
+each coroutine its own result.
+
+.. code-block:: python
+
+    from papersizes.aio import AsyncSizeResolver
+
+    resolver = AsyncSizeResolver()
+
+    async def handle(request):
+        size = await resolver.paper_size(request.query['size'])
+        return await resolver.classify(size)
+
+Batches are resolved on the event loop by default, which suits the
+small batches of a few hundred sizes that the window usually collects.
+Given an ``executor``, they are resolved in it instead, leaving the
+event loop free while larger batches are worked on.
+"""
+import asyncio
+import collections
+import math
+
+from . import approx
+from . import match
+from . import parse
+from . import ratios
+from .papersize import PaperSize
+from .units import mm
+
+# ----------------------------------------------------------------------------
+# Resolver.
+# ----------------------------------------------------------------------------
+
+class SizeClass(collections.namedtuple(
+        'SizeClass', 'name ratio ratio_error scaled')):
+    """The classification of a size.
+
+    ``name`` is its catalog name, as given by
+    :func:`papersizes.approx.catalog_name`. ``ratio`` and
+    ``ratio_error`` are its nearest ratio, as given by
+    :func:`papersizes.ratios.classify_ratio`. ``scaled`` is the
+    :class:`~papersizes.match.ScaledMatch` of the catalog size it is a
+    scaled copy of, or ``None``.
+    """
+    __slots__ = ()
+
+class BatchStats(object):
+    """Counts of the requests and batches resolved for one method."""
+    def __init__(self):
+        self.requests = 0
+        self.batches = 0
+
+    @property
+    def mean_batch(self):
+        """The mean number of requests in each batch."""
+        return self.requests / self.batches if self.batches else 0.0
+
+class AsyncSizeResolver(object):
+    """Resolves sizes for many coroutines, in batches.
+
+    Each method can raise ``ValueError`` if its argument can't be
+    resolved, such as a size that isn't finite and positive. Errors are
+    recorded for each request, so the other requests in the batch are
+    unaffected.
+
+    Arguments:
+
+    ``window``
+        The longest time, in seconds, a request waits for others to be
+        batched with it.
+
+    ``max_batch``
+        The most requests resolved in one batch. A batch is resolved as
+        soon as it is this big, without waiting for the window.
+
+    ``executor``
+        If given, a ``concurrent.futures`` executor to resolve batches
+        in, rather than on the event loop.
+
+    ``tolerance``
+        The tolerance for naming sizes from the catalog.
+    """
+    def __init__(self, window=0.001, max_batch=256, executor=None,
+                 tolerance=0.5*mm):
+        self.window = window
+        self.max_batch = max_batch
+        self.executor = executor
+        self.tolerance = tolerance
+        self.stats = {}
+        self._batchers = {}
+        for method, function in (
+                ('paper_size', _paper_sizes),
+                ('dimension', _dimensions),
+                ('name', self._names),
+                ('classify', self._classify)):
+            self.stats[method] = BatchStats()
+            self._batchers[method] = _Batcher(self, function, method)
+
+    async def paper_size(self, size_string):
+        """Parses a size string, as :func:`papersizes.parse.paper_size`."""
+        return await self._batchers['paper_size'].submit(size_string)
+
+    async def dimension(self, size_string):
+        """Parses a dimension, as :func:`papersizes.parse.dimension`."""
+        return await self._batchers['dimension'].submit(size_string)
+
+    async def name(self, size):
+        """Names a size from the catalog, or returns ``None``."""
+        return await self._batchers['name'].submit(size)
+
+    async def classify(self, size):
+        """Classifies a size, returning a :class:`SizeClass`."""
+        return await self._batchers['classify'].submit(size)
+
+    def _names(self, values):
+        results = []
+        for value in values:
+            try:
+                size = _size(value)
+                results.append(
+                    (approx.catalog_name(size, self.tolerance), None))
+            except Exception as error:
+                results.append((None, _message(error, value)))
+        return results
+
+    def _classify(self, values):
+        sizes = []
+        results = [None] * len(values)
+        for index, value in enumerate(values):
+            try:
+                sizes.append((index, _size(value)))
+            except ValueError as error:
+                results[index] = None, str(error)
+        only_sizes = [size for _, size in sizes]
+        try:
+            classes = ratios.classify_ratio(only_sizes)
+            matches = match.match_scaled(only_sizes)
+        except Exception:
+            # Classify one at a time, so a bad size fails only itself.
+            classes, matches = [], []
+            for index, size in sizes:
+                try:
+                    classes.append(ratios.classify_ratio([size])[0])
+                    matches.append(match.match_scaled([size])[0])
+                except Exception as error:
+                    results[index] = None, _message(error, size)
+                    classes.append(None)
+                    matches.append(None)
+        for (index, size), ratio_class, scaled in zip(
+                sizes, classes, matches):
+            if ratio_class is None:
+                continue
+            try:
+                name = approx.catalog_name(size, self.tolerance)
+            except Exception as error:
+                results[index] = None, _message(error, size)
+                continue
+            results[index] = SizeClass(
+                name, ratio_class[0], ratio_class[1], scaled), None
+        return results
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+class _Batcher(object):
+    """Collects the values submitted to one method into batches.
+
+    The function takes a list of values and returns a list of (result,
+    error) pairs, with error a message or None.
+    """
+    def __init__(self, resolver, function, method):
+        self.resolver = resolver
+        self.function = function
+        self.stats = resolver.stats[method]
+        self._waiting = []
+        self._timer = None
+
+    def submit(self, value):
+        """Returns a future for the result for one value."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._waiting.append((value, future))
+        if len(self._waiting) >= self.resolver.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.resolver.window, self._flush)
+        return future
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._waiting = self._waiting, []
+        if not batch:
+            return
+        self.stats.batches += 1
+        self.stats.requests += len(batch)
+        values = [value for value, _ in batch]
+        if self.resolver.executor is None:
+            try:
+                results = self.function(values)
+            except Exception as error:
+                _fail(batch, error)
+            else:
+                _resolve(batch, results)
+        else:
+            done = asyncio.get_running_loop().run_in_executor(
+                self.resolver.executor, self.function, values)
+            def _finished(done):
+                if done.cancelled():
+                    _fail(batch, asyncio.CancelledError())
+                elif done.exception() is not None:
+                    _fail(batch, done.exception())
+                else:
+                    _resolve(batch, done.result())
+            done.add_done_callback(_finished)
+
+def _resolve(batch, results):
+    """Gives each waiting future its result, or its error."""
+    for (_, future), (result, error) in zip(batch, results):
+        if future.done():
+            continue
+        if error is None:
+            future.set_result(result)
+        else:
+            future.set_exception(ValueError(error))
+
+def _fail(batch, error):
+    """Gives every waiting future the same exception."""
+    for _, future in batch:
+        if not future.done():
+            future.set_exception(error)
+
+def _size(value):
+    """Checks a (width, height) size is finite and positive."""
+    try:
+        width, height = value
+        width, height = float(width), float(height)
+    except (TypeError, ValueError):
+        raise ValueError('not a (width, height) size: {0!r}'.format(value))
+    if not (width > 0 and height > 0 and
+            math.isfinite(width) and math.isfinite(height)):
+        raise ValueError(
+            'sizes must be finite and positive: {0!r}'.format(value))
+    return PaperSize(width, height)
+
+def _message(error, value):
+    """The error message for a value that couldn't be resolved."""
+    if isinstance(error, ValueError):
+        return str(error)
+    return 'cannot resolve {0!r}'.format(value)
+
+def _parsed(function, values):
+    """Applies a parsing function to each distinct value."""
+    seen = {}
+    results = []
+    for value in values:
+        try:
+            result = seen[value]
+        except TypeError:
+            result = None, 'not a string: {0!r}'.format(value)
+        except KeyError:
+            try:
+                result = function(value), None
+            except Exception:
+                result = None, 'cannot parse {0!r}'.format(value)
+            seen[value] = result
+        results.append(result)
+    return results
+
+def _paper_sizes(values):
+    return _parsed(parse.paper_size, values)
+
+def _dimensions(values):
+    return _parsed(parse.dimension, values)
@@ -0,0 +1,266 @@
+# -*- coding: utf-8 -*-
+"""
+Containers that treat approximately equal paper sizes as the same key.
+
+:class:`~papersizes.papersize.PaperSize` hashes on its exact dimensions,
+so sizes that differ only by rounding (595.2756 and 595.28pt, say) are
+different dictionary keys. The containers in this module divide the
+plane into a grid of cells as wide as the tolerance. A size can only be
+within tolerance of sizes in its own or a neighbouring cell, so lookup
+and insertion only examine those nine cells.
+"""
+import collections
+import collections.abc
+import math
+
+from . import catalog
+from .papersize import PaperSize
+from .units import mm
+
+# ----------------------------------------------------------------------------
+# Approximate containers.
+# ----------------------------------------------------------------------------
+
+class ApproxSizeDict(collections.abc.MutableMapping):
+    """A dictionary keyed by paper sizes, matched within a tolerance.
+
+    Two sizes are the same key if both their widths and their heights
+    differ by no more than the tolerance, as for
+    :meth:`~papersizes.papersize.PaperSize.is_approximately`. The first
+    size stored for a key is kept as its representative, and is what
+    iteration returns.
+
+    Orientation matters: a size and its flipped version are different
+    keys.
+
+    Arguments:
+
+    ``items``
+        Optional initial contents, as a mapping or (size, value) pairs.
+
+    ``tolerance``
+        The tolerance, in points. Defaults to 0.1mm.
+    """
+    def __init__(self, items=(), tolerance=0.1*mm):
+        if tolerance <= 0:
+            raise ValueError('tolerance must be positive')
+        self.tolerance = tolerance
+        self._cells = {}
+        self._length = 0
+        self.update(items)
+
+    def find_key(self, size):
+        """Returns the stored size matching the given size, or ``None``."""
+        entry = self._find(size[0], size[1])
+        return None if entry is None else entry[0]
+
+    def find_item(self, size):
+        """Returns the (stored size, value) matching a size, or ``None``."""
+        entry = self._find(size[0], size[1])
+        return None if entry is None else tuple(entry)
+
+    def __getitem__(self, size):
+        entry = self._find(size[0], size[1])
+        if entry is None:
+            raise KeyError(size)
+        return entry[1]
+
+    def __setitem__(self, size, value):
+        width, height = size[0], size[1]
+        entry = self._find(width, height)
+        if entry is None:
+            key = PaperSize(width, height)
+            self._cells.setdefault(self._cell(width, height), []).append(
+                [key, value])
+            self._length += 1
+        else:
+            entry[1] = value
+
+    def __delitem__(self, size):
+        width, height = size[0], size[1]
+        for cell, entries in self._neighbours(width, height):
+            for index, entry in enumerate(entries):
+                if self._matches(entry[0], width, height):
+                    del entries[index]
+                    if not entries:
+                        del self._cells[cell]
+                    self._length -= 1
+                    return
+        raise KeyError(size)
+
+    def __contains__(self, size):
+        return self._find(size[0], size[1]) is not None
+
+    def __iter__(self):
+        for entries in self._cells.values():
+            for key, _ in entries:
+                yield key
+
+    def __len__(self):
+        return self._length
+
+    def __repr__(self):
+        return '{0}({1!r}, tolerance={2!r})'.format(
+            type(self).__name__, dict(self.items()), self.tolerance)
+
+    def _cell(self, width, height):
+        """The grid cell holding the given dimensions."""
+        tolerance = self.tolerance
+        return math.floor(width / tolerance), math.floor(height / tolerance)
+
+    def _neighbours(self, width, height):
+        """Generates the (cell, entries) that could match a size."""
+        cells = self._cells
+        x, y = self._cell(width, height)
+        for cell in ((x, y), (x-1, y-1), (x, y-1), (x+1, y-1), (x-1, y),
+                     (x+1, y), (x-1, y+1), (x, y+1), (x+1, y+1)):
+            entries = cells.get(cell)
+            if entries is not None:
+                yield cell, entries
+
+    def _matches(self, key, width, height):
+        """Check if the stored key is within tolerance of a size."""
+        tolerance = self.tolerance
+        return abs(key[0] - width) <= tolerance and \
+            abs(key[1] - height) <= tolerance
+
+    def _find(self, width, height):
+        """Returns the [key, value] entry matching a size, or None."""
+        for _, entries in self._neighbours(width, height):
+            for entry in entries:
+                if self._matches(entry[0], width, height):
+                    return entry
+        return None
+
+class ApproxSizeCounter(ApproxSizeDict):
+    """Counts paper sizes, treating approximately equal sizes as one.
+
+    This is intended for building histograms of page sizes from large
+    archives, where the same nominal size turns up with many slightly
+    different dimensions.
+
+    As with ``collections.Counter``, indexing with a size that hasn't
+    been counted gives 0, without adding it; ``get``, ``pop`` and
+    ``setdefault`` behave as for a dictionary.
+    """
+    def __getitem__(self, size):
+        entry = self._find(size[0], size[1])
+        return 0 if entry is None else entry[1]
+
+    def get(self, size, default=None):
+        """Returns the count of a size, or ``default`` if it isn't counted.
+
+        Indexing a counter with a size it hasn't counted gives 0.
+        """
+        entry = self._find(size[0], size[1])
+        return default if entry is None else entry[1]
+
+    def pop(self, size, *default):
+        """Removes a size, returning its count, or ``default``."""
+        if self._find(size[0], size[1]) is None:
+            if default:
+                return default[0]
+            raise KeyError(size)
+        count = self[size]
+        del self[size]
+        return count
+
+    def setdefault(self, size, default=None):
+        """Returns the count of a size, counting it as ``default`` if new."""
+        entry = self._find(size[0], size[1])
+        if entry is None:
+            self[size] = default
+            return default
+        return entry[1]
+
+    def add(self, size, count=1):
+        """Adds the given count to a size."""
+        width, height = size[0], size[1]
+        entry = self._find(width, height)
+        if entry is None:
+            self[size] = count
+        else:
+            entry[1] += count
+
+    def update(self, items=()):
+        """Adds counts from another counter or mapping, or sizes to count.
+
+        Given a mapping, its values are added to the counts of its
+        sizes. Given any other iterable, each size it yields is counted
+        once.
+        """
+        if hasattr(items, 'items'):
+            for size, count in items.items():
+                self.add(size, count)
+        else:
+            add = self.add
+            for size in items:
+                add(size)
+
+    def most_common(self, n=None):
+        """Returns (size, count) pairs, most common first."""
+        ordered = sorted(self.items(), key=lambda item: -item[1])
+        return ordered if n is None else ordered[:n]
+
+    def report(self):
+        """Returns (name, size, count) tuples, most common first.
+
+        Sizes that match a catalog size within the tolerance are named
+        by :func:`catalog_name`, and their counts merged, so every
+        variant of A4 is reported as a single ``'A4'`` line. Unnamed
+        sizes are reported individually with the name ``None``.
+        """
+        named = collections.OrderedDict()
+        unnamed = []
+        for size, count in self.items():
+            name = catalog_name(size, self.tolerance)
+            if name is None:
+                unnamed.append((None, size, count))
+            elif name in named:
+                named[name][2] += count
+            else:
+                named[name] = [name, size, count]
+        lines = [tuple(line) for line in named.values()] + unnamed
+        lines.sort(key=lambda line: -line[2])
+        return lines
+
+# ----------------------------------------------------------------------------
+# Catalog names.
+# ----------------------------------------------------------------------------
+
+def catalog_name(size, tolerance=0.1*mm):
+    """Returns the catalog name of a size, within the given tolerance.
+
+    Sizes matching a catalog size in its other orientation are named
+    with a ``' landscape'`` or ``' portrait'`` suffix, so the names can
+    be given to :func:`papersizes.parse.paper_size`. Returns ``None``
+    if no catalog size matches.
+    """
+    names = _catalog_names(tolerance)
+    width, height = size[0], size[1]
+    entry = names.find_item((width, height))
+    if entry is not None:
+        return entry[1]
+    entry = names.find_item((height, width))
+    if entry is not None:
+        if width > height:
+            return entry[1] + ' landscape'
+        else:
+            return entry[1] + ' portrait'
+    return None
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_catalog_names_by_tolerance = {}
+def _catalog_names(tolerance):
+    """Returns an ApproxSizeDict of catalog names for a tolerance."""
+    names = _catalog_names_by_tolerance.get(tolerance)
+    if names is None:
+        names = ApproxSizeDict(tolerance=tolerance)
+        for name, size in catalog.canonical_entries():
+            if size not in names:
+                names[size] = name
+        _catalog_names_by_tolerance[tolerance] = names
+    return names
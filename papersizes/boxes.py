@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+The nested boxes of a printed page: trim, bleed, slug, safe area and the
+printer's imageable area.
+
+A page is cut to its trim size, but the artwork is printed beyond it
+into the bleed, and marks and notes go further out still, in the slug.
+Inside the trim, important content is kept within the safe area. The
+sheet the page is printed on (the media) must hold all of this, and the
+printer can only print within its imageable area of that sheet.
+
+:class:`PageBoxes` gives all of these as rectangles for one page, in the
+coordinates of its media, and :class:`PageBoxesArray` does the same for
+whole documents, holding its pages as arrays of numbers rather than
+objects. Every margin can be different on each side.
+
+.. code-block:: python
+
+    from papersizes import boxes, papersizes
+    from papersizes.units import mm
+
+    page = boxes.PageBoxes(papersizes.A5, bleed=3*mm, safe=5*mm)
+    print(page.media_size, page.trim_box)
+"""
+import array
+
+from .papersize import PaperSize, Margins
+
+# ----------------------------------------------------------------------------
+# Single pages.
+# ----------------------------------------------------------------------------
+
+BOXES = ('media', 'bleed', 'trim', 'safe', 'imageable')
+"""The names of the boxes of a page, from the outside in.
+
+The slug box is the media box, since the slug is the outermost margin.
+"""
+
+MARGINS = ('bleed', 'slug', 'safe', 'printer')
+"""The names of the margins that define a page's boxes."""
+
+class PageBoxes(object):
+    """The boxes of a single page, derived from its trim size.
+
+    Boxes are (x0, y0, x1, y1) rectangles, as in a PDF, with the origin at
+    the bottom left of the media.
+
+    Arguments:
+
+    ``trim_size``
+        The finished size of the page, as a
+        :class:`~papersizes.papersize.PaperSize` or (width, height).
+
+    ``bleed``
+        How far the artwork extends beyond the trim.
+
+    ``slug``
+        The space beyond the bleed, for printer's marks and notes.
+
+    ``safe``
+        How far inside the trim important content is kept.
+
+    ``printer``
+        The margins of the media the printer can't print on.
+
+    Each margin can be a single width for every side, or a
+    (left, bottom, right, top) tuple or
+    :class:`~papersizes.papersize.Margins`.
+    """
+    __slots__ = ('trim_size', 'bleed', 'slug', 'safe', 'printer')
+
+    def __init__(self, trim_size, bleed=0.0, slug=0.0, safe=0.0,
+                 printer=0.0):
+        self.trim_size = PaperSize(*trim_size)
+        self.bleed = Margins.from_value(bleed)
+        self.slug = Margins.from_value(slug)
+        self.safe = Margins.from_value(safe)
+        self.printer = Margins.from_value(printer)
+
+    @property
+    def media_size(self):
+        """The size of media needed for the trim, bleed and slug."""
+        width, height = self.trim_size
+        return PaperSize(
+            width + self.bleed.left + self.bleed.right +
+            self.slug.left + self.slug.right,
+            height + self.bleed.bottom + self.bleed.top +
+            self.slug.bottom + self.slug.top)
+
+    @property
+    def media_box(self):
+        """The whole media, which is also the slug box."""
+        return (0.0, 0.0) + tuple(self.media_size)
+
+    @property
+    def bleed_box(self):
+        """The area the artwork is printed in."""
+        width, height = self.media_size
+        slug = self.slug
+        return (slug.left, slug.bottom,
+                width - slug.right, height - slug.top)
+
+    @property
+    def trim_box(self):
+        """The finished page, after it is cut."""
+        x0 = self.slug.left + self.bleed.left
+        y0 = self.slug.bottom + self.bleed.bottom
+        return (x0, y0, x0 + self.trim_size.width,
+                y0 + self.trim_size.height)
+
+    @property
+    def safe_box(self):
+        """The area of the trim that important content is kept within."""
+        return _inset(self.trim_box, self.safe)
+
+    @property
+    def imageable_box(self):
+        """The area of the media the printer can print on."""
+        return _inset(self.media_box, self.printer)
+
+    def box(self, name):
+        """Returns the box with the given name, one of :data:`BOXES`."""
+        if name not in BOXES:
+            raise ValueError('unknown box: {0!r}'.format(name))
+        return getattr(self, name + '_box')
+
+    def boxes(self):
+        """Returns a dictionary of every box, keyed by name."""
+        return dict((name, self.box(name)) for name in BOXES)
+
+    def is_printable(self):
+        """Check if the printer can print the whole bleed box."""
+        bleed = self.bleed_box
+        imageable = self.imageable_box
+        return imageable[0] <= bleed[0] and imageable[1] <= bleed[1] and \
+            imageable[2] >= bleed[2] and imageable[3] >= bleed[3]
+
+    def mirrored(self):
+        """Returns the boxes for the facing page.
+
+        The left and right sides of the bleed, slug and safe margins are
+        swapped, so that margins given for a right hand page become
+        those of a left hand page. The printer's margins are unchanged.
+        """
+        return PageBoxes(
+            self.trim_size, _mirror(self.bleed), _mirror(self.slug),
+            _mirror(self.safe), self.printer)
+
+    def __eq__(self, other):
+        return isinstance(other, PageBoxes) and \
+            self._values() == other._values()
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self._values())
+
+    def __repr__(self):
+        return 'PageBoxes({0!r}, bleed={1!r}, slug={2!r}, safe={3!r}, ' \
+            'printer={4!r})'.format(*self._values())
+
+    def _values(self):
+        return (self.trim_size, self.bleed, self.slug, self.safe,
+                self.printer)
+
+# ----------------------------------------------------------------------------
+# Whole documents.
+# ----------------------------------------------------------------------------
+
+class PageBoxesArray(object):
+    """The boxes of many pages, stored as arrays of numbers.
+
+    Trim sizes are stored per page. Margins are stored once if every
+    page shares them, or per page if not, so a document of thousands of
+    pages with common margins takes little more than its trim sizes.
+
+    Arguments:
+
+    ``sizes``
+        The trim size of each page.
+
+    ``bleed``, ``slug``, ``safe``, ``printer``
+        The margins shared by every page, as for :class:`PageBoxes`.
+
+    ``mirror``
+        If true, the margins are for right hand pages, and are mirrored
+        on every other page, starting with the second, as for
+        :meth:`PageBoxes.mirrored`.
+    """
+    __slots__ = ('widths', 'heights', 'mirror', '_margins', '_strides')
+
+    def __init__(self, sizes=(), bleed=0.0, slug=0.0, safe=0.0, printer=0.0,
+                 mirror=False):
+        self.widths = array.array('d')
+        self.heights = array.array('d')
+        for width, height in sizes:
+            self.widths.append(width)
+            self.heights.append(height)
+        self.mirror = mirror
+        self._margins = {}
+        self._strides = {}
+        for name, value in zip(MARGINS, (bleed, slug, safe, printer)):
+            self._margins[name] = array.array('d', Margins.from_value(value))
+            self._strides[name] = 0
+
+    @classmethod
+    def from_pages(Class, pages):
+        """Creates an array from a sequence of :class:`PageBoxes`.
+
+        Each page keeps its own margins.
+        """
+        pages = list(pages)
+        result = Class(page.trim_size for page in pages)
+        for name in MARGINS:
+            values = array.array('d')
+            for page in pages:
+                values.extend(getattr(page, name))
+            result._margins[name] = values
+            result._strides[name] = 4
+        return result
+
+    def __len__(self):
+        return len(self.widths)
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('page index out of range')
+        page = PageBoxes(
+            (self.widths[index], self.heights[index]),
+            *[self.margins(name, index) for name in MARGINS])
+        if self.mirror and index % 2:
+            page = page.mirrored()
+        return page
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def margins(self, name, index):
+        """Returns the named margins of a page, before any mirroring."""
+        start = self._strides[name] * index
+        return Margins(*self._margins[name][start:start + 4])
+
+    def media_sizes(self):
+        """Returns arrays of the widths and heights of each page's media."""
+        widths = array.array('d', bytes(8 * len(self)))
+        heights = array.array('d', bytes(8 * len(self)))
+        bleed, slug = self._margins['bleed'], self._margins['slug']
+        bleed_stride, slug_stride = \
+            self._strides['bleed'], self._strides['slug']
+        for index in range(len(self)):
+            b = bleed_stride * index
+            s = slug_stride * index
+            widths[index] = self.widths[index] + \
+                bleed[b] + bleed[b + 2] + slug[s] + slug[s + 2]
+            heights[index] = self.heights[index] + \
+                bleed[b + 1] + bleed[b + 3] + slug[s + 1] + slug[s + 3]
+        return widths, heights
+
+    def box_arrays(self, name):
+        """Computes the named box of every page in one pass.
+
+        Returns four arrays, of the x0, y0, x1 and y1 coordinates of the
+        box on each page.
+        """
+        if name not in BOXES:
+            raise ValueError('unknown box: {0!r}'.format(name))
+        count = len(self)
+        x0s, y0s, x1s, y1s = [
+            array.array('d', bytes(8 * count)) for _ in range(4)]
+        media_widths, media_heights = self.media_sizes()
+        margins = self._margins
+        strides = self._strides
+        for index in range(count):
+            left = 0 if not (self.mirror and index % 2) else 2
+            right = 2 - left
+            slug = strides['slug'] * index
+            bleed = strides['bleed'] * index
+            width, height = media_widths[index], media_heights[index]
+            if name == 'media':
+                box = 0.0, 0.0, width, height
+            elif name == 'imageable':
+                printer = strides['printer'] * index
+                values = margins['printer']
+                box = (values[printer], values[printer + 1],
+                       width - values[printer + 2],
+                       height - values[printer + 3])
+            elif name == 'bleed':
+                values = margins['slug']
+                box = (values[slug + left], values[slug + 1],
+                       width - values[slug + right],
+                       height - values[slug + 3])
+            else:
+                x0 = margins['slug'][slug + left] + \
+                    margins['bleed'][bleed + left]
+                y0 = margins['slug'][slug + 1] + margins['bleed'][bleed + 1]
+                box = (x0, y0, x0 + self.widths[index],
+                       y0 + self.heights[index])
+                if name == 'safe':
+                    safe = strides['safe'] * index
+                    values = margins['safe']
+                    box = (box[0] + values[safe + left],
+                           box[1] + values[safe + 1],
+                           box[2] - values[safe + right],
+                           box[3] - values[safe + 3])
+            x0s[index], y0s[index], x1s[index], y1s[index] = box
+        return x0s, y0s, x1s, y1s
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+def _inset(box, margins):
+    """Returns a box shrunk by the given margins."""
+    return (box[0] + margins.left, box[1] + margins.bottom,
+            box[2] - margins.right, box[3] - margins.top)
+
+def _mirror(margins):
+    """Returns margins with the left and right swapped."""
+    return Margins(margins.right, margins.bottom, margins.left, margins.top)
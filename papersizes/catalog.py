@@ -0,0 +1,362 @@
+# -*- coding: utf-8 -*-
+"""
+The named paper sizes in :mod:`papersizes.papersizes`, as a catalog.
+
+Many of the constants in that module are synonyms for one another (for
+example ``ANSI_A`` is ``LETTER``). Where a single name is needed for a
+size, the catalog uses the first name under which it was defined.
+
+For searching, the catalog is also available as a :class:`Catalog`
+table, with a column for each of the name, family, width, height, ratio,
+area and orientation of its sizes, and sorted indexes on its numeric
+columns. For example, all portrait ISO and JIS sizes between 100mm and
+150mm wide, with a ratio within 2% of the ISO ratio:
+
+.. code-block:: python
+
+    from papersizes import catalog, ratios
+    from papersizes.units import mm
+
+    rows = catalog.query(
+        family=('ISO', 'JIS'), orientation='portrait',
+        width=(100*mm, 150*mm),
+        ratio=catalog.around(ratios.ISO_RATIO, 0.02))
+"""
+import array
+import bisect
+import collections
+import functools
+import re
+
+from . import papersizes
+from .papersize import PaperSize
+
+def entries():
+    """Returns every named size, as (name, size) pairs in definition order.
+
+    This includes synonyms, so the same size may appear more than once.
+    """
+    return _entries
+
+def canonical_entries():
+    """Returns each distinct named size once, as (name, size) pairs.
+
+    Each size is given the first name it was defined under, so
+    ``LETTER`` is used rather than ``ANSI_A``, and ``A4`` rather than
+    ``JIS_A4``.
+    """
+    return _canonical_entries
+
+def canonical_name(size):
+    """Returns the catalog name of the given size, or ``None``.
+
+    The size must match a catalog size exactly, in the same orientation.
+    """
+    return _canonical_names.get((size[0], size[1]))
+
+def name_family(name):
+    """Returns the family of a catalog name, such as ``'ISO'`` for A4.
+
+    The families are those in :data:`FAMILIES`. Names not in any of them,
+    including names that aren't in the catalog, are in ``'OTHER'``.
+    """
+    for pattern, name_family in _FAMILY_PATTERNS:
+        if pattern.match(name):
+            return name_family
+    return 'OTHER'
+
+# ----------------------------------------------------------------------------
+# Querying.
+# ----------------------------------------------------------------------------
+
+FAMILIES = (
+    'ISO', 'JIS', 'SIS', 'US', 'ANSI', 'ARCH', 'ORGANIZER', 'CARD',
+    'CRAFT', 'NEWSPAPER', 'BOOK', 'LULU', 'OTHER')
+"""The families of the sizes in the catalog."""
+
+COLUMNS = (
+    'name', 'family', 'width', 'height', 'ratio', 'area', 'orientation')
+"""The columns of a :class:`Catalog`, in order."""
+
+RANGE_COLUMNS = ('width', 'height', 'ratio', 'area')
+"""The columns of a :class:`Catalog` that can be queried by range."""
+
+class CatalogRow(collections.namedtuple('CatalogRow', COLUMNS)):
+    """One row of a :class:`Catalog`.
+
+    ``ratio`` is the ratio of long to short side, as
+    :attr:`papersizes.papersize.PaperSize.ratio`, and ``orientation`` is
+    one of ``'portrait'``, ``'landscape'`` or ``'square'``.
+    """
+    __slots__ = ()
+
+    @property
+    def size(self):
+        """The row's size, as a ``PaperSize``."""
+        return PaperSize(self.width, self.height)
+
+def around(value, relative):
+    """Returns the range within a fraction of a value, for :meth:`query`.
+
+    So ``around(ratios.ISO_RATIO, 0.02)`` is the range of ratios within
+    2% of the ISO ratio.
+    """
+    return value * (1.0 - relative), value * (1.0 + relative)
+
+class Catalog(object):
+    """Named sizes, stored as columns with sorted indexes.
+
+    Each column is stored as a list, or an ``array('d')`` for numeric
+    columns, so ``catalog.widths[row]`` is the width of a row. The
+    numeric columns in :data:`RANGE_COLUMNS` each have an index sorted by
+    value, and the family and orientation columns each have an index from
+    value to rows, so a query only looks at the rows its most selective
+    condition allows.
+
+    Arguments:
+
+    ``entries``
+        The (name, size) pairs to start with. If not given, every entry
+        in the built-in catalog, as :func:`entries`, including synonyms.
+    """
+    def __init__(self, entries=None):
+        self.names = []
+        self.families = []
+        self.widths = array.array('d')
+        self.heights = array.array('d')
+        self.ratios = array.array('d')
+        self.areas = array.array('d')
+        self.orientations = []
+        self._sorted = dict(
+            (column, ([], [])) for column in RANGE_COLUMNS)
+        self._grouped = {'family': {}, 'orientation': {}}
+        if entries is None:
+            entries = _entries
+        for name, size in entries:
+            self.add(name, size)
+
+    def add(self, name, size, family=None):
+        """Adds a named size, returning its row number.
+
+        ``family`` defaults to the family given by :func:`name_family` for the
+        name. Custom entries can be put in any family, not only those in
+        :data:`FAMILIES`.
+        """
+        width, height = float(size[0]), float(size[1])
+        if width <= 0 or height <= 0:
+            raise ValueError('sizes must be positive: {0!r}'.format(size))
+        if family is None:
+            family = name_family(name)
+        row = len(self.names)
+        values = _row_values(width, height)
+        self.names.append(name)
+        self.families.append(family)
+        self.widths.append(width)
+        self.heights.append(height)
+        self.ratios.append(values['ratio'])
+        self.areas.append(values['area'])
+        self.orientations.append(values['orientation'])
+        for column, (keys, rows) in self._sorted.items():
+            position = bisect.bisect_right(keys, values[column])
+            keys.insert(position, values[column])
+            rows.insert(position, row)
+        self._grouped['family'].setdefault(family, []).append(row)
+        self._grouped['orientation'].setdefault(
+            values['orientation'], []).append(row)
+        return row
+
+    def __len__(self):
+        return len(self.names)
+
+    def __getitem__(self, row):
+        return CatalogRow(
+            self.names[row], self.families[row], self.widths[row],
+            self.heights[row], self.ratios[row], self.areas[row],
+            self.orientations[row])
+
+    def __iter__(self):
+        for row in range(len(self.names)):
+            yield self[row]
+
+    def range(self, column, low=None, high=None):
+        """Returns the rows with a column value in a range, in value order.
+
+        ``column`` is one of :data:`RANGE_COLUMNS`. Either bound can be
+        ``None``, for no bound; both bounds are inclusive.
+        """
+        try:
+            keys, rows = self._sorted[column]
+        except KeyError:
+            raise ValueError('not a range column: {0!r}'.format(column))
+        start, end = _bounds(keys, low, high)
+        return rows[start:end]
+
+    def query(self, family=None, orientation=None, width=None, height=None,
+              ratio=None, area=None, where=None):
+        """Returns the rows matching every given condition.
+
+        Rows are returned as :class:`CatalogRow`, in the order they were
+        added.
+
+        Arguments:
+
+        ``family``, ``orientation``
+            A value, or a tuple or set of values, any of which matches.
+
+        ``width``, ``height``, ``ratio``, ``area``
+            An inclusive (low, high) range, in points, square points, or
+            as a plain number for ``ratio``. Either bound can be
+            ``None``. See :func:`around` for ranges around a value.
+
+        ``where``
+            A function taking a :class:`CatalogRow` and returning
+            whether it matches. It is only called for rows that match
+            every other condition.
+        """
+        return [self[row] for row in self.query_rows(
+            family, orientation, width, height, ratio, area, where)]
+
+    def query_rows(self, family=None, orientation=None, width=None,
+                   height=None, ratio=None, area=None, where=None):
+        """As :meth:`query`, but returns a list of row numbers."""
+        # Each condition is (candidate count, candidate rows, test).
+        conditions = []
+        for column, values, wanted in (
+                ('family', self.families, family),
+                ('orientation', self.orientations, orientation)):
+            if wanted is None:
+                continue
+            if isinstance(wanted, str):
+                wanted = (wanted,)
+            wanted = frozenset(wanted)
+            groups = self._grouped[column]
+            count = sum(len(groups.get(value, ())) for value in wanted)
+            conditions.append((
+                count, functools.partial(self._group_rows, column, wanted),
+                _membership_test(values, wanted)))
+        for column, values, bounds in (
+                ('width', self.widths, width),
+                ('height', self.heights, height),
+                ('ratio', self.ratios, ratio),
+                ('area', self.areas, area)):
+            if bounds is None:
+                continue
+            low, high = bounds
+            keys, rows = self._sorted[column]
+            start, end = _bounds(keys, low, high)
+            conditions.append((
+                end - start,
+                functools.partial(_slice_rows, rows, start, end),
+                _range_test(values, low, high)))
+
+        # Push down: list the candidates of the most selective condition,
+        # and only test the others against those.
+        if conditions:
+            conditions.sort(key=lambda condition: condition[0])
+            candidates = conditions[0][1]()
+            tests = [test for _, _, test in conditions[1:]]
+            if tests:
+                candidates = [
+                    row for row in candidates
+                    if all(test(row) for test in tests)]
+            candidates.sort()
+        else:
+            candidates = list(range(len(self.names)))
+        if where is not None:
+            candidates = [row for row in candidates if where(self[row])]
+        return candidates
+
+    def _group_rows(self, column, wanted):
+        groups = self._grouped[column]
+        rows = []
+        for value in wanted:
+            rows.extend(groups.get(value, ()))
+        return rows
+
+def table():
+    """Returns the built-in catalog as a shared :class:`Catalog`.
+
+    The same object is returned each time, so custom entries should be
+    added to a new :class:`Catalog` instead.
+    """
+    global _table
+    if _table is None:
+        _table = Catalog()
+    return _table
+
+def query(*args, **kwargs):
+    """Queries the built-in catalog, as :meth:`Catalog.query`."""
+    return table().query(*args, **kwargs)
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_entries = tuple(
+    (name, value)
+    for name, value in vars(papersizes).items()
+    if not name.startswith('_') and isinstance(value, PaperSize))
+
+_canonical_names = {}
+for _name, _size in _entries:
+    _canonical_names.setdefault(_size, _name)
+del _name, _size
+
+_canonical_entries = tuple(
+    (name, size)
+    for name, size in _entries
+    if _canonical_names[size] == name)
+
+_FAMILY_PATTERNS = tuple(
+    (re.compile(pattern), name_family)
+    for pattern, name_family in (
+        (r'JIS_|SHIROKU_BAN', 'JIS'),
+        (r'SIS_', 'SIS'),
+        (r'ANSI_', 'ANSI'),
+        (r'ARCH_', 'ARCH'),
+        (r'LULU_', 'LULU'),
+        (r'(A|B|C|RA|SRA)\d+$|THIRD_A4$|DL$|A3_PLUS$', 'ISO'),
+        (r'(LETTER|LEGAL|TABLOID|ELEVEN_BY_SEVENTEEN|LEDGER)$', 'US'),
+        (r'FILOFAX_|FRANKLIN_COVEY_|ORGANIZER_', 'ORGANIZER'),
+        (r'INCHIE$|ATC$|.*SCRAPBOOK|MOO_CARD$', 'CRAFT'),
+        (r'INDEX_CARD_|.*_BUSINESS_CARD$|PLAYING_CARD', 'CARD'),
+        (r'.*_NEWSPAPER$', 'NEWSPAPER'),
+        (r'.*_PAPERBACK$', 'BOOK'),
+        ))
+
+_table = None
+
+def _row_values(width, height):
+    """Works out the derived columns of a row."""
+    if width > height:
+        orientation = 'landscape'
+    elif width < height:
+        orientation = 'portrait'
+    else:
+        orientation = 'square'
+    return {
+        'width': width,
+        'height': height,
+        'ratio': max(width, height) / min(width, height),
+        'area': width * height,
+        'orientation': orientation,
+        }
+
+def _bounds(keys, low, high):
+    """Returns the slice of sorted keys within inclusive bounds."""
+    start = 0 if low is None else bisect.bisect_left(keys, low)
+    end = len(keys) if high is None else bisect.bisect_right(keys, high)
+    return start, max(start, end)
+
+def _slice_rows(rows, start, end):
+    return rows[start:end]
+
+def _range_test(values, low, high):
+    if low is None:
+        low = float('-inf')
+    if high is None:
+        high = float('inf')
+    return lambda row: low <= values[row] <= high
+
+def _membership_test(values, wanted):
+    return lambda row: values[row] in wanted
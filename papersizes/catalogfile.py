@@ -0,0 +1,461 @@
+# -*- coding: utf-8 -*-
+"""
+Catalogs of sizes compiled to a binary file, for large stock lists.
+
+A stock list of a hundred thousand sizes is slow to load, and takes a
+lot of memory, as ``PaperSize`` objects. This module compiles a catalog
+(the built-in sizes, custom sizes read from CSV or JSON files, or both)
+into a single file, which :class:`CatalogFile` maps into memory rather
+than reading. Opening a catalog file takes the same time however many
+sizes it holds; only the parts of it that are used are read from disk.
+
+.. code-block:: python
+
+    from papersizes import catalogfile, parse
+
+    catalogfile.compile_catalog(
+        'stock.pscat', catalogfile.read_entries('stock.csv'))
+
+    with catalogfile.CatalogFile('stock.pscat') as stock:
+        size = parse.paper_size('SRA2 Silk 150', catalog=stock)
+        name = stock.catalog_name(size)
+
+Or from the command line:
+
+.. code-block:: none
+
+    % python -m papersizes compile-catalog stock.pscat stock.csv
+
+The file holds a string table, a column of numbers for each of the
+string columns (indexes into the string table) and an ``array('d')`` of
+widths and heights. It also holds two indexes, built when it is
+compiled: a hash table of normalised names, for
+:func:`papersizes.parse.paper_size`, and the rows sorted by their
+shorter side, for matching sizes within a tolerance. All numbers are
+little endian, and each section starts on an eight byte boundary.
+"""
+import array
+import bisect
+import collections
+import csv
+import json
+import mmap
+import os
+import struct
+import sys
+import zlib
+
+from . import catalog
+from . import parse
+from .papersize import PaperSize
+from .units import mm
+
+# ----------------------------------------------------------------------------
+# Entries.
+# ----------------------------------------------------------------------------
+
+FIELDS = ('name', 'width', 'height', 'family', 'grade', 'grain')
+"""The fields of an entry in a CSV or JSON stock list.
+
+``name``, ``width`` and ``height`` are required. Widths and heights are
+numbers of points, or strings parsed by
+:func:`papersizes.parse.dimension`, such as ``'640mm'``.
+"""
+
+class CatalogEntry(collections.namedtuple(
+        'CatalogEntry', 'name size family grade grain')):
+    """One size in a compiled catalog.
+
+    ``family``, ``grade`` and ``grain`` are strings, which are empty if
+    they weren't given. Built-in sizes have the family given by
+    :func:`papersizes.catalog.name_family`.
+    """
+    __slots__ = ()
+
+def builtin_entries():
+    """Returns the built-in catalog, as a list of :class:`CatalogEntry`."""
+    return [
+        CatalogEntry(name, size, catalog.name_family(name), '', '')
+        for name, size in catalog.entries()]
+
+def read_entries(path):
+    """Reads the entries of a stock list from a CSV or JSON file.
+
+    A ``.json`` file holds a list of objects, and any other file is CSV
+    with a header row, each with the keys in :data:`FIELDS`. Returns a
+    list of :class:`CatalogEntry`, and raises ``ValueError`` if an
+    entry is missing a name or has an invalid size.
+    """
+    with open(path, encoding='utf-8', newline='') as f:
+        if os.path.splitext(path)[1].lower() == '.json':
+            records = json.load(f)
+        else:
+            records = list(csv.DictReader(f))
+    entries = []
+    for number, record in enumerate(records, 1):
+        try:
+            entries.append(_entry(record))
+        except (KeyError, TypeError, ValueError):
+            raise ValueError(
+                'invalid entry {0:d} in {1}: {2!r}'.format(
+                    number, path, record))
+    return entries
+
+# ----------------------------------------------------------------------------
+# Compiling.
+# ----------------------------------------------------------------------------
+
+MAGIC = b'PSZCAT01'
+"""The first eight bytes of a compiled catalog file."""
+
+def compile_catalog(path, entries=(), builtin=True):
+    """Compiles a catalog into a file, returning the number of entries.
+
+    ``entries`` are :class:`CatalogEntry`, or (name, size) pairs. If
+    ``builtin`` is true, the built-in sizes are included before them.
+    When names clash, once normalised, the first entry with the name is
+    the one found by name.
+    """
+    if builtin:
+        entries = builtin_entries() + list(entries)
+    strings = _StringTable()
+    columns = dict((column, array.array('I')) for column in _STRINGS)
+    widths = array.array('d')
+    heights = array.array('d')
+    for entry in entries:
+        if not isinstance(entry, CatalogEntry):
+            name, size = entry
+            entry = CatalogEntry(name, size, '', '', '')
+        key = parse.normalise_size_name(entry.name)
+        for column, value in zip(_STRINGS, (
+                entry.name, key, entry.family, entry.grade, entry.grain)):
+            columns[column].append(strings.add(value))
+        widths.append(float(entry.size[0]))
+        heights.append(float(entry.size[1]))
+    count = len(widths)
+
+    # The name index: an open addressing hash table of row + 1.
+    slots = 8
+    while slots < 2 * count:
+        slots *= 2
+    table = array.array('I', bytes(4 * slots))
+    for row, key in enumerate(columns['key']):
+        key = strings.values[key]
+        slot = zlib.crc32(key) & (slots - 1)
+        while table[slot]:
+            if strings.values[columns['key'][table[slot] - 1]] == key:
+                break
+            slot = (slot + 1) & (slots - 1)
+        else:
+            table[slot] = row + 1
+
+    # The size index: rows sorted by their shorter side.
+    rows = sorted(
+        range(count), key=lambda row: min(widths[row], heights[row]))
+    short_sides = array.array(
+        'd', [min(widths[row], heights[row]) for row in rows])
+    short_rows = array.array('I', rows)
+
+    offsets = array.array('I', [0])
+    for value in strings.values:
+        offsets.append(offsets[-1] + len(value))
+    sections = [offsets, b''.join(strings.values)]
+    sections.extend(columns[column] for column in _STRINGS)
+    sections.extend((widths, heights, table, short_sides, short_rows))
+    data = [_to_little_endian(section) for section in sections]
+
+    position = _aligned(_HEADER.size)
+    section_offsets = []
+    for section in data:
+        section_offsets.append(position)
+        position = _aligned(position + len(section))
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(
+            MAGIC, count, len(strings.values), slots, 0, *section_offsets))
+        for offset, section in zip(section_offsets, data):
+            f.write(bytes(offset - f.tell()))
+            f.write(section)
+    return count
+
+# ----------------------------------------------------------------------------
+# Reading.
+# ----------------------------------------------------------------------------
+
+class CatalogFile(object):
+    """A compiled catalog file, mapped into memory.
+
+    Opening the file only reads its header. Sizes are read by row
+    number, looked up by name with :meth:`size_by_name`, or matched
+    with :meth:`catalog_name`. The file is closed with :meth:`close`,
+    or at the end of a ``with`` block.
+
+    Raises ``ValueError`` if the file isn't a compiled catalog.
+    """
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            header = _HEADER.unpack_from(self._map)
+        except struct.error:
+            header = None
+        if header is None or header[0] != MAGIC:
+            self._map.close()
+            raise ValueError('not a compiled catalog: {0}'.format(path))
+        _, self._count, string_count, self._slots, _ = header[:5]
+        self._views = []
+        try:
+            self._read_sections(header[5:], string_count)
+        except ValueError:
+            self.close()
+            raise ValueError('not a compiled catalog: {0}'.format(path))
+        (self._offsets, self._string_data, self._names, self._keys,
+         self._families, self._grades, self._grains, self._widths,
+         self._heights, self._table, self._short_sides,
+         self._short_rows) = self._views
+
+    def close(self):
+        """Releases the file's memory map."""
+        if self._map is None:
+            return
+        for view in self._views:
+            view.release()
+        self._views = []
+        self._map.close()
+        self._map = None
+
+    def _read_sections(self, section_offsets, string_count):
+        """Makes a view of each section, checking it is within the file.
+
+        Raises ``ValueError`` if the file is truncated or the header is
+        inconsistent.
+        """
+        size = len(self._map)
+        lengths = [string_count + 1, None] + [self._count] * len(_STRINGS) \
+            + [self._count, self._count, self._slots, self._count,
+               self._count]
+        ends = list(section_offsets[1:]) + [size]
+        view = memoryview(self._map)
+        try:
+            for offset, end, length, code in zip(
+                    section_offsets, ends, lengths, _SECTION_CODES):
+                if code is not None:
+                    end = offset + length * array.array(code).itemsize
+                if not offset <= end <= size:
+                    raise ValueError('section beyond the end of the file')
+                section = view[offset:end]
+                if code is not None:
+                    section = section.cast(code)
+                    if sys.byteorder != 'little':
+                        section = _swapped(section)
+                self._views.append(section)
+        except TypeError as error:
+            raise ValueError(str(error))
+        finally:
+            view.release()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, row):
+        if not -self._count <= row < self._count:
+            raise IndexError('catalog row out of range')
+        row %= self._count
+        return CatalogEntry(
+            self._string(self._names[row]), self.size(row),
+            self._string(self._families[row]),
+            self._string(self._grades[row]),
+            self._string(self._grains[row]))
+
+    def __iter__(self):
+        for row in range(self._count):
+            yield self[row]
+
+    def name(self, row):
+        """Returns the name of a row."""
+        return self._string(self._names[row])
+
+    def size(self, row):
+        """Returns the size of a row, as a ``PaperSize``."""
+        return PaperSize(self._widths[row], self._heights[row])
+
+    def find(self, name):
+        """Returns the row with the given name, or ``None``.
+
+        Names are compared once normalised, as by
+        :func:`papersizes.parse.normalise_size_name`.
+        """
+        return self._find(parse.normalise_size_name(name).encode('utf-8'))
+
+    def size_by_name(self, name):
+        """Returns the size with a normalised name, or ``None``.
+
+        This is the lookup used by :func:`papersizes.parse.paper_size`.
+        """
+        row = self._find(name.encode('utf-8'))
+        return None if row is None else self.size(row)
+
+    def rows_near(self, size, tolerance=0.1*mm):
+        """Returns the rows within tolerance of a size, in either
+        orientation.
+        """
+        short_side = min(size[0], size[1])
+        long_side = max(size[0], size[1])
+        start = bisect.bisect_left(self._short_sides, short_side - tolerance)
+        end = bisect.bisect_right(self._short_sides, short_side + tolerance)
+        rows = []
+        for index in range(start, end):
+            row = self._short_rows[index]
+            row_long = max(self._widths[row], self._heights[row])
+            if abs(row_long - long_side) <= tolerance:
+                rows.append(row)
+        rows.sort()
+        return rows
+
+    def catalog_name(self, size, tolerance=0.1*mm):
+        """Returns the name of a size, within the given tolerance.
+
+        As :func:`papersizes.approx.catalog_name`: a size matching an
+        entry in its other orientation is named with a ``' landscape'``
+        or ``' portrait'`` suffix, and ``None`` is returned if no entry
+        matches. Of several matching entries, the closest is used.
+        """
+        width, height = size[0], size[1]
+        best = None
+        for row in self.rows_near(size, tolerance):
+            row_width, row_height = self._widths[row], self._heights[row]
+            error = max(abs(row_width - width), abs(row_height - height))
+            flipped = error > tolerance
+            if flipped:
+                error = max(
+                    abs(row_height - width), abs(row_width - height))
+            candidate = (flipped, error, row)
+            if best is None or candidate < best:
+                best = candidate
+        if best is None:
+            return None
+        flipped, _, row = best
+        name = self.name(row)
+        if flipped:
+            name += ' landscape' if width > height else ' portrait'
+        return name
+
+    def _string(self, index):
+        start, end = self._offsets[index], self._offsets[index + 1]
+        return bytes(self._string_data[start:end]).decode('utf-8')
+
+    def _find(self, key):
+        mask = self._slots - 1
+        slot = zlib.crc32(key) & mask
+        while True:
+            row = self._table[slot]
+            if not row:
+                return None
+            index = self._keys[row - 1]
+            start, end = self._offsets[index], self._offsets[index + 1]
+            if self._string_data[start:end] == key:
+                return row - 1
+            slot = (slot + 1) & mask
+
+# ----------------------------------------------------------------------------
+# Command line.
+# ----------------------------------------------------------------------------
+
+def add_command(commands):
+    """Adds the ``compile-catalog`` command to an argparse subparsers
+    object.
+    """
+    parser = commands.add_parser(
+        'compile-catalog',
+        help='compile stock lists into a catalog file')
+    parser.add_argument('output', help='the catalog file to write')
+    parser.add_argument(
+        'inputs', nargs='*', help='CSV or JSON stock lists to include')
+    parser.add_argument(
+        '--no-builtin', dest='builtin', action='store_false',
+        help="don't include the built-in sizes")
+    parser.set_defaults(run=run_command)
+    return parser
+
+def run_command(args):
+    """Runs the ``compile-catalog`` command with parsed arguments."""
+    entries = []
+    try:
+        for path in args.inputs:
+            entries.extend(read_entries(path))
+    except (OSError, ValueError) as error:
+        sys.stderr.write('{0}\n'.format(error))
+        return 1
+    count = compile_catalog(args.output, entries, args.builtin)
+    sys.stderr.write('{0:d} sizes written to {1}\n'.format(
+        count, args.output))
+    return 0
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_STRINGS = ('name', 'key', 'family', 'grade', 'grain')
+
+_HEADER = struct.Struct('<8sIIII12Q')
+
+# The array type code of each section, after the header, in order.
+_SECTION_CODES = (
+    'I', None, 'I', 'I', 'I', 'I', 'I', 'd', 'd', 'I', 'd', 'I')
+
+class _StringTable(object):
+    """Collects distinct strings, numbering them in order."""
+    def __init__(self):
+        self.values = []
+        self._numbers = {}
+
+    def add(self, value):
+        value = value.encode('utf-8')
+        try:
+            return self._numbers[value]
+        except KeyError:
+            number = self._numbers[value] = len(self.values)
+            self.values.append(value)
+            return number
+
+def _entry(record):
+    """Makes a CatalogEntry from a record of a stock list."""
+    name = record['name']
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError('entries need a name')
+    size = PaperSize(
+        _dimension(record['width']), _dimension(record['height']))
+    if size.width <= 0 or size.height <= 0:
+        raise ValueError('sizes must be positive')
+    return CatalogEntry(name.strip(), size, *(
+        str(record.get(field) or '').strip()
+        for field in ('family', 'grade', 'grain')))
+
+def _dimension(value):
+    if isinstance(value, str):
+        return parse.dimension(value)
+    return float(value)
+
+def _swapped(section):
+    """Copies a little endian section into a native array."""
+    values = array.array(section.format, section.tobytes())
+    section.release()
+    values.byteswap()
+    return memoryview(values)
+
+def _aligned(position):
+    return (position + 7) & ~7
+
+def _to_little_endian(section):
+    if isinstance(section, bytes):
+        return section
+    if sys.byteorder != 'little':
+        section = array.array(section.typecode, section)
+        section.byteswap()
+    return section.tobytes()
@@ -0,0 +1,200 @@
+# -*- coding: utf-8 -*-
+"""
+Paper sizes as whole numbers of micrometres, for exact comparison.
+
+Sizes defined in millimetres are inexact in points, since a millimetre
+is 72/25.4 points, so two calculations of the same size can give
+:class:`~papersizes.papersize.PaperSize` values that differ in their
+last bit, and so don't compare or hash as equal. Every size defined in
+millimetres or fractions of an inch is a whole number of micrometres,
+so this module represents sizes that way, as integers. Equality is
+exact, hashing is cheap, and many sizes can be stored compactly in
+``array('q')``.
+
+Converting a ``PaperSize`` rounds it to the nearest micrometre.
+Converting a :class:`FixedSize` to a ``PaperSize`` and back always gives
+the same ``FixedSize``.
+
+.. code-block:: python
+
+    from papersizes import fixed
+
+    counts = fixed.FixedSizeArray.from_sizes(page_sizes).counts()
+    for size, count in counts.items():
+        print(fixed.catalog_name(size), count)
+"""
+import array
+import collections
+
+from . import catalog
+from .papersize import PaperSize
+
+# ----------------------------------------------------------------------------
+# Conversion.
+# ----------------------------------------------------------------------------
+
+UNITS_PER_INCH = 25400
+"""The number of fixed point units, micrometres, in an inch."""
+
+def to_fixed(points):
+    """Converts a dimension in points to the nearest whole micrometre."""
+    return int(round(points * UNITS_PER_INCH / 72.0))
+
+def to_points(value):
+    """Converts a dimension in micrometres to points."""
+    return value * 72.0 / UNITS_PER_INCH
+
+# ----------------------------------------------------------------------------
+# Fixed point sizes.
+# ----------------------------------------------------------------------------
+
+class FixedSize(collections.namedtuple('FixedSize', 'width height')):
+    """A paper size as integer micrometres."""
+    __slots__ = ()
+
+    @classmethod
+    def from_size(Class, size):
+        """Create from a (width, height) size in points."""
+        return Class(to_fixed(size[0]), to_fixed(size[1]))
+
+    @classmethod
+    def from_key(Class, key):
+        """Create from an integer made by :attr:`key`."""
+        return Class(key >> 32, key & _KEY_MASK)
+
+    def to_size(self):
+        """Returns the size in points, as a ``PaperSize``."""
+        return PaperSize(to_points(self.width), to_points(self.height))
+
+    @property
+    def key(self):
+        """The size packed into a single integer.
+
+        Keys of different sizes are different, and can be stored in
+        ``array('q')``. The width must be under ``2**31`` micrometres
+        (about 2.1 kilometres) and the height under ``2**32``
+        micrometres (about 4.3 kilometres); raises ``ValueError`` for
+        larger or negative dimensions.
+        """
+        return _key(self.width, self.height)
+
+    def landscape(self):
+        """Returns the size with the longer side horizontal."""
+        return self if self.width >= self.height else self.flip()
+
+    def portrait(self):
+        """Returns the size with the longer side vertical."""
+        return self if self.width <= self.height else self.flip()
+
+    def flip(self):
+        """Returns the size with its width and height swapped."""
+        return FixedSize(self.height, self.width)
+
+    def __repr__(self):
+        return 'FixedSize({0:d}, {1:d})'.format(self.width, self.height)
+
+class FixedSizeArray(object):
+    """Many fixed point sizes, stored as two ``array('q')``.
+
+    Each size takes 16 bytes, rather than the hundred or so of a
+    ``PaperSize``.
+    """
+    def __init__(self, widths=(), heights=()):
+        self.widths = array.array('q', widths)
+        self.heights = array.array('q', heights)
+        if len(self.widths) != len(self.heights):
+            raise ValueError('widths and heights must be the same length')
+
+    @classmethod
+    def from_sizes(Class, sizes):
+        """Create from (width, height) sizes in points."""
+        result = Class()
+        for size in sizes:
+            result.append(size)
+        return result
+
+    def append(self, size):
+        """Adds a (width, height) size in points."""
+        self.widths.append(to_fixed(size[0]))
+        self.heights.append(to_fixed(size[1]))
+
+    def __len__(self):
+        return len(self.widths)
+
+    def __getitem__(self, index):
+        return FixedSize(self.widths[index], self.heights[index])
+
+    def __iter__(self):
+        for width, height in zip(self.widths, self.heights):
+            yield FixedSize(width, height)
+
+    def to_sizes(self):
+        """Returns a list of the sizes in points, as ``PaperSize``."""
+        return [
+            PaperSize(to_points(width), to_points(height))
+            for width, height in zip(self.widths, self.heights)]
+
+    def keys(self):
+        """Returns an ``array('q')`` of the key of each size."""
+        return array.array('q', [
+            _key(width, height)
+            for width, height in zip(self.widths, self.heights)])
+
+    def counts(self):
+        """Counts the occurrences of each distinct size.
+
+        Returns a dictionary from :class:`FixedSize` to count, in order
+        of first occurrence.
+        """
+        counts = collections.Counter(self.keys())
+        return collections.OrderedDict(
+            (FixedSize.from_key(key), count) for key, count in counts.items())
+
+# ----------------------------------------------------------------------------
+# Catalog lookup.
+# ----------------------------------------------------------------------------
+
+def catalog_name(size):
+    """Returns the catalog name of a size, to the nearest micrometre.
+
+    ``size`` is a :class:`FixedSize`, or a size in points. A size that
+    matches a catalog size on its side has ``' landscape'`` or
+    ``' portrait'`` added to its name, as for
+    :func:`papersizes.approx.catalog_name`. Returns ``None`` if no
+    catalog size matches.
+    """
+    if not isinstance(size, FixedSize):
+        size = FixedSize.from_size(size)
+    return _catalog_names.get(size)
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_KEY_MASK = (1 << 32) - 1
+
+def _key(width, height):
+    """Packs a width and height into a key, checking they fit."""
+    if not (0 <= width < 1 << 31 and 0 <= height < 1 << 32):
+        raise ValueError(
+            'size is too large or negative for a key: {0!r}'.format(
+                (width, height)))
+    return (width << 32) | height
+
+def _names():
+    """Maps every catalog size, and its flipped size, to its name."""
+    names = {}
+    for name, size in catalog.canonical_entries():
+        names.setdefault(FixedSize.from_size(size), name)
+    flipped = {}
+    for size, name in names.items():
+        if size.width != size.height:
+            orientation = 'landscape' if size.height > size.width \
+                else 'portrait'
+            flipped.setdefault(
+                size.flip(), '{0} {1}'.format(name, orientation))
+    for size, name in flipped.items():
+        names.setdefault(size, name)
+    return names
+
+_catalog_names = _names()
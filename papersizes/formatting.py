@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Formatting of paper sizes as strings, for one size or many.
+
+Sizes are formatted as, for example, ``'210x297mm'`` or ``'8½x11"'``,
+which :func:`papersizes.parse.paper_size` reads back to the same size,
+to the precision given. Formatted strings are cached for each distinct
+size, so labelling a large report, in which the same few sizes appear
+over and over, formats each size only once.
+
+.. code-block:: python
+
+    from papersizes import formatting
+
+    labels = formatting.format_sizes(page_sizes, unit='mm')
+"""
+import functools
+
+from . import units
+
+# ----------------------------------------------------------------------------
+# Formatting.
+# ----------------------------------------------------------------------------
+
+UNITS = {
+    'pt': units.pt,
+    'mm': units.mm,
+    'cm': units.cm,
+    'in': units.inch,
+    '"': units.inch,
+    }
+"""The units sizes can be formatted in, keyed by their suffix."""
+
+DEFAULT_PRECISION = {
+    'pt': 0,
+    'mm': 0,
+    'cm': 1,
+    'in': None,
+    '"': None,
+    }
+"""The number of decimal places used for each unit, if none is given.
+
+``None`` formats to the nearest eighth, as a fraction, which only makes
+sense for inches.
+"""
+
+def format_eighths(value):
+    """Formats a number to the nearest eighth, e.g. ``'8½'``."""
+    whole, eighths = divmod(int(round(value * 8)), 8)
+    return '{0}{1}'.format(whole, _EIGHTHS[eighths])
+
+def format_dimension(value, unit='mm', precision=None):
+    """Formats a single dimension in points, e.g. ``'210mm'``.
+
+    Arguments are as for :func:`format_size`.
+    """
+    return _format_number(value, unit, precision) + unit
+
+def format_size(size, unit='mm', precision=None):
+    """Formats a (width, height) size in points, e.g. ``'210x297mm'``.
+
+    Arguments:
+
+    ``unit``
+        One of the keys of :data:`UNITS`.
+
+    ``precision``
+        The number of decimal places to give, or ``None`` for the
+        default for the unit, given in :data:`DEFAULT_PRECISION`.
+    """
+    return _format_size(size[0], size[1], unit, precision)
+
+def format_sizes(sizes, unit='mm', precision=None):
+    """Formats many sizes, returning a list of strings.
+
+    Arguments are as for :func:`format_size`. Each distinct size is
+    formatted once.
+    """
+    if unit not in UNITS:
+        raise ValueError('unknown unit: {0!r}'.format(unit))
+    seen = {}
+    result = []
+    for size in sizes:
+        key = size[0], size[1]
+        try:
+            text = seen[key]
+        except KeyError:
+            text = seen[key] = _format_size(key[0], key[1], unit, precision)
+        result.append(text)
+    return result
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_EIGHTHS = ('', '⅛', '¼', '⅜', '½', '⅝', '¾', '⅞')
+
+def _format_number(value, unit, precision):
+    """Formats a number of points as a number of the given unit."""
+    try:
+        value /= UNITS[unit]
+    except KeyError:
+        raise ValueError('unknown unit: {0!r}'.format(unit))
+    if precision is None:
+        precision = DEFAULT_PRECISION[unit]
+        if precision is None:
+            return format_eighths(value)
+    return '{0:.{1}f}'.format(value, precision)
+
+@functools.lru_cache(maxsize=4096)
+def _format_size(width, height, unit, precision):
+    return '{0}x{1}{2}'.format(
+        _format_number(width, unit, precision),
+        _format_number(height, unit, precision), unit)
@@ -0,0 +1,235 @@
+# -*- coding: utf-8 -*-
+"""
+Layout grids: text areas, columns, rows and baselines for a page.
+
+A layout grid divides the text area of a page, inside its margins, into
+columns and rows separated by gutters, with a baseline grid for the
+lines of text. The margins can be given directly, or derived from the
+page size by one of the classical book canons, such as
+:func:`van_de_graaf_margins`.
+
+Grids are calculated once for each combination of page size, margins
+and :class:`GridSpec`, and the result reused, so laying out a catalog
+of many pages of a few sizes costs little more than a dictionary lookup
+per page.
+
+.. code-block:: python
+
+    from papersizes import grid, papersizes
+    from papersizes.units import mm
+
+    spec = grid.GridSpec(columns=3, gutter=5*mm, baseline=14)
+    page = grid.grid(papersizes.A4, grid.van_de_graaf_margins, spec)
+    print(list(page.column_x0))
+"""
+import array
+import collections
+import functools
+
+from .papersize import PaperSize, Margins
+
+# ----------------------------------------------------------------------------
+# Margins.
+# ----------------------------------------------------------------------------
+
+def van_de_graaf_margins(size, verso=False):
+    """Margins of the Van de Graaf canon, for the given page size.
+
+    The text area is in the same proportion as the page, and two thirds
+    of its width and height, leaving the inner and top margins one ninth
+    of the page's width and height, and the outer and bottom margins two
+    ninths. Margins are for a right hand page, unless ``verso`` is true.
+    """
+    width, height = size
+    inner, outer = width / 9.0, 2.0 * width / 9.0
+    top, bottom = height / 9.0, 2.0 * height / 9.0
+    return _facing(inner, bottom, outer, top, verso)
+
+def golden_canon_margins(size, verso=False):
+    """Margins in the proportions of the golden canon, 2:3:4:6.
+
+    The inner, top, outer and bottom margins are in the proportions
+    2:3:4:6, with the inner margin one ninth of the page's width. On a
+    page in the ratio 2:3 (:data:`~papersizes.ratios.TWO_THIRDS`) this is
+    the same as :func:`van_de_graaf_margins`. Margins are for a right
+    hand page, unless ``verso`` is true.
+    """
+    unit = size[0] / 18.0
+    return _facing(2.0 * unit, 6.0 * unit, 4.0 * unit, 3.0 * unit, verso)
+
+# ----------------------------------------------------------------------------
+# Grids.
+# ----------------------------------------------------------------------------
+
+class GridSpec(collections.namedtuple(
+        'GridSpec', 'columns gutter rows row_gutter baseline')):
+    """The divisions of a layout grid, independent of the page size.
+
+    Arguments:
+
+    ``columns``, ``gutter``
+        The number of columns, and the space between them.
+
+    ``rows``, ``row_gutter``
+        The number of rows, and the space between them. The row gutter
+        defaults to the column gutter.
+
+    ``baseline``
+        The distance between lines of text, or ``None`` for no baseline
+        grid.
+    """
+    __slots__ = ()
+
+    def __new__(Class, columns=1, gutter=0.0, rows=1, row_gutter=None,
+                baseline=None):
+        if columns < 1 or rows < 1:
+            raise ValueError('a grid needs at least one column and row')
+        if row_gutter is None:
+            row_gutter = gutter
+        return super(GridSpec, Class).__new__(
+            Class, columns, gutter, rows, row_gutter, baseline)
+
+class Grid(object):
+    """The coordinates of a layout grid on a page of a particular size.
+
+    Coordinates are in points from the bottom left of the page, as in a
+    PDF. ``column_x0`` and ``column_x1`` are arrays of the left and right
+    edges of each column, from left to right. ``row_y0`` and ``row_y1``
+    are the bottom and top edges of each row, from the top of the page
+    down. ``baselines`` are the heights of each line of text, from the
+    top down.
+
+    Grids are shared between calls with the same arguments, so their
+    arrays should not be modified.
+    """
+    def __init__(self, size, margins, spec):
+        self.size = PaperSize(*size)
+        self.margins = margins
+        self.spec = spec
+        width, height = self.size
+        left, bottom = margins.left, margins.bottom
+        right, top = width - margins.right, height - margins.top
+        self.text_box = (left, bottom, right, top)
+
+        column_width = _division(
+            right - left, spec.columns, spec.gutter, 'columns')
+        self.column_x0 = array.array('d', [
+            left + index * (column_width + spec.gutter)
+            for index in range(spec.columns)])
+        self.column_x1 = array.array('d', [
+            x0 + column_width for x0 in self.column_x0])
+
+        row_height = _division(
+            top - bottom, spec.rows, spec.row_gutter, 'rows')
+        self.row_y1 = array.array('d', [
+            top - index * (row_height + spec.row_gutter)
+            for index in range(spec.rows)])
+        self.row_y0 = array.array('d', [
+            y1 - row_height for y1 in self.row_y1])
+
+        self.baselines = array.array('d')
+        if spec.baseline:
+            lines = int((top - bottom) / spec.baseline + _GRID_EPSILON)
+            self.baselines.extend(
+                top - spec.baseline * (index + 1) for index in range(lines))
+
+    @property
+    def column_width(self):
+        """The width of each column."""
+        return self.column_x1[0] - self.column_x0[0]
+
+    @property
+    def row_height(self):
+        """The height of each row."""
+        return self.row_y1[0] - self.row_y0[0]
+
+    def module(self, column, row):
+        """Returns the (x0, y0, x1, y1) box of one cell of the grid."""
+        return (self.column_x0[column], self.row_y0[row],
+                self.column_x1[column], self.row_y1[row])
+
+    def span(self, first_column, last_column, first_row=0, last_row=None):
+        """Returns the box covering a range of columns and rows, inclusive.
+
+        If ``last_row`` isn't given, the box extends to the bottom row.
+        """
+        if last_row is None:
+            last_row = len(self.row_y0) - 1
+        return (self.column_x0[first_column], self.row_y0[last_row],
+                self.column_x1[last_column], self.row_y1[first_row])
+
+    def __repr__(self):
+        return 'Grid({0!r}, {1!r}, {2!r})'.format(
+            self.size, self.margins, self.spec)
+
+def grid(size, margins, spec=GridSpec()):
+    """Returns the :class:`Grid` for a page, calculating it only once.
+
+    Arguments:
+
+    ``size``
+        The page size.
+
+    ``margins``
+        The margins around the text area: a single width for every side,
+        a (left, bottom, right, top) tuple or
+        :class:`~papersizes.papersize.Margins`, or a function that takes
+        the page size and returns margins, such as
+        :func:`van_de_graaf_margins`.
+
+    ``spec``
+        The :class:`GridSpec` to divide the text area by.
+    """
+    if not callable(margins):
+        margins = Margins.from_value(margins)
+    return _grid(PaperSize(*size), margins, spec)
+
+def grids(sizes, margins, spec=GridSpec()):
+    """Returns a list of the :class:`Grid` for each of the given sizes.
+
+    Arguments are as for :func:`grid`. Each distinct size is calculated
+    once.
+    """
+    if not callable(margins):
+        margins = Margins.from_value(margins)
+    return [_grid(PaperSize(*size), margins, spec) for size in sizes]
+
+def column_edges(sizes, margins, spec=GridSpec()):
+    """Returns the column edges for many page sizes, as flat arrays.
+
+    Returns (x0, x1) arrays, each with ``spec.columns`` entries for each
+    size, in order, so the edges of column ``c`` of page ``p`` are at
+    index ``p * spec.columns + c``.
+    """
+    x0s = array.array('d')
+    x1s = array.array('d')
+    for page in grids(sizes, margins, spec):
+        x0s.extend(page.column_x0)
+        x1s.extend(page.column_x1)
+    return x0s, x1s
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+# Allows for float noise when fitting baselines into the text area.
+_GRID_EPSILON = 1e-9
+
+def _facing(inner, bottom, outer, top, verso):
+    """Margins with the inner margin on the left, or right if verso."""
+    if verso:
+        return Margins(outer, bottom, inner, top)
+    return Margins(inner, bottom, outer, top)
+
+def _division(length, count, gutter, name):
+    """The length of each of count divisions, separated by gutters."""
+    result = (length - (count - 1) * gutter) / count
+    if result <= 0:
+        raise ValueError('no room for {0} {1}'.format(count, name))
+    return result
+
+@functools.lru_cache(maxsize=1024)
+def _grid(size, margins, spec):
+    if callable(margins):
+        return Grid(size, margins(size), spec)
+    return Grid(size, margins, spec)
@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+Cutting sequences for cutting pieces out of a sheet with a guillotine.
+
+A guillotine cuts straight across whatever is under its blade, so
+pieces laid out on a press sheet are separated by cutting the sheet in
+two, then cutting each part in two, and so on, trimming off the waste
+on the way. The operator's time depends on the number of strokes of the
+blade, and the number of times a pile has to be turned to cut it the
+other way. This module plans a sequence of cuts that keeps both low,
+using a fast heuristic rather than an exhaustive search.
+
+Plans are made in stages, the way sheets are usually cut: each stage
+cuts a pile into strips with parallel cuts, then the strips are turned
+and each cut into strips the other way, and so on. Strips holding the
+same pieces, in the same positions, are stacked and cut together, so
+the columns of a sheet of business cards are cut as one pile. The
+height of a pile that fits under the blade (its lift) is limited,
+though: a pile of more sheets than the lift takes several strokes.
+
+Each stage cuts at every boundary between strips, and the best choice
+of axis is made at each stage. Other orders of cuts aren't searched, so
+the plans aren't always the fewest possible: four equal columns take
+three cuts here, where cutting the sheet in half, stacking the halves
+and cutting them in half again takes two.
+
+.. code-block:: python
+
+    from papersizes import guillotine, papersizes
+    from papersizes.units import mm
+
+    cards = [
+        (x * 85*mm, y * 55*mm, 85*mm, 55*mm)
+        for x in range(7) for y in range(8)]
+    plan = guillotine.plan_cuts(
+        papersizes.SRA2.landscape(), cards, sheets=500, lift=250)
+    for cut in plan.cuts:
+        print(cut)
+
+Plans for each part of a sheet are cached by the pieces in it, relative
+to the part, so the repeated parts of a layout, and layouts planned
+before, are only planned once.
+"""
+import collections
+import functools
+import math
+
+# ----------------------------------------------------------------------------
+# Planning.
+# ----------------------------------------------------------------------------
+
+class Cut(collections.namedtuple(
+        'Cut', 'axis position start end stack strokes')):
+    """One cut, as a line across the sheet.
+
+    ``axis`` is ``'x'`` for a cut along the line where x is
+    ``position``, from y of ``start`` to ``end``, or ``'y'`` for a cut
+    along the line where y is ``position``, from x of ``start`` to
+    ``end``. Positions are on the original sheet, in points.
+
+    ``stack`` is the number of sheets cut at once: the parts of the
+    sheet with the same pieces in them are stacked and cut together, so
+    each cut stands for ``stack / sheets`` cuts at the same position in
+    other parts of the sheet. ``strokes`` is the number of strokes of
+    the blade the cut takes, given the lift.
+    """
+    __slots__ = ()
+
+class CutPlan(collections.namedtuple(
+        'CutPlan', 'cuts strokes rotations')):
+    """A sequence of :class:`Cut`, in the order they are made.
+
+    ``strokes`` is the total number of strokes of the blade, and
+    ``rotations`` the number of times a pile is turned a quarter turn,
+    to be cut on the other axis from the cut that produced it.
+    """
+    __slots__ = ()
+
+def plan_cuts(sheet_size, pieces, sheets=1, lift=None, rotation_weight=1.0):
+    """Plans the cuts to separate pieces from a sheet.
+
+    Returns the :class:`CutPlan` with the fewest strokes plus
+    rotations, with rotations weighted by ``rotation_weight``, of the
+    staged plans described above. This is a heuristic, and other plans
+    can take fewer. Raises
+    ``ValueError`` if the pieces overlap, extend beyond the sheet, or
+    can't be separated with guillotine cuts.
+
+    Arguments:
+
+    ``sheet_size``
+        The (width, height) of the sheet.
+
+    ``pieces``
+        The pieces on the sheet, as (x, y, width, height) rectangles,
+        in points from the sheet's corner. Anything not in a piece is
+        waste.
+
+    ``sheets``
+        The number of identical sheets being cut together.
+
+    ``lift``
+        The most sheets that can be cut in one stroke, or ``None`` for
+        no limit.
+    """
+    if sheets < 1 or (lift is not None and lift < 1):
+        raise ValueError('sheets and lift must be at least 1')
+    width, height = _key(sheet_size[0]), _key(sheet_size[1])
+    rectangles = _rectangles(width, height, pieces)
+    cost = _plan(width, height, rectangles, sheets, lift, rotation_weight)
+    if cost is None:
+        raise ValueError("pieces can't be separated with guillotine cuts")
+    _, strokes, rotations, node = cost
+    cuts = []
+    _expand(node, 0.0, 0.0, width, height, cuts)
+    return CutPlan(cuts, strokes, rotations)
+
+def plan_many(layouts, **kwargs):
+    """Plans the cuts for many (sheet_size, pieces) layouts.
+
+    Keyword arguments are passed to :func:`plan_cuts`. Returns a list
+    of :class:`CutPlan`, with ``None`` for any layout that can't be
+    cut.
+    """
+    plans = []
+    for sheet_size, pieces in layouts:
+        try:
+            plans.append(plan_cuts(sheet_size, pieces, **kwargs))
+        except ValueError:
+            plans.append(None)
+    return plans
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_EPSILON = 1e-6
+
+def _key(value):
+    """Rounds a coordinate, so equal parts of a sheet have equal keys."""
+    return round(float(value), 6) + 0.0
+
+def _rectangles(width, height, pieces):
+    """Checks pieces, returning them as sorted (x0, y0, x1, y1)."""
+    rectangles = []
+    for x, y, piece_width, piece_height in pieces:
+        x0, y0 = _key(x), _key(y)
+        x1, y1 = _key(x + piece_width), _key(y + piece_height)
+        if x1 <= x0 or y1 <= y0:
+            raise ValueError('pieces must have a positive size')
+        if x0 < -_EPSILON or y0 < -_EPSILON or \
+                x1 > width + _EPSILON or y1 > height + _EPSILON:
+            raise ValueError('piece outside the sheet: {0!r}'.format(
+                (x, y, piece_width, piece_height)))
+        rectangles.append((x0, y0, x1, y1))
+    rectangles.sort()
+    for index, (x0, y0, x1, y1) in enumerate(rectangles):
+        for other in rectangles[index + 1:]:
+            if other[0] >= x1 - _EPSILON:
+                break
+            if other[1] < y1 - _EPSILON and other[3] > y0 + _EPSILON:
+                raise ValueError('pieces overlap')
+    return tuple(rectangles)
+
+@functools.lru_cache(maxsize=16384)
+def _plan(width, height, pieces, stack, lift, rotation_weight):
+    """Plans the cuts for one part of a sheet.
+
+    Pieces are relative to the part's corner, and ``stack`` is the
+    number of sheets of the part being cut together. Returns (cost,
+    strokes, rotations, node), with node ``None`` if no cuts are needed,
+    or ``None`` if the pieces can't be separated.
+    """
+    if not pieces:
+        return 0.0, 0, 0, None
+    if len(pieces) == 1:
+        x0, y0, x1, y1 = pieces[0]
+        if x0 <= _EPSILON and y0 <= _EPSILON and \
+                x1 >= width - _EPSILON and y1 >= height - _EPSILON:
+            return 0.0, 0, 0, None
+
+    strokes = 1 if lift is None else int(math.ceil(stack / lift))
+    best = None
+    for axis in ('x', 'y'):
+        size, other = (width, height) if axis == 'x' else (height, width)
+        positions, strips = _strips(pieces, axis, size)
+        if not positions:
+            continue
+
+        # Strips holding the same pieces are stacked and cut together,
+        # after being turned to be cut on the other axis.
+        groups = collections.OrderedDict()
+        for start, end, strip in strips:
+            key = (_key(end - start), strip)
+            if key in groups:
+                groups[key][1] += 1
+            else:
+                groups[key] = [start, 1]
+        total_strokes = strokes * len(positions)
+        total_rotations = 0
+        children = []
+        for (length, strip), (start, count) in groups.items():
+            if axis == 'x':
+                child = _plan(length, other, strip, stack * count, lift,
+                              rotation_weight)
+            else:
+                child = _plan(other, length, strip, stack * count, lift,
+                              rotation_weight)
+            if child is None:
+                break
+            total_strokes += child[1]
+            total_rotations += child[2] + (child[3] is not None)
+            children.append((start, length, child[3]))
+        else:
+            cost = total_strokes + rotation_weight * total_rotations
+            if best is None or cost < best[0]:
+                node = axis, positions, stack, strokes, tuple(children)
+                best = cost, total_strokes, total_rotations, node
+    return best
+
+def _strips(pieces, axis, size):
+    """Divides pieces into strips across an axis.
+
+    Returns the positions of the cuts between and around the strips,
+    and the strips as (start, end, pieces), with the pieces relative to
+    the strip's start and sorted.
+    """
+    low, high = (0, 2) if axis == 'x' else (1, 3)
+    strips = []
+    for piece in sorted(pieces, key=lambda piece: piece[low]):
+        if strips and piece[low] < strips[-1][1] - _EPSILON:
+            strips[-1][1] = max(strips[-1][1], piece[high])
+            strips[-1][2].append(piece)
+        else:
+            strips.append([piece[low], piece[high], [piece]])
+    positions = []
+    end = 0.0
+    for strip in strips:
+        if strip[0] > end + _EPSILON:
+            positions.append(strip[0])
+        end = strip[1]
+        if end < size - _EPSILON:
+            positions.append(end)
+    if len(strips) == 1 and len(positions) == 0:
+        return (), ()
+    return tuple(positions), [
+        (start, end, tuple(sorted(
+            _shifted(piece, axis, start) for piece in strip_pieces)))
+        for start, end, strip_pieces in strips]
+
+def _shifted(piece, axis, position):
+    x0, y0, x1, y1 = piece
+    if axis == 'x':
+        return _key(x0 - position), y0, _key(x1 - position), y1
+    return x0, _key(y0 - position), x1, _key(y1 - position)
+
+def _expand(node, x, y, width, height, cuts):
+    """Adds the cuts of a planned part of a sheet, at (x, y), in order."""
+    if node is None:
+        return
+    axis, positions, stack, strokes, children = node
+    for position in positions:
+        if axis == 'x':
+            cuts.append(Cut('x', x + position, y, y + height, stack, strokes))
+        else:
+            cuts.append(Cut('y', y + position, x, x + width, stack, strokes))
+    for start, length, child in children:
+        if axis == 'x':
+            _expand(child, x + start, y, length, height, cuts)
+        else:
+            _expand(child, x, y + start, width, length, cuts)
@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Physical sizes of raster images, read from their headers.
+
+PNG, JPEG and TIFF files record their pixel dimensions and, usually,
+their resolution in their first few kilobytes: the PNG ``pHYs`` chunk,
+the JPEG JFIF header or EXIF data, and the TIFF resolution tags. This
+module reads only those headers, never the image data, so it can find
+the printed size of thousands of images a second.
+
+.. code-block:: python
+
+    from papersizes import images
+
+    size = images.image_size('scan.tif')
+    print(size.as_mm_str())
+"""
+import collections
+import concurrent.futures
+import os
+import struct
+
+from . import approx
+from .papersize import PaperSize
+from .units import inch, mm
+
+# ----------------------------------------------------------------------------
+# Image headers.
+# ----------------------------------------------------------------------------
+
+HEADER_BYTES = 16384
+"""The number of bytes read from the start of each file.
+
+This is enough for the headers of almost every image. Files with larger
+headers, such as JPEGs with big EXIF thumbnails, or TIFFs that store
+their directory at the end, are read further as needed.
+"""
+
+class ImageError(ValueError):
+    """Raised when an image's header can't be read."""
+
+class ImageInfo(collections.namedtuple(
+        'ImageInfo', 'format width_px height_px x_dpi y_dpi')):
+    """The pixel dimensions and resolution from an image header.
+
+    ``format`` is one of ``'png'``, ``'jpeg'`` or ``'tiff'``. The
+    resolutions are ``None`` if the header doesn't give them.
+    """
+    __slots__ = ()
+
+    def size(self, default_dpi=None):
+        """Returns the physical size of the image as a ``PaperSize``.
+
+        Raises :class:`ImageError` if the image has no resolution and no
+        ``default_dpi`` is given.
+        """
+        x_dpi, y_dpi = self.x_dpi, self.y_dpi
+        if not x_dpi or not y_dpi:
+            if default_dpi is None:
+                raise ImageError('image has no resolution')
+            x_dpi = y_dpi = default_dpi
+        return PaperSize(
+            self.width_px / x_dpi * inch, self.height_px / y_dpi * inch)
+
+def read_info(path, header_bytes=HEADER_BYTES):
+    """Reads the :class:`ImageInfo` from the header of an image file."""
+    with open(path, 'rb') as f:
+        return _parse(_Source(f, header_bytes))
+
+def parse_info(data):
+    """Parses an :class:`ImageInfo` from the bytes at the start of a file.
+
+    Raises :class:`ImageError` if the header needs more data than given.
+    """
+    return _parse(_Source(None, 0, data))
+
+def image_size(path, default_dpi=None):
+    """Returns the physical size of an image file as a ``PaperSize``."""
+    return read_info(path).size(default_dpi)
+
+class ImageSize(collections.namedtuple(
+        'ImageSize', 'path size name error')):
+    """The physical size of an image file, and its catalog name.
+
+    If the file can't be read, ``size`` and ``name`` are ``None`` and
+    ``error`` gives the reason.
+    """
+    __slots__ = ()
+
+def image_sizes(paths, default_dpi=None, tolerance=0.5*mm, workers=None,
+                max_in_flight=None):
+    """Generates an :class:`ImageSize` for each of the given paths, in order.
+
+    Headers are read in a pool of threads, since the work is dominated
+    by waiting for the file system. Each size is named from the catalog,
+    within the given tolerance. Paths are consumed lazily, with at most
+    ``max_in_flight`` files being read or waiting to be read at once;
+    it defaults to four times the number of workers, or of CPUs if the
+    number of workers isn't given.
+    """
+    def _read(path):
+        try:
+            size = image_size(path, default_dpi)
+        except (OSError, ImageError) as error:
+            return ImageSize(path, None, None, str(error))
+        return ImageSize(
+            path, size, approx.catalog_name(size, tolerance), None)
+
+    if max_in_flight is None:
+        max_in_flight = 4 * (workers or os.cpu_count() or 1)
+    with concurrent.futures.ThreadPoolExecutor(workers) as executor:
+        pending = collections.deque()
+        for path in paths:
+            if len(pending) >= max_in_flight:
+                yield pending.popleft().result()
+            pending.append(executor.submit(_read, path))
+        while pending:
+            yield pending.popleft().result()
+
+def read_image(path, box=None):
+    """Reads an image's size, as a :mod:`papersizes.scan` reader.
+
+    Images have no page boxes, so ``box`` is ignored. Images without a
+    resolution are an error, since their physical size is unknown.
+    """
+    return [tuple(image_size(path))]
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+# Files are read further than the header, if needed, up to this limit.
+_MAX_BYTES = 16 * 1024 * 1024
+
+class _Source(object):
+    """The bytes of a file, read with a single read for the common case."""
+    def __init__(self, file, header_bytes, data=None):
+        self.file = file
+        self.data = data if data is not None else file.read(header_bytes)
+
+    def get(self, offset, length):
+        """Returns the given bytes, reading more of the file if needed."""
+        end = offset + length
+        if end > len(self.data):
+            if self.file is not None and end <= _MAX_BYTES:
+                self.file.seek(len(self.data))
+                wanted = max(end, 2 * len(self.data)) - len(self.data)
+                self.data += self.file.read(wanted)
+            if end > len(self.data):
+                raise ImageError('image header is truncated')
+        return self.data[offset:end]
+
+def _parse(source):
+    """Parses the image header from a source, by its signature."""
+    signature = source.data[:8]
+    if signature == b'\x89PNG\r\n\x1a\n':
+        return _parse_png(source)
+    elif signature[:2] == b'\xff\xd8':
+        return _parse_jpeg(source)
+    elif signature[:4] in (b'II*\x00', b'MM\x00*'):
+        width, height, x_dpi, y_dpi = _parse_tiff(source, 0)
+        if width is None or height is None:
+            raise ImageError('TIFF has no image dimensions')
+        return ImageInfo('tiff', width, height, x_dpi, y_dpi)
+    raise ImageError('unknown image format')
+
+def _parse_png(source):
+    """Reads the IHDR and pHYs chunks of a PNG."""
+    length, kind = struct.unpack('>I4s', source.get(8, 8))
+    if kind != b'IHDR':
+        raise ImageError('PNG has no IHDR chunk')
+    width, height = struct.unpack('>II', source.get(16, 8))
+    x_dpi = y_dpi = None
+    offset = 16 + length + 4
+    while True:
+        length, kind = struct.unpack('>I4s', source.get(offset, 8))
+        if kind == b'pHYs':
+            x, y, unit = struct.unpack('>IIB', source.get(offset + 8, 9))
+            if unit == 1:
+                # Pixels per metre.
+                x_dpi, y_dpi = x * 0.0254, y * 0.0254
+            break
+        elif kind in (b'IDAT', b'IEND'):
+            break
+        offset += 12 + length
+    return ImageInfo('png', width, height, x_dpi, y_dpi)
+
+# Start of frame markers, which give the image dimensions.
+_JPEG_FRAMES = frozenset((
+    0xc0, 0xc1, 0xc2, 0xc3, 0xc5, 0xc6, 0xc7,
+    0xc9, 0xca, 0xcb, 0xcd, 0xce, 0xcf))
+
+def _parse_jpeg(source):
+    """Reads the JFIF, EXIF and start of frame segments of a JPEG."""
+    jfif = exif = size = None
+    offset = 2
+    while size is None:
+        marker = source.get(offset, 2)
+        if marker[0] != 0xff:
+            raise ImageError('bad JPEG marker')
+        kind = marker[1]
+        if kind == 0xff:
+            # Padding.
+            offset += 1
+            continue
+        if kind in (0xd8, 0x01) or 0xd0 <= kind <= 0xd7:
+            offset += 2
+            continue
+        if kind in (0xd9, 0xda):
+            break
+        length = struct.unpack('>H', source.get(offset + 2, 2))[0]
+        start = offset + 4
+        if kind in _JPEG_FRAMES:
+            height, width = struct.unpack('>HH', source.get(start + 1, 4))
+            size = width, height
+        elif kind == 0xe0 and jfif is None and length >= 14:
+            if source.get(start, 5) == b'JFIF\x00':
+                units, x, y = struct.unpack('>BHH', source.get(start + 7, 5))
+                if units == 1:
+                    jfif = float(x), float(y)
+                elif units == 2:
+                    jfif = x * 2.54, y * 2.54
+        elif kind == 0xe1 and exif is None and length >= 14:
+            if source.get(start, 6) == b'Exif\x00\x00':
+                try:
+                    _, _, x_dpi, y_dpi = _parse_tiff(source, start + 6)
+                except (ImageError, struct.error):
+                    x_dpi = y_dpi = None
+                if x_dpi and y_dpi:
+                    exif = x_dpi, y_dpi
+        offset += 2 + length
+
+    if size is None:
+        raise ImageError('JPEG has no frame header')
+    x_dpi, y_dpi = jfif or exif or (None, None)
+    return ImageInfo('jpeg', size[0], size[1], x_dpi, y_dpi)
+
+# TIFF field types that can hold the tags we read, with their formats.
+_TIFF_TYPES = {3: 'H', 4: 'I', 5: 'II'}
+
+def _parse_tiff(source, base):
+    """Reads the first directory of a TIFF structure at the given offset.
+
+    Returns (width, height, x dpi, y dpi), any of which may be None.
+    """
+    order = source.get(base, 2)
+    if order == b'II':
+        endian = '<'
+    elif order == b'MM':
+        endian = '>'
+    else:
+        raise ImageError('bad TIFF byte order')
+    directory = struct.unpack(endian + 'I', source.get(base + 4, 4))[0]
+    count = struct.unpack(endian + 'H', source.get(base + directory, 2))[0]
+    entries = source.get(base + directory + 2, 12 * count)
+
+    values = {}
+    for index in range(count):
+        tag, kind, number, field = struct.unpack(
+            endian + 'HHI4s', entries[12 * index:12 * index + 12])
+        if tag not in (256, 257, 282, 283, 296) or kind not in _TIFF_TYPES:
+            continue
+        if kind == 5:
+            pointer = struct.unpack(endian + 'I', field)[0]
+            numerator, denominator = struct.unpack(
+                endian + 'II', source.get(base + pointer, 8))
+            values[tag] = numerator / denominator if denominator else None
+        else:
+            values[tag] = struct.unpack(
+                endian + _TIFF_TYPES[kind], field[:struct.calcsize(
+                    _TIFF_TYPES[kind])])[0]
+
+    unit = values.get(296, 2)
+    x_dpi, y_dpi = values.get(282), values.get(283)
+    if unit == 3:
+        x_dpi = x_dpi * 2.54 if x_dpi else None
+        y_dpi = y_dpi * 2.54 if y_dpi else None
+    elif unit != 2:
+        x_dpi = y_dpi = None
+    return values.get(256), values.get(257), x_dpi, y_dpi
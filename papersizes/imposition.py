@@ -0,0 +1,290 @@
+# -*- coding: utf-8 -*-
+"""
+Page placement for books printed as folded signatures.
+
+Books are printed several pages at a time on large press sheets, which
+are folded into signatures of 4, 8, 16 or 32 pages, gathered, bound and
+trimmed. For the pages to come out in order and the right way up, each
+must be placed on the sheet at the right position, on the right side,
+and sometimes upside down. This module works out those placements by
+folding a model of the sheet, and so gives every page of a book its
+position, rotation and sheet side.
+
+The layout of a signature is calculated once for each scheme and size,
+so imposing a long book is mostly a matter of repeating it.
+
+.. code-block:: python
+
+    from papersizes import imposition, papersizes
+
+    book = imposition.impose(
+        320, papersizes.A_FORMAT_PAPERBACK, papersizes.SRA2,
+        pages_per_signature=16)
+    for placement in book.sheet(0, imposition.FRONT):
+        print(placement)
+"""
+import array
+import collections
+import functools
+
+from .papersize import PaperSize
+
+# ----------------------------------------------------------------------------
+# Signatures.
+# ----------------------------------------------------------------------------
+
+FRONT = 0
+"""The side of the sheet with the first page of the signature on it."""
+
+BACK = 1
+"""The other side of the sheet."""
+
+SCHEMES = {
+    4: 'x',
+    8: 'yx',
+    16: 'xyx',
+    32: 'yxyx',
+    }
+"""The folds used for each number of pages per signature.
+
+An ``x`` fold brings the left half of the sheet over onto the right, an
+``y`` fold the top half down onto the bottom. The last fold is always
+an ``x`` fold, and forms the spine.
+"""
+
+class Placement(collections.namedtuple(
+        'Placement', 'page signature side x y rotation')):
+    """The position of one page on a press sheet.
+
+    ``page`` is the page number, from 1, or 0 for a blank page used to
+    fill the last signature. ``side`` is :data:`FRONT` or :data:`BACK`.
+    ``x`` and ``y`` are the bottom left corner of the page's trim, as
+    seen when looking at that side of the sheet, before any rotation;
+    ``rotation`` is 0 or 180 degrees about the centre of the page.
+    """
+    __slots__ = ()
+
+class Imposition(object):
+    """The placements of every page of a book.
+
+    Placements are stored in parallel arrays, in order of signature then
+    page, so ``page[i]``, ``signature[i]``, ``side[i]``, ``x[i]``,
+    ``y[i]`` and ``rotation[i]`` describe one page. There is one press
+    sheet per signature.
+    """
+    def __init__(self, page_count, trim_size, sheet_size,
+                 pages_per_signature, columns, rows, page, signature, side,
+                 x, y, rotation):
+        self.page_count = page_count
+        self.trim_size = trim_size
+        self.sheet_size = sheet_size
+        self.pages_per_signature = pages_per_signature
+        self.columns = columns
+        self.rows = rows
+        self.page = page
+        self.signature = signature
+        self.side = side
+        self.x = x
+        self.y = y
+        self.rotation = rotation
+
+    @property
+    def signatures(self):
+        """The number of signatures, and so of press sheets."""
+        return len(self.page) // self.pages_per_signature
+
+    @property
+    def blank_pages(self):
+        """The number of blank pages added to fill the last signature."""
+        return len(self.page) - self.page_count
+
+    def __len__(self):
+        return len(self.page)
+
+    def __getitem__(self, index):
+        return Placement(
+            self.page[index], self.signature[index], self.side[index],
+            self.x[index], self.y[index], self.rotation[index])
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def placement(self, page):
+        """Returns the :class:`Placement` of the given page number."""
+        if not 1 <= page <= self.page_count:
+            raise IndexError('page out of range: {0}'.format(page))
+        return self[page - 1]
+
+    def sheet(self, signature, side):
+        """Returns the placements on one side of a signature's sheet."""
+        start = signature * self.pages_per_signature
+        return [
+            self[index]
+            for index in range(start, start + self.pages_per_signature)
+            if self.side[index] == side]
+
+def impose(page_count, trim_size, sheet_size, pages_per_signature=16,
+           gutter=0.0, creep=0.0):
+    """Places every page of a book on press sheets.
+
+    Raises ``ValueError`` if the pages of a signature don't fit on the
+    sheet.
+
+    Arguments:
+
+    ``page_count``
+        The number of pages in the book. The last signature is filled
+        with blank pages.
+
+    ``trim_size``
+        The finished size of each page.
+
+    ``sheet_size``
+        The size of each press sheet.
+
+    ``pages_per_signature``
+        One of the keys of :data:`SCHEMES`.
+
+    ``gutter``
+        The space between neighbouring pages on the sheet, for trimming.
+
+    ``creep``
+        How far each leaf of a signature pushes out the leaves inside
+        it, roughly the thickness of the paper. Pages are moved towards
+        the spine by this much for each leaf outside them, so their
+        margins are even after trimming.
+    """
+    if pages_per_signature not in SCHEMES:
+        raise ValueError(
+            'unsupported pages per signature: {0}'.format(
+                pages_per_signature))
+    if page_count < 1:
+        raise ValueError('a book needs at least one page')
+    trim_size = PaperSize(*trim_size)
+    sheet_size = PaperSize(*sheet_size)
+    columns, rows, sides, xs, ys, rotations = _layout(
+        pages_per_signature, trim_size, sheet_size, gutter, creep)
+
+    signatures = -(-page_count // pages_per_signature)
+    pages = array.array('l')
+    signature_numbers = array.array('l')
+    for number in range(signatures):
+        first = number * pages_per_signature + 1
+        pages.extend(
+            first + offset if first + offset <= page_count else 0
+            for offset in range(pages_per_signature))
+        signature_numbers.extend([number] * pages_per_signature)
+    return Imposition(
+        page_count, trim_size, sheet_size, pages_per_signature, columns,
+        rows, pages, signature_numbers,
+        array.array('b', sides) * signatures,
+        array.array('d', xs) * signatures,
+        array.array('d', ys) * signatures,
+        array.array('h', rotations) * signatures)
+
+def signature_layout(pages_per_signature):
+    """Returns where each page of a signature goes on its sheet.
+
+    Returns a list with an entry for each page of the signature, in
+    order, of (side, column, row, rotation). Columns and rows are
+    counted from the bottom left of that side of the sheet.
+    """
+    if pages_per_signature not in SCHEMES:
+        raise ValueError(
+            'unsupported pages per signature: {0}'.format(
+                pages_per_signature))
+    return [
+        (side, column, row, rotation)
+        for side, column, row, rotation, _, _ in _fold(pages_per_signature)]
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+@functools.lru_cache(maxsize=None)
+def _fold(pages_per_signature):
+    """Folds a model of the sheet, to find the position of each page.
+
+    Each cell of the sheet's grid holds one leaf of the signature. The
+    cells are folded into a single stack, tracking which side of each
+    leaf faces up and whether it has been turned upside down. Reading
+    down the stack then gives the pages in order.
+
+    Returns a tuple with an entry for each page, of (side, column, row,
+    rotation, depth, recto), where depth is the number of leaves outside
+    the page's leaf, and recto is true for right hand pages.
+    """
+    folds = SCHEMES[pages_per_signature]
+    columns = 2 ** folds.count('x')
+    rows = 2 ** folds.count('y')
+    # Stacks of (column, row, side facing up, upside down), bottom first.
+    # The sheet starts back up, so the first page ends up on the front.
+    grid = dict(
+        ((column, row), [(column, row, BACK, False)])
+        for column in range(columns) for row in range(rows))
+    width, height = columns, rows
+    for fold in folds:
+        folded = {}
+        if fold == 'x':
+            width //= 2
+            for column in range(width):
+                for row in range(height):
+                    base = grid[width + column, row]
+                    moved = grid[width - 1 - column, row]
+                    folded[column, row] = base + [
+                        (c, r, 1 - side, upside_down)
+                        for c, r, side, upside_down in reversed(moved)]
+        else:
+            height //= 2
+            for column in range(width):
+                for row in range(height):
+                    base = grid[column, row]
+                    moved = grid[column, 2 * height - 1 - row]
+                    folded[column, row] = base + [
+                        (c, r, 1 - side, not upside_down)
+                        for c, r, side, upside_down in reversed(moved)]
+        grid = folded
+
+    stack = grid[0, 0][::-1]
+    leaves = len(stack)
+    result = []
+    for depth, (column, row, side, upside_down) in enumerate(stack):
+        depth = min(depth, leaves - 1 - depth)
+        rotation = 180 if upside_down else 0
+        for face in (side, 1 - side):
+            # The model is seen from the back, so the front is mirrored.
+            seen_column = column if face == BACK else columns - 1 - column
+            result.append(
+                (face, seen_column, row, rotation, depth, face == side))
+    return tuple(result)
+
+@functools.lru_cache(maxsize=256)
+def _layout(pages_per_signature, trim_size, sheet_size, gutter, creep):
+    """Positions the pages of one signature on its sheet."""
+    scheme = _fold(pages_per_signature)
+    columns = 2 ** SCHEMES[pages_per_signature].count('x')
+    rows = 2 ** SCHEMES[pages_per_signature].count('y')
+    width, height = trim_size
+    block_width = columns * width + (columns - 1) * gutter
+    block_height = rows * height + (rows - 1) * gutter
+    if block_width > sheet_size.width or block_height > sheet_size.height:
+        raise ValueError(
+            '{0} pages of {1} do not fit on a sheet of {2}'.format(
+                pages_per_signature, trim_size.as_mm_str(),
+                sheet_size.as_mm_str()))
+    left = (sheet_size.width - block_width) / 2.0
+    bottom = (sheet_size.height - block_height) / 2.0
+
+    sides, xs, ys, rotations = [], [], [], []
+    for side, column, row, rotation, depth, recto in scheme:
+        # Towards the spine, which is on the left of a right hand page.
+        shift = -creep * depth if recto else creep * depth
+        if rotation:
+            shift = -shift
+        sides.append(side)
+        xs.append(left + column * (width + gutter) + shift)
+        ys.append(bottom + row * (height + gutter))
+        rotations.append(rotation)
+    return (columns, rows, tuple(sides), tuple(xs), tuple(ys),
+            tuple(rotations))
@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+Matching paper sizes against the catalog, allowing for uniform scaling.
+
+PDFs often contain pages that are a standard size scaled up or down,
+for example an A4 page printed at 97%, or a Letter page shrunk to fit.
+An exact comparison with
+:meth:`~papersizes.papersize.PaperSize.is_approximately` misses these.
+Scaling changes a page's area but not its ratio, so this module matches
+sizes by ratio, then picks the candidate whose area needs the least
+scaling to fit.
+"""
+import bisect
+import collections
+import math
+
+from . import catalog
+from .papersize import PaperSize
+
+# ----------------------------------------------------------------------------
+# Scaled matches.
+# ----------------------------------------------------------------------------
+
+class ScaledMatch(collections.namedtuple(
+        'ScaledMatch', 'name size scale residual')):
+    """The catalog size that a page is a scaled version of.
+
+    ``size`` is the catalog size, as defined, and ``scale`` the factor
+    it must be multiplied by to give the page. ``residual`` is the
+    largest difference, in points, between a side of the page and the
+    corresponding side of the scaled catalog size.
+    """
+    __slots__ = ()
+
+    def is_scaled(self, tolerance=0.001):
+        """Check if the scale differs from 1 by more than the tolerance."""
+        return abs(self.scale - 1.0) > tolerance
+
+class ScaledMatcher(object):
+    """Finds the catalog size that a page is a uniformly scaled version of.
+
+    Catalog sizes are indexed in a grid over (ratio, log area) space:
+    each cell holds the sizes whose ratios fall in a band as wide as the
+    ratio tolerance, sorted by log area. A query only visits the cells
+    on either side of its own ratio, and binary searches them for the
+    nearest area, so its cost doesn't grow with the size of the catalog.
+
+    Arguments:
+
+    ``entries``
+        The sizes to match against, as (name, size) pairs. Defaults to
+        :func:`papersizes.catalog.canonical_entries`.
+
+    ``ratio_tolerance``
+        How far, as a fraction, a page's ratio may be from a catalog
+        size's ratio for it to be a match.
+
+    ``min_scale``, ``max_scale``
+        The range of scale factors that are considered a match.
+    """
+    def __init__(self, entries=None, ratio_tolerance=0.005,
+                 min_scale=0.5, max_scale=2.0):
+        if entries is None:
+            entries = catalog.canonical_entries()
+        if ratio_tolerance <= 0:
+            raise ValueError('ratio tolerance must be positive')
+
+        self.ratio_tolerance = ratio_tolerance
+        self.min_scale = min_scale
+        self.max_scale = max_scale
+        self._log_tolerance = math.log1p(ratio_tolerance)
+        self._entries = []
+        self._cells = collections.defaultdict(list)
+        for name, size in entries:
+            size = PaperSize(*size)
+            log_ratio = math.log(size.ratio)
+            log_area = math.log(size.area_in_sq_pts)
+            index = len(self._entries)
+            self._entries.append((name, size, log_ratio))
+            self._cells[self._cell(log_ratio)].append((log_area, index))
+        for cell in self._cells.values():
+            cell.sort()
+        self._cell_keys = {
+            key: [log_area for log_area, _ in cell]
+            for key, cell in self._cells.items()}
+
+    def match(self, size):
+        """Returns the :class:`ScaledMatch` for the given size, or ``None``.
+
+        The size can be given as any (width, height) tuple, in either
+        orientation. Where several catalog sizes have a matching ratio,
+        the one with the smallest combined error is chosen: its ratio
+        error as a fraction of the tolerance, and its log scale as a
+        fraction of the allowed scale range. Equally good matches are
+        settled in favour of the page's orientation.
+        """
+        width, height = size[0], size[1]
+        if not (width > 0 and height > 0):
+            return None
+        short, long = (width, height) if width <= height else (height, width)
+        log_ratio = math.log(long / short)
+        log_area = math.log(width * height)
+        is_landscape = width > height
+        # Areas scale with the square of the scale factor.
+        log_min_scale = math.log(self.min_scale)
+        log_max_scale = math.log(self.max_scale)
+        max_distance = 2.0 * max(abs(log_min_scale), abs(log_max_scale))
+
+        best = None
+        best_score = 2.0
+        cell = self._cell(log_ratio)
+        for key in (cell - 1, cell, cell + 1):
+            entries = self._cells.get(key)
+            if entries is None:
+                continue
+            keys = self._cell_keys[key]
+            position = bisect.bisect(keys, log_area)
+            # Walk outwards from the nearest areas until the area alone
+            # makes a candidate worse than the current best.
+            below, above = position - 1, position
+            while below >= 0 or above < len(entries):
+                below_distance = log_area - keys[below] \
+                    if below >= 0 else None
+                above_distance = keys[above] - log_area \
+                    if above < len(entries) else None
+                if above_distance is None or (
+                        below_distance is not None and
+                        below_distance <= above_distance):
+                    distance, index = below_distance, entries[below][1]
+                    log_scale = 0.5 * distance
+                    below -= 1
+                else:
+                    distance, index = above_distance, entries[above][1]
+                    log_scale = -0.5 * distance
+                    above += 1
+                area_score = (distance / max_distance) ** 2
+                if area_score > best_score:
+                    break
+                # Out of range candidates mustn't beat one in range.
+                if not log_min_scale - _EPSILON <= log_scale <= \
+                        log_max_scale + _EPSILON:
+                    continue
+                _, entry_size, entry_log_ratio = self._entries[index]
+                ratio_error = abs(entry_log_ratio - log_ratio)
+                if ratio_error > self._log_tolerance:
+                    continue
+                rank = (
+                    area_score + (ratio_error / self._log_tolerance) ** 2,
+                    entry_size.is_landscape() != is_landscape)
+                if best is None or rank < best[0]:
+                    best = rank, index
+                    best_score = rank[0]
+        if best is None:
+            return None
+
+        name, match_size, _ = self._entries[best[1]]
+        scale = math.sqrt(width * height / match_size.area_in_sq_pts)
+        portrait = match_size.portrait()
+        residual = max(
+            abs(short - portrait.width * scale),
+            abs(long - portrait.height * scale))
+        return ScaledMatch(name, match_size, scale, residual)
+
+    def match_many(self, sizes):
+        """Matches each of the given sizes, returning a list of results.
+
+        Sizes that appear more than once are only matched once.
+        """
+        match = self.match
+        seen = {}
+        results = []
+        for size in sizes:
+            key = size[0], size[1]
+            if key in seen:
+                result = seen[key]
+            else:
+                result = seen[key] = match(key)
+            results.append(result)
+        return results
+
+    def _cell(self, log_ratio):
+        """The grid cell holding the given log ratio."""
+        return int(math.floor(log_ratio / self._log_tolerance))
+
+def match_scaled(sizes, **kwargs):
+    """Matches a batch of sizes against the catalog, allowing for scaling.
+
+    Returns a list with a :class:`ScaledMatch` or ``None`` for each
+    size. Keyword arguments are passed to :class:`ScaledMatcher`. To
+    match many batches, create a matcher once and reuse it.
+    """
+    if kwargs:
+        matcher = ScaledMatcher(**kwargs)
+    else:
+        matcher = _default_matcher()
+    return matcher.match_many(sizes)
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_EPSILON = 1e-12
+
+_default = []
+def _default_matcher():
+    """Returns a matcher for the catalog, creating it on first use."""
+    if not _default:
+        _default.append(ScaledMatcher())
+    return _default[0]
@@ -0,0 +1,327 @@
+# -*- coding: utf-8 -*-
+"""
+A pandas column type for paper sizes, and a ``.paper`` accessor.
+
+A column of :class:`~papersizes.papersize.PaperSize` values in pandas is
+otherwise an ``object`` column, with a Python tuple for every row. The
+``papersize`` dtype defined here stores a column as two ``float64``
+arrays, of widths and heights, and the ``.paper`` accessor works on
+those arrays directly.
+
+This module needs pandas, which isn't otherwise a requirement of
+papersizes; importing it registers the dtype and the accessor.
+
+.. code-block:: python
+
+    import pandas as pd
+    import papersizes.pandas_ext
+    from papersizes.units import mm
+
+    jobs = pd.DataFrame({'size': ['A4', 'A5 landscape', '8½x11"']})
+    jobs['size'] = jobs['size'].astype('papersize')
+    jobs['sheet'] = jobs['size'].paper.add_bleed(3*mm).paper.round_to_mm()
+    jobs['label'] = jobs['size'].paper.format('mm')
+
+Strings are parsed with :func:`papersizes.parse.paper_size`, and sizes
+are named with :func:`papersizes.approx.catalog_name`; each distinct
+value in a column is parsed or named once.
+"""
+import numbers
+
+import numpy as np
+import pandas as pd
+from pandas.api.extensions import (
+    ExtensionArray, ExtensionDtype, register_extension_dtype,
+    register_series_accessor, take)
+
+from . import approx
+from . import formatting
+from . import parse
+from .papersize import PaperSize
+from .units import mm
+
+# ----------------------------------------------------------------------------
+# Extension type.
+# ----------------------------------------------------------------------------
+
+@register_extension_dtype
+class PaperSizeDtype(ExtensionDtype):
+    """The pandas dtype of a column of paper sizes, named ``papersize``."""
+    name = 'papersize'
+    type = PaperSize
+    kind = 'O'
+    na_value = np.nan
+
+    @classmethod
+    def construct_array_type(Class):
+        return PaperSizeArray
+
+class PaperSizeArray(ExtensionArray):
+    """Paper sizes stored as two ``float64`` arrays.
+
+    A missing size has both its width and height NaN.
+    """
+    def __init__(self, widths, heights, copy=False):
+        convert = np.array if copy else np.asarray
+        self.widths = convert(widths, dtype='float64')
+        self.heights = convert(heights, dtype='float64')
+        if self.widths.shape != self.heights.shape or self.widths.ndim != 1:
+            raise ValueError('widths and heights must be the same length')
+
+    @classmethod
+    def _from_sequence(Class, scalars, dtype=None, copy=False):
+        if isinstance(scalars, Class):
+            return scalars.copy() if copy else scalars
+        scalars = list(scalars)
+        widths = np.empty(len(scalars))
+        heights = np.empty(len(scalars))
+        seen = {}
+        for index, value in enumerate(scalars):
+            if isinstance(value, str):
+                try:
+                    size = seen[value]
+                except KeyError:
+                    size = seen[value] = parse.paper_size(value)
+            elif _is_missing(value):
+                size = _MISSING
+            else:
+                size = value
+            widths[index], heights[index] = size[0], size[1]
+        return Class(widths, heights)
+
+    @classmethod
+    def _from_sequence_of_strings(Class, strings, dtype=None, copy=False):
+        return parse_sizes(strings)
+
+    @property
+    def dtype(self):
+        return PaperSizeDtype()
+
+    @property
+    def nbytes(self):
+        return self.widths.nbytes + self.heights.nbytes
+
+    def __len__(self):
+        return len(self.widths)
+
+    def __getitem__(self, item):
+        if isinstance(item, numbers.Integral):
+            width, height = self.widths[item], self.heights[item]
+            if np.isnan(width):
+                return self.dtype.na_value
+            return PaperSize(float(width), float(height))
+        item = pd.api.indexers.check_array_indexer(self, item)
+        return PaperSizeArray(self.widths[item], self.heights[item])
+
+    def __setitem__(self, key, value):
+        if not isinstance(key, numbers.Integral):
+            key = pd.api.indexers.check_array_indexer(self, key)
+        if isinstance(value, PaperSizeArray):
+            self.widths[key] = value.widths
+            self.heights[key] = value.heights
+            return
+        if _is_missing(value):
+            value = _MISSING
+        elif isinstance(value, str):
+            value = parse.paper_size(value)
+        elif not isinstance(value, tuple):
+            value = PaperSizeArray._from_sequence(value)
+            self.widths[key] = value.widths
+            self.heights[key] = value.heights
+            return
+        self.widths[key] = value[0]
+        self.heights[key] = value[1]
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def __array__(self, dtype=None, copy=None):
+        result = np.empty(len(self), dtype=object)
+        result[:] = list(self)
+        return result
+
+    def __eq__(self, other):
+        if isinstance(other, (pd.Series, pd.Index, pd.DataFrame)):
+            return NotImplemented
+        if isinstance(other, tuple) and len(other) == 2:
+            return (self.widths == other[0]) & (self.heights == other[1])
+        other = PaperSizeArray._from_sequence(other)
+        return (self.widths == other.widths) & \
+            (self.heights == other.heights)
+
+    def isna(self):
+        return np.isnan(self.widths)
+
+    def take(self, indices, allow_fill=False, fill_value=None):
+        if allow_fill and not _is_missing(fill_value):
+            fill_width, fill_height = fill_value[0], fill_value[1]
+        else:
+            fill_width = fill_height = np.nan
+        widths = take(self.widths, indices, allow_fill=allow_fill,
+                      fill_value=fill_width)
+        heights = take(self.heights, indices, allow_fill=allow_fill,
+                       fill_value=fill_height)
+        return PaperSizeArray(widths, heights)
+
+    def copy(self):
+        return PaperSizeArray(self.widths, self.heights, copy=True)
+
+    @classmethod
+    def _concat_same_type(Class, to_concat):
+        return Class(
+            np.concatenate([array.widths for array in to_concat]),
+            np.concatenate([array.heights for array in to_concat]))
+
+    def _values_for_factorize(self):
+        # Encodes each size as one complex number, so equal sizes are
+        # equal values.
+        return self.widths + 1j * self.heights, np.nan + 1j * np.nan
+
+    @classmethod
+    def _from_factorized(Class, values, original):
+        values = np.asarray(values)
+        return Class(values.real, values.imag)
+
+    def _values_for_argsort(self):
+        # Sizes sort by area.
+        return self.widths * self.heights
+
+def parse_sizes(values):
+    """Parses a sequence of strings into a :class:`PaperSizeArray`.
+
+    Each distinct string is parsed once, with
+    :func:`papersizes.parse.paper_size`. Missing values give missing
+    sizes.
+    """
+    codes, uniques = pd.factorize(np.asarray(values, dtype=object))
+    sizes = [parse.paper_size(value) for value in uniques]
+    widths = np.array([size[0] for size in sizes] + [np.nan])
+    heights = np.array([size[1] for size in sizes] + [np.nan])
+    # Missing values have a code of -1, which picks the trailing NaN.
+    return PaperSizeArray(widths[codes], heights[codes])
+
+# ----------------------------------------------------------------------------
+# Accessor.
+# ----------------------------------------------------------------------------
+
+@register_series_accessor('paper')
+class PaperAccessor(object):
+    """Operations on a Series of dtype ``papersize``, as ``series.paper``.
+
+    Operations returning sizes return a new ``papersize`` Series, and
+    those returning numbers or strings return a Series of them, with
+    the same index.
+    """
+    def __init__(self, series):
+        if not isinstance(series.dtype, PaperSizeDtype):
+            raise AttributeError(
+                "the .paper accessor needs a 'papersize' Series")
+        self._series = series
+        self._array = series.array
+
+    @property
+    def width(self):
+        """The width of each size."""
+        return self._numbers(self._array.widths)
+
+    @property
+    def height(self):
+        """The height of each size."""
+        return self._numbers(self._array.heights)
+
+    @property
+    def area(self):
+        """The area of each size, in square points."""
+        return self._numbers(self._array.widths * self._array.heights)
+
+    @property
+    def ratio(self):
+        """The ratio of the long to the short side of each size."""
+        widths, heights = self._array.widths, self._array.heights
+        return self._numbers(
+            np.maximum(widths, heights) / np.minimum(widths, heights))
+
+    def is_landscape(self):
+        """Whether each size is wider than it is tall."""
+        return self._numbers(self._array.widths > self._array.heights)
+
+    def is_portrait(self):
+        """Whether each size is taller than it is wide."""
+        return self._numbers(self._array.widths < self._array.heights)
+
+    def landscape(self):
+        """Each size, with its longer side horizontal."""
+        widths, heights = self._array.widths, self._array.heights
+        return self._sizes(
+            np.maximum(widths, heights), np.minimum(widths, heights))
+
+    def portrait(self):
+        """Each size, with its longer side vertical."""
+        widths, heights = self._array.widths, self._array.heights
+        return self._sizes(
+            np.minimum(widths, heights), np.maximum(widths, heights))
+
+    def flip(self):
+        """Each size, with its width and height swapped."""
+        return self._sizes(self._array.heights, self._array.widths)
+
+    def add_bleed(self, bleed):
+        """Each size, with ``bleed`` added to every side."""
+        return self._sizes(
+            self._array.widths + 2.0 * bleed,
+            self._array.heights + 2.0 * bleed)
+
+    def round_to_mm(self):
+        """Each size, rounded to the nearest millimetre."""
+        return self._sizes(
+            np.round(self._array.widths / mm) * mm,
+            np.round(self._array.heights / mm) * mm)
+
+    def format(self, unit='mm', precision=None):
+        """Formats each size, as :func:`papersizes.formatting.format_size`.
+
+        Missing sizes give missing strings.
+        """
+        return self._per_size(
+            lambda size: formatting.format_size(size, unit, precision))
+
+    def catalog_name(self, tolerance=0.1*mm):
+        """Names each size from the catalog, or gives ``None``.
+
+        As :func:`papersizes.approx.catalog_name`.
+        """
+        return self._per_size(
+            lambda size: approx.catalog_name(size, tolerance))
+
+    def _numbers(self, values):
+        return pd.Series(
+            values, index=self._series.index, name=self._series.name)
+
+    def _sizes(self, widths, heights):
+        return pd.Series(
+            PaperSizeArray(widths, heights), index=self._series.index,
+            name=self._series.name)
+
+    def _per_size(self, function):
+        """Applies a function to each distinct size that isn't missing."""
+        codes, uniques = pd.factorize(
+            self._array.widths + 1j * self._array.heights)
+        results = [
+            function(PaperSize(value.real, value.imag)) for value in uniques]
+        # Missing sizes have a code of -1, which picks the trailing None.
+        results.append(None)
+        results = np.array(results, dtype=object)
+        return pd.Series(
+            results[codes], index=self._series.index,
+            name=self._series.name)
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_MISSING = (np.nan, np.nan)
+
+def _is_missing(value):
+    return value is None or value is pd.NA or \
+        (isinstance(value, float) and np.isnan(value))
@@ -5,6 +5,7 @@ Page sizes and various mechanisms for manipulating them.
 import math
 import collections
 from .units import mm, inch
+from .formatting import format_eighths
 
 # ----------------------------------------------------------------------------
 # Page size tuple.
@@ -49,10 +50,10 @@ class PaperSize(collections.namedtuple('PaperSize', 'width height')):
             if height is None:
                 raise ValueError('width or height must be given')
             else:
-                return Class(height / ratio, width)
+                return Class(height / ratio, height)
         else:
             if height is None:
-                return Class(width, height * ratio)
+                return Class(width, width * ratio)
             else:
                 raise ValueError('only one of width or height may be given')
 
@@ -165,6 +166,29 @@ class PaperSize(collections.namedtuple('PaperSize', 'width height')):
         else:
             return self
 
+    def to_pixels(self, dpi, rounding='nearest'):
+        """Return the (width, height) of this paper in whole pixels.
+
+        Arguments:
+
+        ``dpi``
+            The resolution, in dots per inch. This can be a single
+            number, or a (horizontal, vertical) tuple for devices with
+            non-square pixels.
+
+        ``rounding``
+            How fractional pixels are resolved: ``'nearest'`` (the
+            default), ``'up'`` to always cover the whole page, or
+            ``'down'`` to never exceed it.
+        """
+        try:
+            x_dpi, y_dpi = dpi
+        except TypeError:
+            x_dpi = y_dpi = dpi
+        return (
+            _round_pixels(self.width / inch * x_dpi, rounding),
+            _round_pixels(self.height / inch * y_dpi, rounding))
+
     def as_pt_str(self):
         """Printable description of the size, to the nearest point."""
         return '{0:.0f}x{1:.0f}pt'.format(self.width, self.height)
@@ -175,14 +199,9 @@ class PaperSize(collections.namedtuple('PaperSize', 'width height')):
 
     def as_inch_str(self, unit='"'):
         """Printable description of the size, to the nearest ⅛ of an inch."""
-        EIGHTHS = ('', '⅛', '¼', '⅜', '½', '⅝', '¾', '⅞')
-        def _to_eight(val):
-            val /= inch
-            whole = math.floor(val)
-            eighth = round(val * 8) % 8
-            return '{0:.0f}{1}'.format(whole, EIGHTHS[eighth])
         return '{0}x{1}{2}'.format(
-            _to_eight(self.width), _to_eight(self.height), unit)
+            format_eighths(self.width / inch),
+            format_eighths(self.height / inch), unit)
 
     def __repr__(self):
         return 'PaperSize({0:f}, {1:f})'.format(self.width, self.height)
@@ -191,6 +210,54 @@ class PaperSize(collections.namedtuple('PaperSize', 'width height')):
         return '{0} ({1}, {2})'.format(
                 self.as_pt_str(), self.as_mm_str(), self.as_inch_str())
 
+class Margins(collections.namedtuple('Margins', 'left bottom right top')):
+    """The widths of the four margins around an area of a page, in points.
+
+    The sides are in the same order as the coordinates of a PDF
+    rectangle: (left, bottom, right, top).
+    """
+    __slots__ = ()
+
+    @classmethod
+    def uniform(Class, margin):
+        """Create margins that are the same width on every side."""
+        return Class(margin, margin, margin, margin)
+
+    @classmethod
+    def from_value(Class, value):
+        """Create margins from a single width or a 4-tuple of widths."""
+        if isinstance(value, Class):
+            return value
+        try:
+            left, bottom, right, top = value
+        except TypeError:
+            return Class.uniform(value)
+        return Class(left, bottom, right, top)
+
+    def is_uniform(self):
+        """Check if the margins are the same width on every side."""
+        return self.left == self.bottom == self.right == self.top
+
+    def is_within(self, tolerance):
+        """Check if every margin is no wider than the tolerance."""
+        return max(self) <= tolerance
+
+# Pixel counts within this distance of a whole number are treated as
+# whole, so float noise in unit conversion doesn't add a pixel when
+# rounding up, or lose one when rounding down.
+_PIXEL_EPSILON = 1e-6
+
+def _round_pixels(value, rounding):
+    """Rounds a fractional pixel count according to the named policy."""
+    if rounding == 'nearest':
+        return int(round(value))
+    elif rounding == 'up':
+        return int(math.ceil(value - _PIXEL_EPSILON))
+    elif rounding == 'down':
+        return int(math.floor(value + _PIXEL_EPSILON))
+    else:
+        raise ValueError('unknown rounding: {0!r}'.format(rounding))
+
 # ----------------------------------------------------------------------------
 # Page size generator.
 # ----------------------------------------------------------------------------
@@ -262,4 +329,143 @@ class ISO269Series(object):
                 self.min_cached = size
 
         # Cached data is in mm, so convert to pts.
-        return PaperSize.from_mm(*self.cache[size])
\ No newline at end of file
+        return PaperSize.from_mm(*self.cache[size])
+
+# ----------------------------------------------------------------------------
+# Series of any ratio.
+# ----------------------------------------------------------------------------
+
+# Size numbers within this distance of a whole number are treated as
+# whole, so a range ending exactly on a size includes it.
+_SERIES_EPSILON = 1e-9
+
+class RatioSeries(object):
+    """
+    A lazily calculated series of paper sizes that all share one ratio.
+
+    This generalises :class:`ISO269Series` to any of the ratios in
+    :mod:`papersizes.ratios`. Each size in the series has the same ratio
+    of long to short side, and is a fixed fraction of the area of the
+    size before it. That fraction comes from the subdivision rule:
+
+    ``'halve'``
+        Each size is half the area of the last, as for ISO 269. For the
+        :data:`~papersizes.ratios.ISO_RATIO` this is exactly the cut
+        parallel to the short edge.
+
+    ``'square'``
+        Each size is what remains when a square of the short side is
+        cut from the last. For the :data:`~papersizes.ratios.GOLDEN_RATIO`
+        this is exact, for other ratios the area shrinks by the same
+        factor, ``(ratio - 1) / ratio``.
+
+    ``'thirds'``
+        Each size is a third of the area of the last.
+
+    Sizes are calculated directly from their number, rather than by
+    repeated subdivision, so any size can be retrieved in constant time:
+    ``series[5]``, or ``series[-2]`` for sizes larger than the initial.
+
+    Paper sizes returned by this class are portrait oriented.
+
+    Arguments:
+
+    ``initial_size``
+        The 'reference' paper size for this series. This can be given as
+        any (width, height) tuple, it doesn't have to be a ``PaperSize``
+        instance. Only its area is used if a ``ratio`` is also given.
+
+    ``ratio``
+        The ratio of long to short side of every size in the series. If
+        not given, the ratio of the initial size is used.
+
+    ``rule``
+        The subdivision rule, one of ``'halve'`` (the default),
+        ``'square'`` or ``'thirds'``.
+
+    ``rounding``
+        ``None`` (the default) for exact sizes, ``'mm'`` to round each
+        size to the nearest mm, or any function taking and returning a
+        ``PaperSize``.
+
+    ``initial_number``
+        The size number of the initial paper size.
+    """
+    HALVE = 'halve'
+    REMOVE_SQUARE = 'square'
+    THIRDS = 'thirds'
+
+    def __init__(self, initial_size, ratio=None, rule=HALVE, rounding=None,
+                 initial_number=0):
+        initial_size = PaperSize(*initial_size).portrait()
+        if ratio is None:
+            ratio = initial_size.ratio
+        if ratio < 1.0:
+            ratio = 1.0 / ratio
+
+        if rule == RatioSeries.HALVE:
+            factor = 0.5
+        elif rule == RatioSeries.THIRDS:
+            factor = 1.0 / 3.0
+        elif rule == RatioSeries.REMOVE_SQUARE:
+            if ratio <= 1.0:
+                raise ValueError('cannot remove a square from a square')
+            factor = (ratio - 1.0) / ratio
+        else:
+            raise ValueError('unknown subdivision rule: {0!r}'.format(rule))
+
+        if rounding == 'mm':
+            rounding = PaperSize.round_to_mm
+        elif rounding is not None and not callable(rounding):
+            raise ValueError('unknown rounding: {0!r}'.format(rounding))
+
+        self.initial_size = initial_size
+        self.initial_number = initial_number
+        self.ratio = ratio
+        self.rule = rule
+        self.rounding = rounding
+        self.factor = factor
+        self._initial_area = initial_size.area_in_sq_pts
+        self._log_factor = math.log(factor)
+
+    def __repr__(self):
+        return "Ratio Series, {0} at size {1}, ratio {2!r}, rule {3!r}".format(
+            repr(self.initial_size),
+            repr(self.initial_number),
+            self.ratio,
+            self.rule)
+
+    def __getitem__(self, size):
+        area = self.area(size)
+        short = math.sqrt(area / self.ratio)
+        result = PaperSize(short, short * self.ratio)
+        if self.rounding is not None:
+            result = self.rounding(result)
+        return result
+
+    def area(self, size):
+        """The unrounded area of the given size number, in square points."""
+        return self._initial_area * self.factor ** (size - self.initial_number)
+
+    def number_for_area(self, area):
+        """The size number whose area is closest to the given area."""
+        return self.initial_number + int(round(
+            math.log(area / self._initial_area) / self._log_factor))
+
+    def between(self, min_area, max_area):
+        """Generates the sizes with areas in the given range, largest first.
+
+        Each item generated is a (number, size) tuple. Bounds are
+        checked against the unrounded area of each size, and the sizes
+        are only calculated as they are requested.
+        """
+        if min_area <= 0 or max_area < min_area:
+            return
+        # The factor is less than one, so numbers grow as areas shrink.
+        first = math.log(max_area / self._initial_area) / self._log_factor
+        last = math.log(min_area / self._initial_area) / self._log_factor
+        first = int(math.ceil(first - _SERIES_EPSILON))
+        last = int(math.floor(last + _SERIES_EPSILON))
+        for number in range(first, last + 1):
+            number += self.initial_number
+            yield number, self[number]
@@ -1,30 +1,69 @@
 # -*- coding: utf-8 -*-
 """Parsing for dimensions and paper sizes."""
+import functools
+import operator
+import re
 
 from . import units
 from . import papersizes
 from . import papersize
 
 def dimension(size_string):
-    """Parses a numeric dimension, returning a size in points."""
-    size_string, unit = __extract_unit(size_string)
-    return __parse_number(size_string) * unit
-
-def paper_size(size_string):
-    """Parses a paper size string, either a name or a pair of dimensions."""
-    # Check for a modification.
-    normalised_string = __normalise_size_name(size_string)
-    if normalised_string.endswith(' landscape'):
-        modification = papersize.PaperSize.landscape
-        normalised_string = normalised_string[:-10].strip()
-    elif normalised_string.endswith(' portrait'):
-        modification = papersize.PaperSize.portrait
-        normalised_string = normalised_string[:-9].strip()
-    else:
-        modification = None
+    """Parses a dimension, returning a size in points.
+
+    As well as a single number and unit, such as ``'3mm'`` or ``'8½"'``,
+    the dimension can be an expression, as described in
+    :func:`compile_dimension`, such as ``'A4.width - 2*20mm'``.
+    """
+    return compile_dimension(size_string)()
+
+def compile_dimension(expression):
+    """Compiles a dimension expression to a function returning points.
+
+    Expressions can add, subtract, multiply and divide dimensions, with
+    parentheses, such as ``'210mm + 2*3mm'`` or ``'(8½ + ¼)in / 2'``.
+    Numbers without a unit are in points, which also makes them plain
+    numbers, since a point is the unit. The width and height of a named
+    paper size can be used, as in ``'A4.width'`` or ``'letter.height'``.
+
+    Any other names are variables, given as keyword arguments to the
+    compiled function: ``compile_dimension('trim + 2*bleed')(trim=...,
+    bleed=...)``. Parts of an expression without variables are worked
+    out when it is compiled.
+
+    Compiled functions are cached by expression, so compiling the same
+    expression again is a dictionary lookup. Raises ``ValueError`` if
+    the expression is invalid or divides by zero, or if a variable is
+    missing when it is evaluated.
+    """
+    return __compile_dimension(expression)
+
+def paper_size(size_string, catalog=None):
+    """Parses a paper size string, either a name or a pair of dimensions.
+
+    Names can be any of the size constants in
+    :mod:`papersizes.papersizes`, or an alias of one, such as ``'DIN
+    A4'``, ``'US Letter'``, ``'B5判'``, ``'4x6/5'`` or a PWG name such as
+    ``'iso_a4_210x297mm'``. A name can end with an orientation, in
+    English or another common language, such as ``'A4 landscape'``,
+    ``'A4 Querformat'`` or ``'A4横'``.
+
+    Names are looked up in ``catalog`` first, if it is given, then in
+    the built-in sizes. The catalog is any object with a
+    ``size_by_name(name)`` method taking a name normalised by
+    :func:`normalise_size_name`, and returning a size or ``None``, such
+    as a :class:`papersizes.catalogfile.CatalogFile`.
+    """
+    normalised_string = normalise_size_name(size_string)
 
-    # Try to get the papersize by name.
-    size = __parse_paper_size_by_name(normalised_string)
+    # Try to get the papersize by name, with or without a modification.
+    modification = None
+    size = __size_by_name(normalised_string, catalog)
+    if size is None:
+        modification, name = __split_orientation(normalised_string)
+        if modification is not None:
+            normalised_string = name
+            size = __size_by_name(normalised_string, catalog)
     if size is None:
         # Otherwise interpret it as dimensions, separated by an x.
         width_string, height_string = normalised_string.split('x', 2)
@@ -43,6 +82,22 @@ def paper_size(size_string):
 
     return size
 
+def normalise_size_name(name):
+    """Normalises a size name for lookup, e.g. ``'JIS-B5'`` to ``'jis b5'``.
+
+    Names that differ only in capitalisation, in using underscores,
+    hyphens or spaces, or in using full-width forms of letters and
+    digits, normalise to the same string.
+    """
+    return ' '.join(name.translate(__name_translation).casefold().split())
+
+def register_alias(alias, size):
+    """Adds another name for a paper size, used by :func:`paper_size`.
+
+    The alias replaces any size already with that name.
+    """
+    __sizes_by_name[normalise_size_name(alias)] = size
+
 # -----------------------------------------------------------------------
 # Internals
 # -----------------------------------------------------------------------
@@ -66,7 +121,8 @@ def __extract_unit(size_string, default_unit=units.pt):
     """Finds a unit at the end of the given string."""
     unit = default_unit
 
-    size_string = size_string.strip()
+    # Allow an abbreviated unit, such as 'in.'.
+    size_string = size_string.strip().rstrip('.')
     for suffix, unit_value in __size_units:
         if size_string.endswith(suffix):
             unit = unit_value
@@ -95,15 +151,265 @@ def __parse_number(number_as_string):
             number = float(number_as_string)
         return number
 
-def __normalise_size_name(name):
-    """Makes sure the name has the correct capitalisation and punctuation."""
-    return name.lower().replace('_', ' ').replace('-', ' ')
+__units_by_name = dict(__size_units)
+
+__dimension_token = re.compile(r"""
+    \s*(?:
+    (?P<number>
+        (?:\d+(?:\.\d*)?|\.\d+)(?:[eE][-+]?\d+)?(?:\s*[⅛¼⅜½⅝¾⅞])?
+        |[⅛¼⅜½⅝¾⅞])
+    |(?P<name>[A-Za-z_][A-Za-z0-9_]*|")
+    |(?P<symbol>[-+*/().])
+    )""", re.VERBOSE)
+
+def __divide(dividend, divisor):
+    if divisor == 0:
+        raise ValueError('division by zero in dimension')
+    return dividend / divisor
+
+__operators = {
+    '+': operator.add,
+    '-': operator.sub,
+    '*': operator.mul,
+    '/': __divide,
+    }
+
+def __tokenize_dimension(expression):
+    """Splits a dimension expression into (kind, text) tokens."""
+    tokens = []
+    position = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match = __dimension_token.match(expression, position)
+        if match is None:
+            raise ValueError(
+                'invalid dimension: {0!r}'.format(expression))
+        tokens.append((match.lastgroup, match.group(match.lastgroup)))
+        position = match.end()
+    return tokens
+
+@functools.lru_cache(maxsize=1024)
+def __compile_dimension(expression):
+    """Parses an expression into a tree of closures.
+
+    Each node is a (value, function) pair: value is the node's constant
+    value, if it has no variables, otherwise function takes the
+    dictionary of variables and returns the node's value.
+    """
+    tokens = __tokenize_dimension(expression)
+    position = [0]
+
+    def error():
+        return ValueError('invalid dimension: {0!r}'.format(expression))
+
+    def peek(offset=0):
+        index = position[0] + offset
+        return tokens[index] if index < len(tokens) else (None, None)
+
+    def take():
+        token = peek()
+        position[0] += 1
+        return token
+
+    def combine(symbol, left, right):
+        function = __operators[symbol]
+        if left[1] is None and right[1] is None:
+            return function(left[0], right[0]), None
+        left_value, left_function = left
+        right_value, right_function = right
+        if left_function is None:
+            left_function = lambda variables: left_value
+        if right_function is None:
+            right_function = lambda variables: right_value
+        return None, lambda variables: function(
+            left_function(variables), right_function(variables))
+
+    def with_unit(node):
+        # An optional unit after a number or parenthesised expression.
+        kind, text = peek()
+        if kind == 'name' and text in __units_by_name and \
+                peek(1) != ('symbol', '.'):
+            take()
+            return combine('*', node, (__units_by_name[text], None))
+        return node
+
+    def expression_():
+        node = term()
+        while peek() in (('symbol', '+'), ('symbol', '-')):
+            node = combine(take()[1], node, term())
+        return node
+
+    def term():
+        node = unary()
+        while peek() in (('symbol', '*'), ('symbol', '/')):
+            node = combine(take()[1], node, unary())
+        return node
+
+    def unary():
+        if peek() == ('symbol', '-'):
+            take()
+            return combine('-', (0.0, None), unary())
+        if peek() == ('symbol', '+'):
+            take()
+        return primary()
+
+    def primary():
+        kind, text = take()
+        if kind == 'number':
+            return with_unit((__parse_number(text), None))
+        elif kind == 'name':
+            if peek() == ('symbol', '.'):
+                take()
+                size = __parse_paper_size_by_name(normalise_size_name(text))
+                attribute = take()
+                if size is None or attribute[0] != 'name' or \
+                        attribute[1].lower() not in ('width', 'height'):
+                    raise error()
+                return getattr(size, attribute[1].lower()), None
+            elif text in __units_by_name:
+                return __units_by_name[text], None
+            def variable(variables):
+                try:
+                    return variables[text]
+                except KeyError:
+                    raise ValueError(
+                        'no value for {0!r} in dimension'.format(text))
+            return None, variable
+        elif (kind, text) == ('symbol', '('):
+            node = expression_()
+            if take() != ('symbol', ')'):
+                raise error()
+            return with_unit(node)
+        raise error()
+
+    node = expression_()
+    if position[0] != len(tokens):
+        raise error()
+    value, function = node
+    if function is None:
+        return lambda **variables: value
+    return lambda **variables: function(variables)
+
+# One table maps the characters names can vary in, so normalising a name
+# is a single pass. NFKC normalisation would also map full-width forms,
+# but would break up the vulgar fractions that dimensions use.
+__name_translation = dict(
+    (code, code - 0xfee0) for code in range(0xff01, 0xff5f))
+__name_translation.update(dict.fromkeys(
+    map(ord, '_-\uff3f\uff0d\u2010\u2011\u2012\u2013\u2014\u2212'
+        '\u3000'), ' '))
+__name_translation.update(dict.fromkeys(map(ord, '\u00d7\u2715'), 'x'))
+
+__orientations = dict(
+    [(word, papersize.PaperSize.landscape) for word in (
+        'landscape', 'querformat', 'quer', 'paysage', 'horizontal',
+        'apaisado', 'orizzontale', 'paisagem', 'liggande', 'liggend',
+        '横', '横向き', '横置き', '横長')] +
+    [(word, papersize.PaperSize.portrait) for word in (
+        'portrait', 'hochformat', 'hoch', 'vertical', 'verticale',
+        'retrato', 'stående', 'staand',
+        '縦', '縦向き', '縦置き', '縦長')])
+# Japanese orientations often follow a name without a space.
+__suffix_orientations = sorted(
+    (word for word in __orientations if not word.isascii()),
+    key=len, reverse=True)
+def __split_orientation(size_string):
+    """Splits an orientation word off the end of a normalised name.
+
+    Returns the function to apply the orientation and the rest of the
+    name, or ``None`` and the whole name.
+    """
+    name, _, word = size_string.rpartition(' ')
+    if name and word in __orientations:
+        return __orientations[word], name
+    if size_string and not size_string[-1].isascii():
+        for suffix in __suffix_orientations:
+            if size_string.endswith(suffix) and len(size_string) > len(suffix):
+                return (__orientations[suffix],
+                        size_string[:-len(suffix)].rstrip())
+    return None, size_string
 
 __sizes_by_name = dict(
-    (__normalise_size_name(name), getattr(papersizes, name))
+    (normalise_size_name(name), getattr(papersizes, name))
     for name in dir(papersizes)
     if isinstance(getattr(papersizes, name), papersize.PaperSize))
+
+def __size_aliases():
+    """Generates (alias, size) pairs for the built-in sizes."""
+    sizes = dict(
+        (name, getattr(papersizes, name)) for name in dir(papersizes)
+        if isinstance(getattr(papersizes, name), papersize.PaperSize))
+    for name, size in sizes.items():
+        # DIN and ISO prefixes, and PWG names, e.g. 'iso_a4_210x297mm'.
+        match = re.match(r'(JIS_)?(A|B|C|RA|SRA)\d+$', name)
+        if match is None:
+            continue
+        short_name = name[len(match.group(1) or ''):]
+        if match.group(1):
+            yield short_name + '判', size
+            prefix = 'jis'
+        else:
+            yield 'din ' + name, size
+            yield 'iso ' + name, size
+            prefix = 'iso'
+        width, height = size.portrait()
+        yield '{0}_{1}_{2:d}x{3:d}mm'.format(
+            prefix, short_name, round(width / units.mm),
+            round(height / units.mm)), size
+
+    for name in ('LETTER', 'LEGAL', 'TABLOID', 'LEDGER', 'HALF_LETTER',
+                 'JUNIOR_LEGAL', 'GOVERNMENT_LEGAL', 'EXECUTIVE'):
+        yield 'us ' + name, sizes[name]
+    for alias, name in (
+            ('4x6/4', 'SHIROKU_BAN4'),
+            ('4x6/5', 'SHIROKU_BAN5'),
+            ('4x6/6', 'SHIROKU_BAN6'),
+            ('四六判4', 'SHIROKU_BAN4'),
+            ('四六判5', 'SHIROKU_BAN5'),
+            ('四六判6', 'SHIROKU_BAN6'),
+            ('din lang', 'DL'),
+            ('carta', 'LETTER'),
+            ('lettre us', 'LETTER'),
+            ('legal us', 'LEGAL'),
+            ('レター', 'LETTER'),
+            ('リーガル', 'LEGAL'),
+            ('名刺', 'JAPANESE_BUSINESS_CARD'),
+            ('na_letter_8.5x11in', 'LETTER'),
+            ('na_legal_8.5x14in', 'LEGAL'),
+            ('na_ledger_11x17in', 'TABLOID'),
+            ('na_executive_7.25x10.5in', 'EXECUTIVE'),
+            ('na_invoice_5.5x8.5in', 'STATEMENT'),
+            ('na_super-b_13x19in', 'SUPER_B'),
+            ('na_c_17x22in', 'ANSI_C'),
+            ('na_d_22x34in', 'ANSI_D'),
+            ('na_e_34x44in', 'ANSI_E'),
+            ('na_arch-a_9x12in', 'ARCH_A'),
+            ('na_arch-b_12x18in', 'ARCH_B'),
+            ('na_arch-c_18x24in', 'ARCH_C'),
+            ('na_arch-d_24x36in', 'ARCH_D'),
+            ('na_arch-e_36x48in', 'ARCH_E'),
+            ('na_index-3x5_3x5in', 'INDEX_CARD_5X3'),
+            ('na_index-4x6_4x6in', 'INDEX_CARD_6X4'),
+            ('na_index-5x8_5x8in', 'INDEX_CARD_8X5'),
+            ):
+        size = sizes[name]
+        # PWG names are always for the portrait size.
+        yield alias, size.portrait() if alias.startswith('na_') else size
+
+# Aliases never replace the name of another size.
+for __alias, __size in __size_aliases():
+    __sizes_by_name.setdefault(normalise_size_name(__alias), __size)
+del __alias, __size
+
 def __parse_paper_size_by_name(size_string):
     """Parses a name of a paper size, returning the PaperSize object."""
     return __sizes_by_name.get(size_string, None)
 
+def __size_by_name(size_string, catalog):
+    """Looks up a normalised name in the catalog, then the built-ins."""
+    size = None
+    if catalog is not None:
+        size = catalog.size_by_name(size_string)
+    if size is None:
+        size = __parse_paper_size_by_name(size_string)
+    return size
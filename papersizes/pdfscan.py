@@ -0,0 +1,733 @@
+# -*- coding: utf-8 -*-
+"""
+Reading page sizes from PDF files, without a PDF library.
+
+Preflight checks often need nothing from a PDF except the size of each
+page. This module memory-maps the file and reads only what that needs:
+the cross-reference table, the page tree and the page dictionaries. It
+never decodes content streams, fonts or images, so even very large
+documents are scanned quickly and in little memory.
+
+Both classic cross-reference tables and the compressed cross-reference
+and object streams introduced in PDF 1.5 are supported, as are
+incrementally updated files. Page boxes and rotation are inherited
+through the page tree as the PDF specification requires.
+
+.. code-block:: python
+
+    from papersizes import pdfscan
+
+    for size in pdfscan.page_sizes('brochure.pdf', box='TrimBox'):
+        print(size.as_mm_str())
+"""
+import array
+import collections
+import mmap
+import re
+import zlib
+
+from .papersize import PaperSize
+
+# ----------------------------------------------------------------------------
+# Pages.
+# ----------------------------------------------------------------------------
+
+class PdfError(ValueError):
+    """Raised when a file can't be read as a PDF."""
+
+BOXES = ('MediaBox', 'CropBox', 'BleedBox', 'TrimBox', 'ArtBox')
+"""The names of the page boxes a :class:`PdfPage` holds, outermost first."""
+
+class PdfPage(collections.namedtuple(
+        'PdfPage',
+        'number media_box crop_box bleed_box trim_box art_box rotate')):
+    """The boxes and rotation of one page of a PDF.
+
+    ``number`` counts from 1. Each box is an (x0, y0, x1, y1) tuple in
+    points, with boxes the file doesn't give defaulting as the PDF
+    specification requires: the crop box to the media box, and the
+    others to the crop box. ``rotate`` is the clockwise rotation the
+    page is displayed with: 0, 90, 180 or 270.
+    """
+    __slots__ = ()
+
+    def box(self, name='MediaBox'):
+        """Returns the named box, e.g. ``'TrimBox'``."""
+        try:
+            return self[BOXES.index(name) + 1]
+        except ValueError:
+            raise ValueError('unknown page box: {0!r}'.format(name))
+
+    def size(self, box='MediaBox', rotate=True):
+        """Returns the size of the named box as a ``PaperSize``.
+
+        If ``rotate`` is true (the default), pages displayed rotated by
+        90 or 270 degrees have their width and height swapped, so the
+        size is as the page is seen.
+        """
+        x0, y0, x1, y1 = self.box(box)
+        if rotate and self.rotate in (90, 270):
+            return PaperSize(y1 - y0, x1 - x0)
+        return PaperSize(x1 - x0, y1 - y0)
+
+class PdfScanner(object):
+    """Reads the pages of a PDF file through a memory map.
+
+    Nothing but the trailer is read when the scanner is created: the
+    cross-reference sections are only parsed as objects are needed.
+    Scanners can be used as context managers, and should be closed
+    when no longer needed.
+
+    Raises :class:`PdfError` if the file isn't a readable PDF.
+    """
+    def __init__(self, path):
+        self.path = path
+        self._file = open(path, 'rb')
+        try:
+            self._data = mmap.mmap(
+                self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise PdfError('{0}: file is empty'.format(path))
+        try:
+            self._objects = {}
+            self._object_streams = {}
+            self._sections = []
+            self._reconstructed = False
+            self.trailer = {}
+            self.trailer = self._read_trailers()
+        except Exception:
+            self.close()
+            raise
+
+    def close(self):
+        """Releases the memory map and the file."""
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def pages(self):
+        """Generates a :class:`PdfPage` for each page, in order."""
+        root = self.resolve(self.trailer.get('Root'))
+        if not isinstance(root, dict):
+            raise PdfError('{0}: no document catalog'.format(self.path))
+        stack = [(root.get('Pages'), {})]
+        visited = set()
+        number = 0
+        while stack:
+            reference, inherited = stack.pop()
+            if isinstance(reference, _Ref):
+                if reference in visited:
+                    continue
+                visited.add(reference)
+            node = self.resolve(reference)
+            if not isinstance(node, dict):
+                continue
+            if any(key in node for key in _INHERITED):
+                inherited = dict(inherited)
+                for key in _INHERITED:
+                    if key in node:
+                        inherited[key] = node[key]
+
+            kids = self.resolve(node.get('Kids'))
+            if node.get('Type') == 'Pages' or (
+                    node.get('Type') != 'Page' and isinstance(kids, list)):
+                if isinstance(kids, list):
+                    # Pushed in reverse, so pages are yielded in order.
+                    for kid in reversed(kids):
+                        stack.append((kid, inherited))
+            else:
+                number += 1
+                yield self._page(number, node, inherited)
+
+    def resolve(self, value):
+        """Returns the object a reference refers to, or the value itself."""
+        depth = 0
+        while isinstance(value, _Ref):
+            depth += 1
+            if depth > 32:
+                raise PdfError('{0}: reference loop'.format(self.path))
+            value = self._object(value.number)
+        return value
+
+    # Pages ------------------------------------------------------------------
+
+    def _page(self, number, node, inherited):
+        """Creates the PdfPage for a page dictionary."""
+        media = self._box(inherited.get('MediaBox')) or _DEFAULT_MEDIA_BOX
+        crop = _intersect(self._box(inherited.get('CropBox')), media)
+        bleed = _intersect(self._box(node.get('BleedBox')), crop)
+        trim = _intersect(self._box(node.get('TrimBox')), crop)
+        art = _intersect(self._box(node.get('ArtBox')), crop)
+        rotate = self.resolve(inherited.get('Rotate', 0))
+        if not isinstance(rotate, (int, float)):
+            rotate = 0
+        rotate = int(rotate) // 90 * 90 % 360
+        return PdfPage(number, media, crop, bleed, trim, art, rotate)
+
+    def _box(self, value):
+        """Resolves a rectangle, returning None if it isn't valid."""
+        value = self.resolve(value)
+        if not isinstance(value, list) or len(value) != 4:
+            return None
+        coordinates = [self.resolve(v) for v in value]
+        if not all(isinstance(v, (int, float)) for v in coordinates):
+            return None
+        x0, y0, x1, y1 = [float(v) for v in coordinates]
+        return min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)
+
+    # Cross-references -------------------------------------------------------
+
+    def _read_trailers(self):
+        """Reads every cross-reference section, newest first."""
+        data = self._data
+        tail = max(0, len(data) - 2048)
+        position = data.rfind(b'startxref', tail)
+        trailer = None
+        if position >= 0:
+            match = _INTEGER.match(data, _skip(data, position + 9))
+            if match is not None:
+                try:
+                    trailer = self._read_sections(int(match.group()))
+                except PdfError:
+                    trailer = None
+        if trailer is None or 'Root' not in trailer:
+            trailer = self._reconstruct()
+        return trailer
+
+    def _read_sections(self, offset):
+        """Reads a chain of cross-reference sections, following /Prev."""
+        trailer = None
+        seen = set()
+        while offset is not None and offset not in seen:
+            seen.add(offset)
+            if _at(self._data, _skip(self._data, offset), b'xref'):
+                section_trailer, subsections = self._read_table(offset)
+                # A hybrid file's table is paired with a stream, holding
+                # objects the table leaves out or marks as free.
+                paired = None
+                hybrid = section_trailer.get('XRefStm')
+                if isinstance(hybrid, int) and hybrid not in seen:
+                    seen.add(hybrid)
+                    _, paired = self._read_stream_section(hybrid)
+                self._sections.append(('table', (subsections, paired)))
+            else:
+                section_trailer, section = self._read_stream_section(offset)
+                self._sections.append(('stream', section))
+            if trailer is None:
+                trailer = section_trailer
+            prev = section_trailer.get('Prev')
+            offset = prev if isinstance(prev, int) else None
+        if trailer is None:
+            raise PdfError('{0}: no cross-reference table'.format(self.path))
+        return trailer
+
+    def _read_table(self, offset):
+        """Reads a classic table, returning its trailer and subsections.
+
+        Entries are fixed width, so they aren't parsed here: only the
+        position of each subsection is recorded, as (first, count,
+        start).
+        """
+        data = self._data
+        position = _skip(data, data.find(b'xref', offset) + 4)
+        subsections = []
+        while True:
+            match = _SUBSECTION.match(data, position)
+            if match is None:
+                break
+            first, count = int(match.group(1)), int(match.group(2))
+            start = _skip(data, match.end())
+            subsections.append((first, count, start))
+            position = _skip(data, start + 20 * count)
+        if not _at(data, position, b'trailer'):
+            raise PdfError('{0}: bad cross-reference table'.format(self.path))
+        trailer, _ = _Parser(data, self).value(position + 7)
+        if not isinstance(trailer, dict):
+            raise PdfError('{0}: bad trailer'.format(self.path))
+        return trailer, subsections
+
+    def _read_stream_section(self, offset):
+        """Reads a cross-reference stream, returning its dictionary and
+        section.
+        """
+        match = _OBJECT_HEADER.match(self._data, _skip(self._data, offset))
+        if match is None:
+            raise PdfError('{0}: bad cross-reference stream'.format(self.path))
+        value, stream = _Parser(self._data, self).object_body(match.end())
+        if not isinstance(value, dict) or stream is None:
+            raise PdfError('{0}: bad cross-reference stream'.format(self.path))
+        widths = value.get('W')
+        if not isinstance(widths, list) or len(widths) != 3:
+            raise PdfError('{0}: bad cross-reference stream'.format(self.path))
+        index = value.get('Index', [0, value.get('Size', 0)])
+        content = self._stream_content(value, stream)
+        return value, (list(zip(index[::2], index[1::2])), widths, content)
+
+    def _lookup(self, number):
+        """Finds where an object is stored, newest section first.
+
+        Returns (1, offset) for objects stored directly in the file,
+        (2, stream number, index) for objects in object streams, or
+        None for free or missing objects.
+        """
+        for kind, section in self._sections:
+            if kind == 'found':
+                if number in section:
+                    return 1, section[number]
+                continue
+            if kind == 'table':
+                subsections, paired = section
+                location = self._table_entry(subsections, number)
+                if location is not _MISSING:
+                    if location is not None or paired is None:
+                        return location
+                if paired is None:
+                    continue
+                paired_location = self._stream_entry(paired, number)
+                if paired_location is not _MISSING:
+                    return paired_location
+                # An object the table marks as free and the stream
+                # leaves out is free.
+                if location is None:
+                    return None
+            else:
+                location = self._stream_entry(section, number)
+                if location is not _MISSING:
+                    return location
+        return None
+
+    def _table_entry(self, subsections, number):
+        """Looks an object up in a classic table.
+
+        Returns a location as for :meth:`_lookup`, or ``_MISSING`` if the
+        table has no entry for the object.
+        """
+        data = self._data
+        for first, count, start in subsections:
+            if first <= number < first + count:
+                start += 20 * (number - first)
+                entry = data[start:start + 18]
+                if entry[17:18] == b'n':
+                    return 1, int(entry[:10])
+                return None
+        return _MISSING
+
+    def _stream_entry(self, section, number):
+        """Looks an object up in a cross-reference stream.
+
+        Returns a location as for :meth:`_lookup`, or ``_MISSING`` if the
+        stream has no entry for the object.
+        """
+        ranges, widths, content = section
+        skip = 0
+        for first, count in ranges:
+            if first <= number < first + count:
+                start = (skip + number - first) * sum(widths)
+                fields = []
+                for width in widths:
+                    fields.append(int.from_bytes(
+                        content[start:start + width], 'big'))
+                    start += width
+                kind = fields[0] if widths[0] else 1
+                if kind == 1:
+                    return 1, fields[1]
+                elif kind == 2:
+                    return 2, fields[1], fields[2]
+                return None
+            skip += count
+        return _MISSING
+
+    def _reconstruct(self):
+        """Finds every object by scanning, for files with a broken xref."""
+        if self._reconstructed:
+            raise PdfError('{0}: cannot find objects'.format(self.path))
+        self._reconstructed = True
+        offsets = {}
+        for match in _OBJECT_SEARCH.finditer(self._data):
+            offsets[int(match.group(1))] = match.start(1)
+        # Offsets found by scanning replace the tables, but objects in
+        # object streams can still only be found through the streams.
+        streams = []
+        for kind, section in self._sections:
+            if kind == 'stream':
+                streams.append((kind, section))
+            elif kind == 'table' and section[1] is not None:
+                streams.append(('stream', section[1]))
+        self._sections = [('found', offsets)] + streams
+        self._objects.clear()
+
+        # Use the last trailer with a root, or failing that any catalog.
+        trailer = None
+        position = self._data.rfind(b'trailer')
+        while position >= 0 and trailer is None:
+            try:
+                value, _ = _Parser(self._data, self).value(position + 7)
+                if isinstance(value, dict) and 'Root' in value:
+                    trailer = value
+            except PdfError:
+                pass
+            position = self._data.rfind(b'trailer', 0, position)
+        if trailer is None:
+            for number in sorted(offsets):
+                value = self._object(number)
+                if isinstance(value, dict) and value.get('Type') == 'Catalog':
+                    trailer = {'Root': _Ref(number, 0)}
+                    break
+        if trailer is None:
+            raise PdfError('{0}: no document catalog'.format(self.path))
+        return trailer
+
+    # Objects ----------------------------------------------------------------
+
+    def _object(self, number):
+        """Returns the object with the given number, parsing it if needed."""
+        try:
+            return self._objects[number]
+        except KeyError:
+            pass
+
+        location = self._lookup(number)
+
+        if location is None:
+            value = None
+        elif location[0] == 1:
+            match = _OBJECT_HEADER.match(
+                self._data, _skip(self._data, location[1]))
+            if match is None or int(match.group(1)) != number:
+                if self._reconstructed:
+                    value = None
+                else:
+                    self._reconstruct()
+                    return self._object(number)
+            else:
+                value, _ = _Parser(self._data, self).object_body(match.end())
+        else:
+            value = self._from_object_stream(location[1], location[2])
+        self._objects[number] = value
+        return value
+
+    def _from_object_stream(self, stream_number, index):
+        """Returns an object stored in an object stream."""
+        if 'Encrypt' in self.trailer:
+            raise PdfError(
+                '{0}: encrypted object streams are not supported'.format(
+                    self.path))
+        stream = self._object_streams.get(stream_number)
+        if stream is None:
+            location = self._lookup(stream_number)
+            if location is None or location[0] != 1:
+                return None
+            match = _OBJECT_HEADER.match(
+                self._data, _skip(self._data, location[1]))
+            if match is None:
+                return None
+            value, body = _Parser(self._data, self).object_body(match.end())
+            if not isinstance(value, dict) or body is None:
+                return None
+            content = self._stream_content(value, body)
+            first = value.get('First', 0)
+            header = _Parser(content, self)
+            offsets = []
+            position = 0
+            for _ in range(value.get('N', 0)):
+                number, position = header.value(position)
+                offset, position = header.value(position)
+                offsets.append(first + offset)
+            stream = self._object_streams[stream_number] = (content, offsets)
+
+        content, offsets = stream
+        if index >= len(offsets):
+            return None
+        value, _ = _Parser(content, self).value(offsets[index])
+        return value
+
+    def _stream_content(self, dictionary, start):
+        """Returns the decoded content of a stream."""
+        length = self.resolve(dictionary.get('Length'))
+        if isinstance(length, int):
+            raw = self._data[start:start + length]
+        else:
+            end = self._data.find(b'endstream', start)
+            if end < 0:
+                raise PdfError('{0}: unterminated stream'.format(self.path))
+            raw = self._data[start:end].rstrip(b'\r\n')
+
+        filters = self.resolve(dictionary.get('Filter'))
+        parameters = self.resolve(dictionary.get('DecodeParms'))
+        if not isinstance(filters, list):
+            filters = [] if filters is None else [filters]
+            parameters = [parameters]
+        elif not isinstance(parameters, list):
+            parameters = [parameters] * len(filters)
+        for name, parameter in zip(filters, parameters):
+            if name not in ('FlateDecode', 'Fl'):
+                raise PdfError('{0}: unsupported filter {1}'.format(
+                    self.path, name))
+            try:
+                raw = zlib.decompressobj().decompress(raw)
+            except zlib.error:
+                raise PdfError('{0}: bad compressed stream'.format(self.path))
+            parameter = self.resolve(parameter)
+            if isinstance(parameter, dict):
+                raw = _unpredict(raw, parameter, self.path)
+        return raw
+
+def pages(path):
+    """Generates a :class:`PdfPage` for each page of the PDF at ``path``."""
+    with PdfScanner(path) as scanner:
+        for page in scanner.pages():
+            yield page
+
+def page_sizes(path, box='MediaBox', rotate=True):
+    """Generates the size of each page of the PDF at ``path``.
+
+    ``box`` names the page box to measure, and ``rotate`` is as for
+    :meth:`PdfPage.size`.
+    """
+    for page in pages(path):
+        yield page.size(box, rotate)
+
+def page_size_chunks(path, chunk_size=1024, box='MediaBox', rotate=True):
+    """Generates page sizes in chunks of (widths, heights) arrays.
+
+    Each chunk is a pair of ``array('d')``, holding the widths and
+    heights of up to ``chunk_size`` consecutive pages.
+    """
+    widths, heights = array.array('d'), array.array('d')
+    for page in pages(path):
+        width, height = page.size(box, rotate)
+        widths.append(width)
+        heights.append(height)
+        if len(widths) >= chunk_size:
+            yield widths, heights
+            widths, heights = array.array('d'), array.array('d')
+    if widths:
+        yield widths, heights
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_INHERITED = ('MediaBox', 'CropBox', 'Rotate')
+_DEFAULT_MEDIA_BOX = (0.0, 0.0, 612.0, 792.0)
+
+# Marks an object a cross-reference section has no entry for, as
+# opposed to one it marks as free.
+_MISSING = object()
+
+_WHITESPACE = re.compile(rb'(?:[\x00\t\n\x0c\r ]+|%[^\r\n]*)*')
+_INTEGER = re.compile(rb'[+-]?\d+')
+_NUMBER = re.compile(rb'[+-]?(?:\d+\.?\d*|\.\d+)')
+_REFERENCE = re.compile(
+    rb'(\d+)\s+(\d+)\s+R(?![^\x00\t\n\x0c\r ()<>\[\]{}/%])')
+_NAME = re.compile(rb'/([^\x00\t\n\x0c\r ()<>\[\]{}/%]*)')
+_KEYWORD = re.compile(rb'[A-Za-z]+')
+_NAME_ESCAPE = re.compile(rb'#([0-9A-Fa-f]{2})')
+_SUBSECTION = re.compile(rb'(\d+)[ \t]+(\d+)[ \t]*\r?\n?')
+_OBJECT_HEADER = re.compile(rb'(\d+)\s+(\d+)\s+obj')
+_OBJECT_SEARCH = re.compile(rb'(?<![0-9])(\d+)\s+(\d+)\s+obj\b')
+
+class _Ref(collections.namedtuple('_Ref', 'number generation')):
+    """An indirect reference to an object."""
+    __slots__ = ()
+
+def _at(data, position, token):
+    """Check if the token appears in the data at the given position."""
+    return data[position:position + len(token)] == token
+
+def _skip(data, position):
+    """Returns the position after any whitespace and comments."""
+    return _WHITESPACE.match(data, position).end()
+
+def _intersect(box, outer):
+    """Clips a box to an outer box, defaulting to the outer box."""
+    if box is None:
+        return outer
+    x0, y0 = max(box[0], outer[0]), max(box[1], outer[1])
+    x1, y1 = min(box[2], outer[2]), min(box[3], outer[3])
+    if x1 <= x0 or y1 <= y0:
+        return outer
+    return x0, y0, x1, y1
+
+class _Parser(object):
+    """Parses PDF values from a buffer.
+
+    Strings are returned as raw bytes, unescaped: nothing this module
+    reads depends on their content.
+    """
+    def __init__(self, data, scanner):
+        self.data = data
+        self.scanner = scanner
+
+    def value(self, position):
+        """Parses the value at a position, returning (value, end)."""
+        data = self.data
+        position = _skip(data, position)
+        char = data[position:position + 1]
+        if char == b'/':
+            match = _NAME.match(data, position)
+            name = match.group(1)
+            if b'#' in name:
+                name = _NAME_ESCAPE.sub(
+                    lambda m: bytes([int(m.group(1), 16)]), name)
+            return name.decode('latin-1'), match.end()
+        elif char == b'<':
+            if data[position + 1:position + 2] == b'<':
+                return self._dictionary(position + 2)
+            end = data.find(b'>', position)
+            if end < 0:
+                raise PdfError('unterminated hex string')
+            return bytes(data[position + 1:end]), end + 1
+        elif char == b'[':
+            return self._array(position + 1)
+        elif char == b'(':
+            return self._string(position + 1)
+        elif char and (char.isdigit() or char in b'+-.'):
+            match = _REFERENCE.match(data, position)
+            if match is not None:
+                return _Ref(int(match.group(1)), int(match.group(2))), \
+                    match.end()
+            match = _NUMBER.match(data, position)
+            if match is None:
+                raise PdfError('bad number at {0}'.format(position))
+            text = match.group()
+            if b'.' in text:
+                return float(text), match.end()
+            return int(text), match.end()
+        else:
+            match = _KEYWORD.match(data, position)
+            if match is None:
+                raise PdfError('unexpected data at {0}'.format(position))
+            keyword = match.group()
+            if keyword == b'true':
+                return True, match.end()
+            elif keyword == b'false':
+                return False, match.end()
+            elif keyword == b'null':
+                return None, match.end()
+            raise PdfError('unexpected keyword at {0}'.format(position))
+
+    def object_body(self, position):
+        """Parses an object's value and finds its stream, if it has one.
+
+        Returns (value, stream start), where the stream start is None
+        if the object isn't a stream.
+        """
+        data = self.data
+        value, position = self.value(position)
+        position = _skip(data, position)
+        if isinstance(value, dict) and _at(data, position, b'stream'):
+            position += 6
+            if data[position:position + 2] == b'\r\n':
+                position += 2
+            elif data[position:position + 1] in (b'\n', b'\r'):
+                position += 1
+            return value, position
+        return value, None
+
+    def _dictionary(self, position):
+        """Parses a dictionary, after its opening '<<'."""
+        data = self.data
+        result = {}
+        while True:
+            position = _skip(data, position)
+            if data[position:position + 2] == b'>>':
+                return result, position + 2
+            key, position = self.value(position)
+            if not isinstance(key, str):
+                raise PdfError('bad dictionary key at {0}'.format(position))
+            result[key], position = self.value(position)
+
+    def _array(self, position):
+        """Parses an array, after its opening '['."""
+        data = self.data
+        result = []
+        while True:
+            position = _skip(data, position)
+            if data[position:position + 1] == b']':
+                return result, position + 1
+            if position >= len(data):
+                raise PdfError('unterminated array')
+            item, position = self.value(position)
+            result.append(item)
+
+    def _string(self, position):
+        """Skips a literal string, after its opening '('."""
+        data = self.data
+        start = position
+        depth = 1
+        end = len(data)
+        while position < end:
+            char = data[position]
+            if char == 0x5c: # backslash
+                position += 2
+                continue
+            elif char == 0x28: # (
+                depth += 1
+            elif char == 0x29: # )
+                depth -= 1
+                if depth == 0:
+                    return bytes(data[start:position]), position + 1
+            position += 1
+        raise PdfError('unterminated string')
+
+def _unpredict(data, parameters, path):
+    """Reverses the PNG predictors used by cross-reference streams."""
+    predictor = parameters.get('Predictor', 1)
+    if predictor == 1:
+        return data
+    if predictor < 10:
+        raise PdfError('{0}: unsupported predictor {1}'.format(
+            path, predictor))
+    colors = parameters.get('Colors', 1)
+    bits = parameters.get('BitsPerComponent', 8)
+    columns = parameters.get('Columns', 1)
+    pixel = max(1, colors * bits // 8)
+    row_length = (colors * bits * columns + 7) // 8
+    output = bytearray()
+    previous = bytearray(row_length)
+    for start in range(0, len(data), row_length + 1):
+        kind = data[start]
+        row = bytearray(data[start + 1:start + 1 + row_length])
+        if len(row) < row_length:
+            break
+        if kind == 1:
+            for i in range(pixel, row_length):
+                row[i] = (row[i] + row[i - pixel]) & 0xff
+        elif kind == 2:
+            for i in range(row_length):
+                row[i] = (row[i] + previous[i]) & 0xff
+        elif kind == 3:
+            for i in range(row_length):
+                left = row[i - pixel] if i >= pixel else 0
+                row[i] = (row[i] + (left + previous[i]) // 2) & 0xff
+        elif kind == 4:
+            for i in range(row_length):
+                left = row[i - pixel] if i >= pixel else 0
+                up = previous[i]
+                up_left = previous[i - pixel] if i >= pixel else 0
+                estimate = left + up - up_left
+                distance_left = abs(estimate - left)
+                distance_up = abs(estimate - up)
+                distance_up_left = abs(estimate - up_left)
+                if distance_left <= distance_up and \
+                        distance_left <= distance_up_left:
+                    nearest = left
+                elif distance_up <= distance_up_left:
+                    nearest = up
+                else:
+                    nearest = up_left
+                row[i] = (row[i] + nearest) & 0xff
+        elif kind != 0:
+            raise PdfError('{0}: bad predictor row'.format(path))
+        output += row
+        previous = row
+    return bytes(output)
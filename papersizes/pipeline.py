@@ -0,0 +1,280 @@
+# -*- coding: utf-8 -*-
+"""
+Chains of paper size operations, compiled once and applied in bulk.
+
+Normalising a size is often a chain of
+:class:`~papersizes.papersize.PaperSize` method calls, such as
+``size.portrait().add_bleed(3*mm).round_to_mm()``, each of which
+creates a new tuple. A :class:`Pipeline` records the chain instead,
+simplifies it (successive bleeds are added together, an orientation
+followed by another is dropped, and so on), and compiles it to a
+function of plain numbers. That function can then be applied to single
+sizes, or to whole arrays of widths and heights, without creating any
+intermediate sizes.
+
+.. code-block:: python
+
+    from papersizes.pipeline import Pipeline
+    from papersizes.units import mm
+
+    normalise = Pipeline().portrait().add_bleed(3*mm).round_to_mm()
+    sizes = normalise.apply_many(page_sizes)
+"""
+import array
+import functools
+
+from . import approx
+from .papersize import PaperSize
+from .units import mm
+
+# ----------------------------------------------------------------------------
+# Pipelines.
+# ----------------------------------------------------------------------------
+
+class Pipeline(object):
+    """An immutable chain of paper size operations.
+
+    Each operation method returns a new pipeline with that operation
+    added to the end, so pipelines can be shared and extended freely.
+    Pipelines with the same operations are equal, hash equally and
+    share one compiled function.
+    """
+    __slots__ = ('operations',)
+
+    def __init__(self, operations=()):
+        self.operations = tuple(operations)
+        for operation in self.operations:
+            if operation[0] not in _OPERATIONS:
+                raise ValueError('unknown operation: {0!r}'.format(
+                    operation[0]))
+
+    def portrait(self):
+        """Adds :meth:`~papersizes.papersize.PaperSize.portrait`."""
+        return self._then('portrait')
+
+    def landscape(self):
+        """Adds :meth:`~papersizes.papersize.PaperSize.landscape`."""
+        return self._then('landscape')
+
+    def flip(self):
+        """Adds :meth:`~papersizes.papersize.PaperSize.flip`."""
+        return self._then('flip')
+
+    def half(self):
+        """Adds :meth:`~papersizes.papersize.PaperSize.half`."""
+        return self._then('half')
+
+    def small_square(self):
+        """Adds :meth:`~papersizes.papersize.PaperSize.small_square`."""
+        return self._then('small_square')
+
+    def large_square(self):
+        """Adds :meth:`~papersizes.papersize.PaperSize.large_square`."""
+        return self._then('large_square')
+
+    def round_to_mm(self):
+        """Adds :meth:`~papersizes.papersize.PaperSize.round_to_mm`."""
+        return self._then('round_to_mm')
+
+    def add_bleed(self, bleed):
+        """Adds :meth:`~papersizes.papersize.PaperSize.add_bleed`."""
+        return self._then('add_bleed', bleed)
+
+    def scale(self, factor):
+        """Adds a uniform scaling of both dimensions by the factor."""
+        return self._then('scale', factor)
+
+    def __call__(self, size):
+        """Applies the pipeline to a single (width, height) size."""
+        return PaperSize(*self.function(size[0], size[1]))
+
+    @property
+    def function(self):
+        """The compiled function, taking and returning (width, height)."""
+        return _compile(self.operations)
+
+    def simplified(self):
+        """Returns the equivalent pipeline that is actually compiled."""
+        return Pipeline(_simplify(self.operations))
+
+    def apply_many(self, sizes):
+        """Applies the pipeline to each size, returning a list."""
+        function = self.function
+        return [PaperSize(*function(size[0], size[1])) for size in sizes]
+
+    def apply_arrays(self, widths, heights, out_widths=None,
+                     out_heights=None):
+        """Applies the pipeline to parallel sequences of dimensions.
+
+        The results are written into ``out_widths`` and ``out_heights``,
+        which can be the input arrays themselves to work in place. If
+        they aren't given, new ``array('d')`` are created. Returns the
+        (widths, heights) arrays of results.
+        """
+        count = len(widths)
+        if len(heights) != count:
+            raise ValueError('widths and heights must be the same length')
+        if out_widths is None:
+            out_widths = array.array('d', bytes(8 * count))
+        if out_heights is None:
+            out_heights = array.array('d', bytes(8 * count))
+        function = self.function
+        for index in range(count):
+            out_widths[index], out_heights[index] = function(
+                widths[index], heights[index])
+        return out_widths, out_heights
+
+    def classify_many(self, sizes, tolerance=0.5*mm):
+        """Applies the pipeline, then names each result from the catalog.
+
+        Returns a list of (size, name) tuples, with names as given by
+        :func:`papersizes.approx.catalog_name`, or ``None``.
+        """
+        function = self.function
+        names = {}
+        results = []
+        for size in sizes:
+            result = function(size[0], size[1])
+            try:
+                name = names[result]
+            except KeyError:
+                name = names[result] = approx.catalog_name(result, tolerance)
+            results.append((PaperSize(*result), name))
+        return results
+
+    def __eq__(self, other):
+        return isinstance(other, Pipeline) and \
+            self.operations == other.operations
+
+    def __ne__(self, other):
+        return not self == other
+
+    def __hash__(self):
+        return hash(self.operations)
+
+    def __repr__(self):
+        return 'Pipeline({0!r})'.format(self.operations)
+
+    def _then(self, *operation):
+        return Pipeline(self.operations + (operation,))
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+def _portrait(width, height):
+    return (width, height) if width <= height else (height, width)
+
+def _landscape(width, height):
+    return (width, height) if width >= height else (height, width)
+
+def _flip(width, height):
+    return height, width
+
+def _half(width, height):
+    # As PaperSize.half.
+    if height < width:
+        if height > width / 2:
+            return height, width / 2
+        else:
+            return width / 2, height
+    else:
+        if width > height / 2:
+            return height / 2, width
+        else:
+            return width, height / 2
+
+def _small_square(width, height):
+    side = height if height < width else width
+    return side, side
+
+def _large_square(width, height):
+    side = height if height > width else width
+    return side, side
+
+def _round_to_mm(width, height):
+    return round(width / mm)*mm, round(height / mm)*mm
+
+def _add_bleed(bleed):
+    bleed *= 2.0
+    def _apply(width, height):
+        return width + bleed, height + bleed
+    return _apply
+
+def _scale(factor):
+    def _apply(width, height):
+        return width * factor, height * factor
+    return _apply
+
+# Operations taking no arguments map to their function, those with
+# arguments map to a factory for their function.
+_OPERATIONS = {
+    'portrait': _portrait,
+    'landscape': _landscape,
+    'flip': _flip,
+    'half': _half,
+    'small_square': _small_square,
+    'large_square': _large_square,
+    'round_to_mm': _round_to_mm,
+    'add_bleed': _add_bleed,
+    'scale': _scale,
+    }
+
+# Operations that only choose which way round the dimensions are.
+_ORIENTATIONS = frozenset(('portrait', 'landscape', 'flip'))
+
+def _simplify(operations):
+    """Fuses adjacent operations that can be combined or dropped."""
+    result = []
+    for operation in operations:
+        name = operation[0]
+        previous = result[-1][0] if result else None
+        if name == 'add_bleed':
+            if operation[1] == 0:
+                continue
+            if previous == 'add_bleed':
+                result[-1] = ('add_bleed', result[-1][1] + operation[1])
+                continue
+        elif name == 'scale':
+            if operation[1] == 1:
+                continue
+            if previous == 'scale':
+                result[-1] = ('scale', result[-1][1] * operation[1])
+                continue
+        elif name in ('portrait', 'landscape'):
+            # These discard any earlier choice of orientation.
+            while result and result[-1][0] in _ORIENTATIONS:
+                result.pop()
+        elif name == 'flip' and previous == 'flip':
+            result.pop()
+            continue
+        elif name in ('round_to_mm', 'small_square', 'large_square') and \
+                previous == name:
+            continue
+        elif name in ('small_square', 'large_square'):
+            # Squares are the same either way round.
+            while result and result[-1][0] in _ORIENTATIONS:
+                result.pop()
+        result.append(operation)
+    return tuple(result)
+
+@functools.lru_cache(maxsize=256)
+def _compile(operations):
+    """Compiles operations into a single function of (width, height)."""
+    steps = []
+    for operation in _simplify(operations):
+        function = _OPERATIONS[operation[0]]
+        if len(operation) > 1:
+            function = function(*operation[1:])
+        steps.append(function)
+
+    if not steps:
+        return lambda width, height: (width, height)
+    elif len(steps) == 1:
+        return steps[0]
+    steps = tuple(steps)
+    def _pipeline(width, height):
+        for step in steps:
+            width, height = step(width, height)
+        return width, height
+    return _pipeline
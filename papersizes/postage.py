@@ -0,0 +1,318 @@
+# -*- coding: utf-8 -*-
+"""
+Weights, thicknesses and postage bands of mailed pieces, in batches.
+
+Postage depends on the size, thickness and weight of a piece: a sheet
+of A4 folded into three fits the Royal Mail *Letter* band, but the same
+sheet sent flat is a *Large Letter*. This module works out the folded
+size, weight and thickness of each piece in a mailing, from its flat
+size, paper weight in grams per square metre, number of sheets and
+fold, and finds its band in a table of postal bands.
+
+.. code-block:: python
+
+    from papersizes import papersizes, postage
+
+    mailing = postage.mailing(
+        [papersizes.A4] * len(addresses), gsm=90, sheets=page_counts,
+        fold='tri', table=postage.ROYAL_MAIL)
+    for band, count in mailing.band_counts().items():
+        print(band, count)
+
+Mailings to many addresses repeat the same few kinds of piece, so each
+distinct combination of size, paper, sheet count and fold is worked out
+once.
+"""
+import array
+import bisect
+import collections
+import itertools
+import numbers
+
+from .units import inch, m, mm
+
+# ----------------------------------------------------------------------------
+# Folds and paper.
+# ----------------------------------------------------------------------------
+
+FOLDS = {
+    'flat': (),
+    'half': (2,),
+    'tri': (3,),
+    'z': (3,),
+    'quarter': (2, 2),
+    }
+"""The folds a piece can have, by name.
+
+Each fold is a sequence of the number of equal panels the long side of
+the piece is folded into, applied in turn. So ``'quarter'`` folds in
+half, then in half again across the other side, giving four layers.
+"""
+
+DEFAULT_BULK = 1.0
+"""The thickness of paper, in micrometres for each gram per square metre.
+
+Uncoated papers are about 1.2, coated papers about 0.9, and board
+1.3 or more. This is used when a caliper isn't given.
+"""
+
+def folded(size, fold='flat'):
+    """Returns the (width, height) and number of layers of a folded piece.
+
+    The folded size is given with its long side as its height.
+    """
+    try:
+        panels = FOLDS[fold]
+    except KeyError:
+        raise ValueError('unknown fold: {0!r}'.format(fold))
+    short_side, long_side = sorted((size[0], size[1]))
+    layers = 1
+    for count in panels:
+        long_side /= count
+        layers *= count
+        short_side, long_side = sorted((short_side, long_side))
+    return (short_side, long_side), layers
+
+def weight(size, gsm, sheets=1):
+    """Returns the weight of sheets of a flat size, in grams."""
+    return size[0] * size[1] / (m * m) * gsm * sheets
+
+# ----------------------------------------------------------------------------
+# Postal bands.
+# ----------------------------------------------------------------------------
+
+class PostalBand(collections.namedtuple(
+        'PostalBand',
+        'name max_length max_width max_thickness max_weight '
+        'min_length min_width min_thickness')):
+    """The limits of one postage band.
+
+    Lengths and widths are the long and short sides of a piece, and they
+    and thicknesses are in points. Weights are in grams.
+    """
+    __slots__ = ()
+
+    def __new__(Class, name, max_length, max_width, max_thickness,
+                max_weight, min_length=0.0, min_width=0.0,
+                min_thickness=0.0):
+        return super(PostalBand, Class).__new__(
+            Class, name, max_length, max_width, max_thickness, max_weight,
+            min_length, min_width, min_thickness)
+
+class BandTable(object):
+    """A table of postage bands, from smallest to largest.
+
+    Each band's limits must be no smaller than the band before it. A
+    piece is in the first band it fits, which is found by a binary
+    search of each limit, so finding a band doesn't get slower with the
+    number of bands. A piece that is smaller than the minimums of that
+    band is not mailable, and has no band.
+    """
+    def __init__(self, name, bands):
+        self.name = name
+        self.bands = tuple(bands)
+        self._limits = []
+        for field in ('max_length', 'max_width', 'max_thickness',
+                      'max_weight'):
+            limits = [getattr(band, field) for band in self.bands]
+            if limits != sorted(limits):
+                raise ValueError(
+                    'band limits must not decrease: {0}'.format(field))
+            self._limits.append(limits)
+
+    def band(self, length, width, thickness, weight):
+        """Returns the :class:`PostalBand` of a piece, or ``None``.
+
+        ``length`` and ``width`` are the long and short sides of the
+        piece, as folded.
+        """
+        index = self.band_index(length, width, thickness, weight)
+        return None if index < 0 else self.bands[index]
+
+    def band_index(self, length, width, thickness, weight):
+        """As :meth:`band`, but returns the index of the band, or -1."""
+        index = 0
+        for limits, value in zip(
+                self._limits, (length, width, thickness, weight)):
+            index = max(index, bisect.bisect_left(limits, value - _EPSILON))
+        if index == len(self.bands):
+            return -1
+        band = self.bands[index]
+        if length < band.min_length - _EPSILON or \
+                width < band.min_width - _EPSILON or \
+                thickness < band.min_thickness - _EPSILON:
+            return -1
+        return index
+
+    def __repr__(self):
+        return 'BandTable({0!r})'.format(self.name)
+
+_OUNCE = 28.349523125
+_POUND = 16 * _OUNCE
+
+ROYAL_MAIL = BandTable('Royal Mail', [
+    PostalBand('Letter', 240*mm, 165*mm, 5*mm, 100.0,
+               140*mm, 90*mm),
+    PostalBand('Large Letter', 353*mm, 250*mm, 25*mm, 750.0),
+    PostalBand('Small Parcel', 450*mm, 350*mm, 160*mm, 2000.0),
+    PostalBand('Medium Parcel', 610*mm, 460*mm, 460*mm, 20000.0),
+    ])
+"""Royal Mail's inland size bands.
+
+A letter must be at least 140 by 90mm.
+"""
+
+USPS = BandTable('USPS', [
+    PostalBand('Letter', 11.5*inch, 6.125*inch, 0.25*inch, 3.5*_OUNCE,
+               5*inch, 3.5*inch, 0.007*inch),
+    PostalBand('Flat', 15*inch, 12*inch, 0.75*inch, 13*_OUNCE),
+    PostalBand('Parcel', 108*inch, 108*inch, 108*inch, 70*_POUND),
+    ])
+"""The United States Postal Service's shapes of mail.
+
+A letter must be at least 5 by 3½ inches, and 0.007 inches thick. The
+parcel band doesn't check a parcel's combined length and girth.
+"""
+
+# ----------------------------------------------------------------------------
+# Mailings.
+# ----------------------------------------------------------------------------
+
+class Mailing(object):
+    """The folded sizes, weights, thicknesses and bands of many pieces.
+
+    ``widths``, ``heights``, ``weights`` and ``thicknesses`` are
+    ``array('d')``, with sizes and thicknesses in points and weights in
+    grams. ``band_indexes`` is an ``array('b')`` of the index of each
+    piece's band in the table, or -1 if it has none.
+    """
+    def __init__(self, table, widths, heights, weights, thicknesses,
+                 band_indexes):
+        self.table = table
+        self.widths = widths
+        self.heights = heights
+        self.weights = weights
+        self.thicknesses = thicknesses
+        self.band_indexes = band_indexes
+
+    def __len__(self):
+        return len(self.weights)
+
+    def band(self, index):
+        """Returns the :class:`PostalBand` of a piece, or ``None``."""
+        band_index = self.band_indexes[index]
+        return None if band_index < 0 else self.table.bands[band_index]
+
+    def band_names(self):
+        """Returns a list of the name of each piece's band, or ``None``."""
+        names = [band.name for band in self.table.bands] + [None]
+        return [names[index] for index in self.band_indexes]
+
+    def band_counts(self):
+        """Counts the pieces in each band, by name.
+
+        Bands are given in the order of the table, with pieces that have
+        no band counted under ``None``.
+        """
+        counts = collections.Counter(self.band_indexes)
+        result = collections.OrderedDict()
+        for index, band in enumerate(self.table.bands):
+            if counts[index]:
+                result[band.name] = counts[index]
+        if counts[-1]:
+            result[None] = counts[-1]
+        return result
+
+    def total_weight(self):
+        """The total weight of the pieces, in grams."""
+        return sum(self.weights)
+
+def mailing(sizes, gsm, sheets=1, fold='flat', table=ROYAL_MAIL,
+            caliper=None):
+    """Works out the folded size, weight, thickness and band of pieces.
+
+    Returns a :class:`Mailing`. Each argument after ``sizes`` can be a
+    single value, used for every piece, or a sequence with a value for
+    each piece. Raises ``ValueError`` if a sequence doesn't have the
+    same length as ``sizes``.
+
+    Arguments:
+
+    ``sizes``
+        The flat (width, height) of each piece's sheets.
+
+    ``gsm``
+        The weight of the paper, in grams per square metre.
+
+    ``sheets``
+        The number of sheets in each piece, folded together.
+
+    ``fold``
+        The name of the fold, from :data:`FOLDS`.
+
+    ``table``
+        The :class:`BandTable` to find bands in.
+
+    ``caliper``
+        The thickness of one sheet, in points. If ``None``, it is worked
+        out from the paper weight and :data:`DEFAULT_BULK`.
+    """
+    widths = array.array('d')
+    heights = array.array('d')
+    weights = array.array('d')
+    thicknesses = array.array('d')
+    band_indexes = array.array('b')
+    seen = {}
+    if not hasattr(sizes, '__len__'):
+        sizes = list(sizes)
+    count = len(sizes)
+    for piece in zip(
+            sizes, _column(gsm, count, 'gsm'),
+            _column(sheets, count, 'sheets'), _column(fold, count, 'fold'),
+            _column(caliper, count, 'caliper')):
+        size, piece_gsm, piece_sheets, piece_fold, piece_caliper = piece
+        key = (size[0], size[1], piece_gsm, piece_sheets, piece_fold,
+               piece_caliper)
+        try:
+            result = seen[key]
+        except KeyError:
+            result = seen[key] = _piece(table, *key)
+        widths.append(result[0])
+        heights.append(result[1])
+        weights.append(result[2])
+        thicknesses.append(result[3])
+        band_indexes.append(result[4])
+    return Mailing(table, widths, heights, weights, thicknesses,
+                   band_indexes)
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_EPSILON = 1e-6
+
+def _column(value, count, name):
+    """Returns an iterable of the values of one argument, for each piece.
+
+    Raises ``ValueError`` if a sequence of values has the wrong length.
+    """
+    if value is None or isinstance(value, (numbers.Number, str)):
+        return itertools.repeat(value)
+    if not hasattr(value, '__len__'):
+        value = list(value)
+    if len(value) != count:
+        raise ValueError(
+            '{0} has {1:d} values for {2:d} pieces'.format(
+                name, len(value), count))
+    return value
+
+def _piece(table, width, height, gsm, sheets, fold, caliper):
+    """Works out (width, height, weight, thickness, band) for a piece."""
+    if caliper is None:
+        caliper = gsm * DEFAULT_BULK / 1000.0 * mm
+    (folded_width, folded_height), layers = folded((width, height), fold)
+    piece_weight = weight((width, height), gsm, sheets)
+    thickness = caliper * sheets * layers
+    band_index = table.band_index(
+        folded_height, folded_width, thickness, piece_weight)
+    return folded_width, folded_height, piece_weight, thickness, band_index
@@ -0,0 +1,279 @@
+# -*- coding: utf-8 -*-
+"""
+Paper sizes supported by printers, read from their PPD files.
+
+PostScript Printer Description files, as used by CUPS, list the media a
+printer supports with ``*PaperDimension`` and ``*ImageableArea``
+entries. This module reads them into paper sizes and margins, and names
+each from the catalog, so questions such as "which printers can print
+SRA3 without borders" can be answered directly.
+
+Parsing a PPD is slow compared to looking up its results, so parsed
+files are cached, in memory and optionally on disk, keyed by the file's
+modification time and size.
+
+.. code-block:: python
+
+    from papersizes import ppd
+
+    index = ppd.PrinterIndex(ppd.find_ppds())
+    print(index.printers_for('SRA3', borderless=True))
+"""
+import collections
+import gzip
+import hashlib
+import json
+import os
+import re
+
+from . import approx
+from . import parse
+from .papersize import PaperSize, Margins
+from .units import mm
+
+# ----------------------------------------------------------------------------
+# PPD files.
+# ----------------------------------------------------------------------------
+
+class PpdMedia(collections.namedtuple(
+        'PpdMedia', 'name translation size margins catalog_name')):
+    """A paper size a printer supports.
+
+    ``name`` is the PPD's keyword for the media, e.g. ``'A4.Borderless'``,
+    and ``translation`` its human readable name. ``margins`` are the
+    unprintable :class:`~papersizes.papersize.Margins` around the
+    imageable area, or ``None`` if the PPD doesn't give an
+    ``*ImageableArea`` for the media. ``catalog_name`` is the name of the
+    matching catalog size, as given by
+    :func:`papersizes.approx.catalog_name`, or ``None``.
+    """
+    __slots__ = ()
+
+    def is_borderless(self, tolerance=0.5*mm):
+        """Check if the printer can print to every edge of this media.
+
+        Media with unknown margins aren't borderless.
+        """
+        return self.margins is not None and self.margins.is_within(tolerance)
+
+class PpdFile(collections.namedtuple('PpdFile', 'path model nickname media')):
+    """The printer model and supported media read from a PPD file."""
+    __slots__ = ()
+
+    @property
+    def printer(self):
+        """The best name for the printer: its nickname, or model name."""
+        return self.nickname or self.model or os.path.basename(self.path)
+
+def parse_ppd(text, path=None, tolerance=1*mm):
+    """Parses the text of a PPD file into a :class:`PpdFile`.
+
+    Media are named from the catalog within the given tolerance, which
+    allows for PPDs giving dimensions rounded to whole points.
+    """
+    model = nickname = None
+    dimensions = collections.OrderedDict()
+    areas = {}
+    translations = {}
+    for match in _ENTRY.finditer(text):
+        keyword, option, translation, value = match.groups()
+        if keyword == 'ModelName':
+            model = value
+        elif keyword == 'NickName':
+            nickname = value
+        elif keyword == 'PaperDimension':
+            numbers = _numbers(value, 2)
+            if numbers is not None:
+                dimensions[option] = numbers
+                if translation:
+                    translations[option] = translation
+        elif keyword == 'ImageableArea':
+            numbers = _numbers(value, 4)
+            if numbers is not None:
+                areas[option] = numbers
+                if translation:
+                    translations.setdefault(option, translation)
+
+    media = []
+    for option, (width, height) in dimensions.items():
+        size = PaperSize(width, height)
+        area = areas.get(option)
+        if area is None:
+            margins = None
+        else:
+            left, bottom, right, top = area
+            margins = Margins(left, bottom, width - right, height - top)
+        media.append(PpdMedia(
+            option, translations.get(option, option), size, margins,
+            approx.catalog_name(size, tolerance)))
+    return PpdFile(path, model, nickname, tuple(media))
+
+def load(path, cache_dir=None, tolerance=1*mm):
+    """Returns the :class:`PpdFile` for a PPD, parsing it only if needed.
+
+    Results are cached in memory, and in ``cache_dir`` if it is given,
+    keyed by the file's modification time and size. A cached result is
+    used until the file changes. Gzipped PPDs (``.ppd.gz``), as
+    installed by many CUPS drivers, are read transparently.
+    """
+    path = os.path.abspath(path)
+    status = os.stat(path)
+    stamp = status.st_mtime_ns, status.st_size, tolerance
+
+    cached = _memory_cache.get(path)
+    if cached is not None and cached[0] == stamp:
+        return cached[1]
+
+    result = None
+    cache_path = None
+    if cache_dir is not None:
+        cache_path = os.path.join(
+            cache_dir,
+            hashlib.sha1(path.encode('utf-8')).hexdigest() + '.json')
+        result = _read_cache(cache_path, path, stamp)
+    if result is None:
+        opener = gzip.open if path.endswith('.gz') else open
+        with opener(path, 'rt', encoding='latin-1') as f:
+            result = parse_ppd(f.read(), path, tolerance)
+        if cache_path is not None:
+            _write_cache(cache_path, result, stamp)
+
+    _memory_cache[path] = stamp, result
+    return result
+
+def find_ppds(directory='/etc/cups/ppd'):
+    """Returns the paths of the PPD files in a directory, sorted."""
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        os.path.join(directory, name) for name in os.listdir(directory)
+        if name.lower().endswith(('.ppd', '.ppd.gz')))
+
+# ----------------------------------------------------------------------------
+# Lookup.
+# ----------------------------------------------------------------------------
+
+class PrinterIndex(object):
+    """An index of which printers support which paper sizes.
+
+    Sizes are matched within the tolerance, in either orientation, since
+    printers list media in portrait but print either way.
+
+    Arguments:
+
+    ``paths``
+        The PPD files to index.
+
+    ``cache_dir``
+        An optional directory for caching parsed PPDs, as for
+        :func:`load`.
+
+    ``tolerance``
+        The tolerance for matching sizes.
+
+    ``borderless_tolerance``
+        The largest margin that still counts as borderless, as for
+        :meth:`PpdMedia.is_borderless`.
+    """
+    def __init__(self, paths=(), cache_dir=None, tolerance=1*mm,
+                 borderless_tolerance=0.5*mm):
+        self.tolerance = tolerance
+        self.borderless_tolerance = borderless_tolerance
+        self.cache_dir = cache_dir
+        self.files = []
+        self._sizes = approx.ApproxSizeDict(tolerance=tolerance)
+        for path in paths:
+            self.add(load(path, cache_dir, tolerance))
+
+    def add(self, ppd_file):
+        """Adds a :class:`PpdFile` to the index."""
+        self.files.append(ppd_file)
+        for media in ppd_file.media:
+            key = media.size.portrait()
+            entries = self._sizes.get(key)
+            if entries is None:
+                entries = self._sizes[key] = []
+            entries.append((ppd_file.printer, media))
+
+    def media_for(self, size, borderless=False):
+        """Returns (printer, media) pairs that support the given size.
+
+        ``size`` can be any (width, height) tuple, or a string to be
+        parsed by :func:`papersizes.parse.paper_size`, such as
+        ``'SRA3'``. If ``borderless`` is true, only media with no margins
+        are returned.
+        """
+        if isinstance(size, str):
+            size = parse.paper_size(size)
+        entries = self._sizes.get(PaperSize(*size).portrait(), ())
+        return [
+            (printer, media) for printer, media in entries
+            if not borderless or
+            media.is_borderless(self.borderless_tolerance)]
+
+    def printers_for(self, size, borderless=False):
+        """Returns the sorted names of printers supporting a size.
+
+        Arguments are as for :meth:`media_for`.
+        """
+        return sorted(set(
+            printer for printer, _ in self.media_for(size, borderless)))
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+_ENTRY = re.compile(
+    r'^\*(ModelName|NickName|PaperDimension|ImageableArea)'
+    r'(?:[ \t]+([^/:\s]+)(?:/([^:\n]*))?)?[ \t]*:[ \t]*"([^"]*)"',
+    re.MULTILINE)
+
+# The version of the on-disk cache format.
+_CACHE_VERSION = 2
+
+_memory_cache = {}
+
+def _numbers(value, count):
+    """Parses a list of numbers, returning None if it isn't valid."""
+    try:
+        numbers = [float(part) for part in value.split()]
+    except ValueError:
+        return None
+    return numbers if len(numbers) == count else None
+
+def _read_cache(cache_path, path, stamp):
+    """Reads a cached PpdFile, returning None if it is missing or stale."""
+    try:
+        with open(cache_path, encoding='utf-8') as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if data.get('version') != _CACHE_VERSION or \
+            data.get('stamp') != list(stamp):
+        return None
+    media = tuple(
+        PpdMedia(
+            name, translation, PaperSize(width, height),
+            None if left is None else Margins(left, bottom, right, top),
+            catalog_name)
+        for name, translation, width, height, left, bottom, right, top,
+        catalog_name in data['media'])
+    return PpdFile(path, data['model'], data['nickname'], media)
+
+def _write_cache(cache_path, ppd_file, stamp):
+    """Writes a PpdFile to the cache, as compactly as JSON allows."""
+    data = {
+        'version': _CACHE_VERSION,
+        'stamp': list(stamp),
+        'model': ppd_file.model,
+        'nickname': ppd_file.nickname,
+        'media': [
+            [media.name, media.translation] + list(media.size) +
+            list(media.margins or (None,) * 4) + [media.catalog_name]
+            for media in ppd_file.media],
+        }
+    os.makedirs(os.path.dirname(cache_path), exist_ok=True)
+    temporary = cache_path + '.tmp'
+    with open(temporary, 'w', encoding='utf-8') as f:
+        json.dump(data, f, separators=(',', ':'))
+    os.replace(temporary, cache_path)
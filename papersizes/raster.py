@@ -0,0 +1,146 @@
+# -*- coding: utf-8 -*-
+"""
+Raster dimensions and buffer memory for rendering paper sizes.
+
+A rasterising pipeline needs to know, before it allocates anything, how
+many pixels a page will be at a given resolution and how much memory
+its buffer needs. This module calculates both, for one page or for a
+whole batch, and plans banded rendering when a full-page buffer would
+not fit within a memory budget.
+"""
+import math
+import numbers
+import collections
+from .papersize import PaperSize
+
+# ----------------------------------------------------------------------------
+# Raster plans.
+# ----------------------------------------------------------------------------
+
+class RasterPlan(collections.namedtuple(
+        'RasterPlan',
+        'width_px height_px stride bytes band_height bands')):
+    """The pixel dimensions and memory layout needed to render a page.
+
+    ``stride`` is the number of bytes in one row of pixels, after
+    alignment. ``bytes`` is the size of the buffer that will actually be
+    allocated: the full page if it fits the budget, otherwise a single
+    band of ``band_height`` rows, rendered ``bands`` times.
+    """
+    __slots__ = ()
+
+    @property
+    def full_page_bytes(self):
+        """The memory needed to hold the whole page at once."""
+        return self.stride * self.height_px
+
+    def is_banded(self):
+        """Check if the page has to be rendered in more than one band."""
+        return self.bands > 1
+
+    def band_rows(self):
+        """Generate the (first, last + 1) row of each band, top to bottom."""
+        for top in range(0, self.height_px, self.band_height):
+            yield top, min(top + self.band_height, self.height_px)
+
+def row_stride(width_px, channels=4, bits_per_channel=8, row_alignment=1):
+    """The number of bytes in one row of pixels.
+
+    Arguments:
+
+    ``row_alignment``
+        Rows are padded to a multiple of this many bytes. Many raster
+        libraries need rows aligned to 4 or 16 bytes.
+    """
+    stride = (width_px * channels * bits_per_channel + 7) // 8
+    if row_alignment > 1:
+        stride = -(-stride // row_alignment) * row_alignment
+    return stride
+
+def buffer_bytes(width_px, height_px, channels=4, bits_per_channel=8,
+                 row_alignment=1):
+    """The number of bytes in a full raster buffer of the given size."""
+    return row_stride(
+        width_px, channels, bits_per_channel, row_alignment) * height_px
+
+def plan(size, dpi, channels=4, bits_per_channel=8, budget=None,
+         rounding='nearest', row_alignment=1):
+    """Plans the raster buffer for rendering a page.
+
+    Arguments:
+
+    ``size``
+        The page. This can be given as any (width, height) tuple, it
+        doesn't have to be a ``PaperSize`` instance.
+
+    ``dpi``
+        The resolution, either a single number or an (x, y) tuple, as
+        for :meth:`~papersizes.papersize.PaperSize.to_pixels`.
+
+    ``budget``
+        The maximum number of bytes the buffer may use. If the full page
+        won't fit, the plan will render in horizontal bands, each as
+        tall as the budget allows. If this is ``None`` (the default) the
+        whole page is always rendered at once.
+
+    Raises ``ValueError`` if the budget can't hold even a single row.
+    """
+    width_px, height_px = PaperSize(*size).to_pixels(dpi, rounding)
+    return _plan_pixels(
+        width_px, height_px, channels, bits_per_channel, budget,
+        row_alignment)
+
+def plan_many(sizes, dpis, channels=4, bits_per_channel=8, budget=None,
+              rounding='nearest', row_alignment=1):
+    """Plans raster buffers for a batch of pages.
+
+    ``sizes`` is a sequence of paper sizes. ``dpis`` is either a single
+    number, used for every page, or a sequence of resolutions (numbers
+    or (x, y) tuples) the same length as ``sizes``. The remaining
+    arguments are as for :func:`plan`. Returns a list of
+    :class:`RasterPlan`.
+
+    Pages that share a size and resolution are only planned once, so
+    batches drawn from a handful of standard sizes are cheap.
+    """
+    if isinstance(dpis, numbers.Number):
+        dpis = [dpis] * len(sizes)
+    elif len(dpis) != len(sizes):
+        raise ValueError('sizes and dpis must be the same length')
+
+    plans = []
+    seen = {}
+    for size, dpi in zip(sizes, dpis):
+        key = size[0], size[1], dpi
+        result = seen.get(key)
+        if result is None:
+            result = seen[key] = plan(
+                size, dpi, channels, bits_per_channel, budget,
+                rounding, row_alignment)
+        plans.append(result)
+    return plans
+
+def total_bytes(plans):
+    """The memory needed to hold the buffers of every given plan at once."""
+    return sum(p.bytes for p in plans)
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+def _plan_pixels(width_px, height_px, channels, bits_per_channel, budget,
+                 row_alignment):
+    """Creates a RasterPlan for the given pixel dimensions."""
+    stride = row_stride(width_px, channels, bits_per_channel, row_alignment)
+    full = stride * height_px
+    if budget is None or full <= budget:
+        return RasterPlan(width_px, height_px, stride, full, height_px, 1)
+
+    band_height = budget // stride if stride else height_px
+    if band_height < 1:
+        raise ValueError(
+            'a budget of {0} bytes cannot hold a row of {1} bytes'.format(
+                budget, stride))
+    bands = int(math.ceil(height_px / band_height))
+    return RasterPlan(
+        width_px, height_px, stride, stride * band_height, band_height, bands)
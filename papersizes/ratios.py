@@ -2,6 +2,8 @@
 """
 Page height to width ratios for common page types.
 """
+import bisect
+import math
 
 FOUR_THIRDS = 4.0 / 3.0
 """A ratio of 4:3.
@@ -51,3 +53,114 @@ It is the ratio of one side of a regular pentagon to its opposite vertex.
 Use with the :meth:`~papersizes.papersize.PaperSize.from_ratio` method.
 """
 
+
+COMMON_RATIOS = (
+    ('ISO_RATIO', ISO_RATIO),
+    ('GOLDEN_RATIO', GOLDEN_RATIO),
+    ('FOUR_THIRDS', FOUR_THIRDS),
+    ('TWO_THIRDS', TWO_THIRDS),
+    ('PENTAGON_RATIO', PENTAGON_RATIO),
+    )
+"""The ratios in this module, as (name, ratio) pairs.
+
+This is the default set of ratios that :func:`classify_ratio` compares
+paper sizes against.
+"""
+
+# ----------------------------------------------------------------------------
+# Ratio classification.
+# ----------------------------------------------------------------------------
+
+class RatioClassifier(object):
+    """Finds which of a set of ratios a paper size is closest to.
+
+    The ratios are sorted once, when the classifier is created, so each
+    classification is a binary search rather than a comparison with
+    every ratio. The nearest ratio is found in log space, so the
+    boundary between two ratios is their geometric mean, but the error
+    reported for a size is its linear relative difference from that
+    ratio.
+
+    Arguments:
+
+    ``ratios``
+        The ratios to classify against, as a sequence of (name, ratio)
+        pairs or a dictionary mapping names to ratios. Ratios less than
+        one are inverted, since paper sizes are compared by the ratio of
+        their long to short side. Defaults to :data:`COMMON_RATIOS`.
+
+    ``tolerance``
+        If given, sizes whose ratio differs from the nearest by more
+        than this fraction are classified with the name ``None``.
+    """
+    def __init__(self, ratios=None, tolerance=None):
+        if ratios is None:
+            ratios = COMMON_RATIOS
+        elif hasattr(ratios, 'items'):
+            ratios = ratios.items()
+        ordered = sorted(
+            (value if value >= 1.0 else 1.0 / value, name)
+            for name, value in ratios)
+        if not ordered:
+            raise ValueError('at least one ratio must be given')
+        self.values = tuple(value for value, _ in ordered)
+        self.names = tuple(name for _, name in ordered)
+        self.tolerance = tolerance
+        self._boundaries = [
+            math.sqrt(lower * upper)
+            for lower, upper in zip(self.values, self.values[1:])]
+
+    def classify(self, size):
+        """Returns the (name, error) of the ratio closest to the given size.
+
+        The size can be given as any (width, height) tuple. The error is
+        the relative difference between the size's ratio and the
+        nearest, so 0.01 means the size is 1% longer than the ratio
+        requires. Raises ``ValueError`` if the width or height isn't
+        positive.
+        """
+        width, height = size[0], size[1]
+        if not (width > 0 and height > 0):
+            raise ValueError(
+                'sizes must have a positive width and height: '
+                '{0!r}'.format(size))
+        ratio = width / height if width > height else height / width
+        index = bisect.bisect(self._boundaries, ratio)
+        error = ratio / self.values[index] - 1.0
+        if self.tolerance is not None and abs(error) > self.tolerance:
+            return None, error
+        return self.names[index], error
+
+    def classify_many(self, sizes):
+        """Classifies each of the given sizes, returning a list of results.
+
+        Sizes that appear more than once are only classified once, so
+        batches drawn from a catalog of standard sizes are cheap.
+        """
+        classify = self.classify
+        seen = {}
+        results = []
+        append = results.append
+        for size in sizes:
+            key = size[0], size[1]
+            result = seen.get(key)
+            if result is None:
+                result = seen[key] = classify(key)
+            append(result)
+        return results
+
+def classify_ratio(sizes, ratios=None, tolerance=None):
+    """Finds the nearest named ratio for each of the given sizes.
+
+    Returns a list of (name, error) tuples, one per size, as described
+    in :meth:`RatioClassifier.classify`. To classify many batches
+    against the same ratios, create a :class:`RatioClassifier` once and
+    reuse it.
+    """
+    if ratios is None and tolerance is None:
+        classifier = _default_classifier
+    else:
+        classifier = RatioClassifier(ratios, tolerance)
+    return classifier.classify_many(sizes)
+
+_default_classifier = RatioClassifier()
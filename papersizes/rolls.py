@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""
+Planning how to cut jobs from rolls, for web and wide-format printing.
+
+Roll-fed presses print side by side lanes down the length of a roll,
+and the roll is then slit into its lanes and each lane cut into pieces.
+Each run of the press uses one pattern of lanes, for as long as it
+takes to finish one of the jobs in it, then moves to the next pattern.
+What matters is the length of roll used: every point across the roll
+not in a lane, and every piece printed beyond a job's quantity, is
+waste.
+
+Finding the best patterns is a cutting stock problem, which is too slow
+to solve exactly for more than a few jobs. This module uses a fast
+greedy heuristic instead, and reports how far its plans can be from the
+best possible, by comparing their length with a lower bound: the total
+area of the jobs divided by the width of the roll.
+
+.. code-block:: python
+
+    from papersizes import papersizes, rolls
+    from papersizes.units import mm
+
+    jobs = [(papersizes.A3, 400), (papersizes.A2, 150)]
+    plan = rolls.best_roll(jobs, [610*mm, 914*mm, 1067*mm])
+    print(plan.roll_width / mm, plan.length / mm, plan.efficiency)
+    for pattern in plan.patterns:
+        print(pattern)
+"""
+import bisect
+import collections
+import math
+
+# ----------------------------------------------------------------------------
+# Planning.
+# ----------------------------------------------------------------------------
+
+class Lane(collections.namedtuple(
+        'Lane', 'job x width length pieces')):
+    """One lane of a pattern.
+
+    ``job`` is the index of the job in the list of jobs, and ``x`` the
+    position of the lane across the roll. Each of its ``pieces`` is
+    ``width`` across the roll and ``length`` along it, so pieces are
+    rotated if ``width`` isn't the width of the job's size.
+    """
+    __slots__ = ()
+
+class RollPattern(collections.namedtuple('RollPattern', 'lanes length')):
+    """Lanes printed side by side, for a ``length`` of roll."""
+    __slots__ = ()
+
+class RollPlan(collections.namedtuple(
+        'RollPlan', 'roll_width patterns length lower_bound area')):
+    """The patterns to cut a set of jobs from one width of roll.
+
+    ``length`` is the total length of roll used, and ``lower_bound`` is
+    a length no plan can be shorter than. ``area`` is the total area of
+    the pieces the jobs need.
+    """
+    __slots__ = ()
+
+    @property
+    def waste(self):
+        """The area of roll used that isn't in a piece a job needs."""
+        return self.roll_width * self.length - self.area
+
+    @property
+    def efficiency(self):
+        """The fraction of the roll used that is in pieces jobs need."""
+        return self.area / (self.roll_width * self.length) \
+            if self.length else 1.0
+
+    @property
+    def gap(self):
+        """How much longer the plan may be than the best possible plan.
+
+        This is a fraction of the lower bound, so ``0.05`` means the plan
+        is at most 5% longer than the best.
+        """
+        return self.length / self.lower_bound - 1.0 \
+            if self.lower_bound else 0.0
+
+def plan_roll(jobs, roll_width, rotate=True, gap=0.0):
+    """Plans the patterns to cut jobs from a roll of the given width.
+
+    Returns a :class:`RollPlan`. Raises ``ValueError`` if a job's
+    pieces don't fit across the roll, if a size isn't positive, or if a
+    quantity isn't a whole number that isn't negative.
+
+    Arguments:
+
+    ``jobs``
+        A sequence of (size, quantity) pairs.
+
+    ``rotate``
+        Whether pieces may be turned to fit the roll better.
+
+    ``gap``
+        The space left between lanes, for slitting.
+    """
+    pieces = []
+    area = 0.0
+    for index, (size, quantity) in enumerate(jobs):
+        if quantity < 0 or quantity != int(quantity):
+            raise ValueError(
+                'quantities must be whole numbers, not negative: '
+                '{0!r}'.format(quantity))
+        if not (0 < size[0] < math.inf and 0 < size[1] < math.inf):
+            raise ValueError(
+                'sizes must be finite and positive: {0!r}'.format(size))
+        across, along = _orientation(size, roll_width, rotate, gap)
+        if across is None:
+            raise ValueError(
+                "job {0:d} doesn't fit across the roll: {1!r}".format(
+                    index, size))
+        area += size[0] * size[1] * quantity
+        if quantity:
+            pieces.append([across, along, int(quantity), index])
+    lower_bound = area / roll_width
+    if pieces:
+        lower_bound = max(lower_bound, max(piece[1] for piece in pieces))
+
+    # Lanes are filled widest first, so sort once; ties go to the job
+    # with the most roll still to use. Keys are for bisecting by width.
+    pieces.sort(key=lambda piece: (-piece[0], -piece[1] * piece[2]))
+    keys = [-piece[0] for piece in pieces]
+    patterns = []
+    length = 0.0
+    while pieces:
+        # Run the pattern until the first of its jobs is finished. Jobs
+        # whose pieces are longer than that run would get no pieces, so
+        # they are left out and the width refilled.
+        excluded = set()
+        while True:
+            lanes = _fill(pieces, keys, roll_width, gap, excluded)
+            run = min(
+                int(math.ceil(pieces[index][2] / count)) * pieces[index][1]
+                for index, count in lanes)
+            too_long = [
+                index for index, _ in lanes
+                if pieces[index][1] > run + 1e-9]
+            if not too_long:
+                break
+            excluded.update(too_long)
+        pattern_lanes = []
+        x = 0.0
+        for index, count in lanes:
+            across, along, remaining, job = pieces[index]
+            per_lane = int(run / along + 1e-9)
+            for _ in range(count):
+                pattern_lanes.append(Lane(job, x, across, along, per_lane))
+                x += across + gap
+            pieces[index][2] = max(0, remaining - per_lane * count)
+        patterns.append(RollPattern(tuple(pattern_lanes), run))
+        length += run
+        for index, _ in reversed(lanes):
+            if not pieces[index][2]:
+                del pieces[index], keys[index]
+    return RollPlan(roll_width, patterns, length, lower_bound, area)
+
+def plan_rolls(jobs, roll_widths, **kwargs):
+    """Plans the jobs on each roll width that all of them fit.
+
+    Keyword arguments are passed to :func:`plan_roll`. Returns a list of
+    :class:`RollPlan`, least waste first.
+    """
+    jobs = list(jobs)
+    plans = []
+    for roll_width in roll_widths:
+        try:
+            plans.append(plan_roll(jobs, roll_width, **kwargs))
+        except ValueError:
+            continue
+    plans.sort(key=lambda plan: plan.waste)
+    return plans
+
+def best_roll(jobs, roll_widths, **kwargs):
+    """Returns the :class:`RollPlan` with the least waste.
+
+    Arguments are as for :func:`plan_rolls`. Raises ``ValueError`` if
+    no roll width fits every job.
+    """
+    plans = plan_rolls(jobs, roll_widths, **kwargs)
+    if not plans:
+        raise ValueError('no roll is wide enough for every job')
+    return plans[0]
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+def _orientation(size, roll_width, rotate, gap):
+    """Chooses the (across, along) way round for a job's pieces.
+
+    The way round that wastes least of the roll's width, when the roll
+    is filled with lanes of the job, is used.
+    """
+    best = None
+    for across, along in ((size[0], size[1]), (size[1], size[0])) \
+            if rotate else ((size[0], size[1]),):
+        if across > roll_width:
+            continue
+        lanes = int((roll_width + gap) / (across + gap) + 1e-9)
+        unused = roll_width - lanes * across
+        if best is None or (unused, along) < best[0]:
+            best = (unused, along), across, along
+    if best is None:
+        return None, None
+    return best[1], best[2]
+
+def _fill(pieces, keys, roll_width, gap, excluded=()):
+    """Fills the roll's width with lanes, widest first.
+
+    Returns a list of (index in ``pieces``, number of lanes) pairs, in
+    order of index. A job gets no more lanes than it has pieces left,
+    and jobs whose index is in ``excluded`` get none.
+    """
+    lanes = []
+    space = roll_width + gap
+    index = 0
+    while True:
+        # The widest job still to place that fits in the space left.
+        index = bisect.bisect_left(keys, gap - space - 1e-9, index)
+        if index == len(pieces):
+            return lanes
+        if index in excluded:
+            index += 1
+            continue
+        across, _, remaining, _ = pieces[index]
+        count = min(int(space / (across + gap) + 1e-9), remaining)
+        lanes.append((index, count))
+        space -= count * (across + gap)
+        index += 1
@@ -0,0 +1,372 @@
+# -*- coding: utf-8 -*-
+"""
+Inventories of page sizes for whole directories of files.
+
+This walks a directory tree, reads the page sizes of every file it
+knows how to read, and names each size from the catalog. Files are read
+in a pool of threads (or processes), with a bounded number in flight so
+that memory use doesn't grow with the size of the tree. A checkpoint
+file records each file as it is finished, so an interrupted scan can be
+resumed.
+
+It is most easily used from the command line:
+
+.. code-block:: none
+
+    % python -m papersizes scan ~/artwork --format csv --progress
+
+Readers for more file types can be added with :func:`register_reader`.
+"""
+import collections
+import concurrent.futures
+import csv
+import json
+import os
+import sys
+import time
+
+from . import approx
+from . import images
+from . import parse
+from . import pdfscan
+from .units import mm
+
+# ----------------------------------------------------------------------------
+# Readers.
+# ----------------------------------------------------------------------------
+
+def read_pdf(path, box='MediaBox'):
+    """Returns the (width, height) of each page of a PDF."""
+    return [tuple(size) for size in pdfscan.page_sizes(path, box)]
+
+READERS = {
+    '.pdf': read_pdf,
+    '.png': images.read_image,
+    '.jpg': images.read_image,
+    '.jpeg': images.read_image,
+    '.tif': images.read_image,
+    '.tiff': images.read_image,
+    }
+"""Reader functions, keyed by lower case file extension.
+
+Each reader takes a path and a ``box`` keyword argument (which readers
+of files without page boxes ignore), and returns a list of (width,
+height) tuples, one per page, in points.
+"""
+
+def register_reader(extensions, reader):
+    """Registers a reader function for the given file extensions.
+
+    When scanning with processes, readers must be registered when their
+    module is imported, so the worker processes have them too.
+    """
+    if isinstance(extensions, str):
+        extensions = [extensions]
+    for extension in extensions:
+        READERS[extension.lower()] = reader
+
+# ----------------------------------------------------------------------------
+# Scanning.
+# ----------------------------------------------------------------------------
+
+class ScanRecord(collections.namedtuple(
+        'ScanRecord', 'path page width height name error')):
+    """The size of one page of a scanned file.
+
+    ``width`` and ``height`` are in points, and ``name`` is the catalog
+    name of the size, or ``None``. Files that can't be read produce a
+    single record with ``page`` and the size set to ``None``, and the
+    reason in ``error``.
+    """
+    __slots__ = ()
+
+    def as_dict(self):
+        """Returns the record as a dictionary, with sizes also in mm."""
+        result = collections.OrderedDict()
+        result['path'] = self.path
+        result['page'] = self.page
+        if self.error is None:
+            result['width'] = round(self.width, 3)
+            result['height'] = round(self.height, 3)
+            result['width_mm'] = round(self.width / mm, 1)
+            result['height_mm'] = round(self.height / mm, 1)
+            result['name'] = self.name
+        else:
+            result['error'] = self.error
+        return result
+
+class ScanStats(object):
+    """Counts of the work done by a scan, and its throughput."""
+    def __init__(self):
+        self.files = 0
+        self.pages = 0
+        self.errors = 0
+        self.skipped = 0
+        self.started = time.monotonic()
+
+    @property
+    def elapsed(self):
+        """The seconds since the scan started."""
+        return time.monotonic() - self.started
+
+    def __str__(self):
+        elapsed = max(self.elapsed, 1e-9)
+        return (
+            '{0} files ({1:.1f}/s), {2} pages ({3:.1f}/s), {4} errors, '
+            '{5} skipped, {6:.1f}s').format(
+                self.files, self.files / elapsed,
+                self.pages, self.pages / elapsed,
+                self.errors, self.skipped, elapsed)
+
+def find_files(directory, extensions=None):
+    """Generates the paths of readable files below a directory.
+
+    Directories and files are visited in sorted order, so scans of an
+    unchanged tree produce the same order of results.
+    """
+    if extensions is None:
+        extensions = READERS
+    for root, directories, files in os.walk(directory):
+        directories.sort()
+        for name in sorted(files):
+            if os.path.splitext(name)[1].lower() in extensions:
+                yield os.path.join(root, name)
+
+def scan(paths, workers=None, max_in_flight=None, processes=False,
+         box='MediaBox', tolerance=0.5*mm, stats=None, skip=()):
+    """Reads page sizes from files in parallel.
+
+    Generates a (path, records) pair for each file, where records is a
+    list of :class:`ScanRecord`. Files are generated in the order they
+    finish, not the order given.
+
+    Arguments:
+
+    ``paths``
+        The files to read, as any iterable. It is consumed lazily, so
+        it can be a generator over a very large tree, such as
+        :func:`find_files`.
+
+    ``workers``
+        The size of the pool. Defaults to the executor's own default.
+
+    ``max_in_flight``
+        The most files being read or waiting to be read at once.
+        Defaults to four times the number of workers, or of CPUs if the
+        number of workers isn't given.
+
+    ``processes``
+        If true, files are read in a process pool rather than threads.
+
+    ``tolerance``
+        The tolerance for naming sizes from the catalog.
+
+    ``stats``
+        An optional :class:`ScanStats` to update as files are finished.
+
+    ``skip``
+        Paths to leave out, such as those finished by an earlier scan.
+    """
+    if max_in_flight is None:
+        max_in_flight = 4 * (workers or os.cpu_count() or 1)
+    if processes:
+        executor = concurrent.futures.ProcessPoolExecutor(workers)
+    else:
+        executor = concurrent.futures.ThreadPoolExecutor(workers)
+    names = {}
+
+    with executor:
+        pending = {}
+        paths = iter(paths)
+        exhausted = False
+        while pending or not exhausted:
+            while not exhausted and len(pending) < max_in_flight:
+                try:
+                    path = next(paths)
+                except StopIteration:
+                    exhausted = True
+                    break
+                if path in skip:
+                    if stats is not None:
+                        stats.skipped += 1
+                    continue
+                future = executor.submit(_read_file, path, box)
+                pending[future] = path
+            if not pending:
+                break
+
+            done, _ = concurrent.futures.wait(
+                pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                path = pending.pop(future)
+                records = _records(path, future, names, tolerance)
+                if stats is not None:
+                    stats.files += 1
+                    if records[0].error is None:
+                        stats.pages += len(records)
+                    else:
+                        stats.errors += 1
+                yield path, records
+
+# ----------------------------------------------------------------------------
+# Output.
+# ----------------------------------------------------------------------------
+
+FIELDS = ('path', 'page', 'width', 'height', 'width_mm', 'height_mm',
+          'name', 'error')
+"""The fields of each record in the output of a scan."""
+
+class JsonLinesWriter(object):
+    """Writes scan records as one JSON object per line."""
+    def __init__(self, stream):
+        self.stream = stream
+
+    def write(self, record):
+        self.stream.write(json.dumps(record.as_dict()))
+        self.stream.write('\n')
+
+class CsvWriter(object):
+    """Writes scan records as CSV, with a header if ``header`` is true."""
+    def __init__(self, stream, header=True):
+        self.writer = csv.DictWriter(
+            stream, FIELDS, extrasaction='ignore', lineterminator='\n')
+        if header:
+            self.writer.writeheader()
+
+    def write(self, record):
+        self.writer.writerow(record.as_dict())
+
+class Checkpoint(object):
+    """A file recording the paths a scan has finished, one per line.
+
+    Paths are only recorded once their results have been written, so a
+    scan resumed from the checkpoint neither loses nor repeats files.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.done = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.done.update(
+                    line.rstrip('\n') for line in f if line.strip())
+        self._file = open(path, 'a', encoding='utf-8')
+
+    def add(self, path):
+        """Records that a path is finished."""
+        self._file.write(path + '\n')
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+# ----------------------------------------------------------------------------
+# Command line.
+# ----------------------------------------------------------------------------
+
+def add_command(commands):
+    """Adds the ``scan`` command to an argparse subparsers object."""
+    parser = commands.add_parser(
+        'scan', help='inventory the page sizes of files in a directory')
+    parser.add_argument('directory', help='the directory to scan')
+    parser.add_argument(
+        '-f', '--format', choices=('jsonl', 'csv'), default='jsonl',
+        help='the output format (default: jsonl)')
+    parser.add_argument(
+        '-o', '--output', help='the file to write to (default: stdout)')
+    parser.add_argument(
+        '-c', '--checkpoint',
+        help='record finished files here, and resume from it if it exists')
+    parser.add_argument(
+        '-j', '--workers', type=int, help='the number of workers')
+    parser.add_argument(
+        '--max-in-flight', type=int,
+        help='the most files queued at once (default: 4 per worker)')
+    parser.add_argument(
+        '--processes', action='store_true',
+        help='read files in processes rather than threads')
+    parser.add_argument(
+        '--box', default='MediaBox', choices=pdfscan.BOXES,
+        help='the PDF page box to measure (default: MediaBox)')
+    parser.add_argument(
+        '--tolerance', type=parse.dimension, default=0.5*mm,
+        help='the tolerance for naming sizes (default: 0.5mm)')
+    parser.add_argument(
+        '--progress', action='store_true',
+        help='report progress and throughput on stderr')
+    parser.add_argument(
+        '--progress-interval', type=float, default=5.0,
+        help='seconds between progress reports (default: 5)')
+    parser.set_defaults(run=run_command)
+    return parser
+
+def run_command(args):
+    """Runs the ``scan`` command with parsed arguments."""
+    checkpoint = Checkpoint(args.checkpoint) if args.checkpoint else None
+    resuming = checkpoint is not None and bool(checkpoint.done)
+    has_header = resuming and args.output and \
+        os.path.exists(args.output) and os.path.getsize(args.output) > 0
+    if args.output:
+        output = open(args.output, 'a' if resuming else 'w',
+                      encoding='utf-8', newline='')
+    else:
+        output = sys.stdout
+    if args.format == 'csv':
+        writer = CsvWriter(output, header=not has_header)
+    else:
+        writer = JsonLinesWriter(output)
+
+    stats = ScanStats()
+    last_report = time.monotonic()
+    try:
+        results = scan(
+            find_files(args.directory), args.workers, args.max_in_flight,
+            args.processes, args.box, args.tolerance, stats,
+            checkpoint.done if checkpoint is not None else ())
+        for path, records in results:
+            for record in records:
+                writer.write(record)
+            if checkpoint is not None:
+                output.flush()
+                checkpoint.add(path)
+            if args.progress and \
+                    time.monotonic() - last_report >= args.progress_interval:
+                last_report = time.monotonic()
+                sys.stderr.write('{0}\n'.format(stats))
+    finally:
+        if output is not sys.stdout:
+            output.close()
+        else:
+            output.flush()
+        if checkpoint is not None:
+            checkpoint.close()
+    if args.progress:
+        sys.stderr.write('{0}\n'.format(stats))
+    return 0
+
+# -----------------------------------------------------------------------
+# Internals
+# -----------------------------------------------------------------------
+
+def _read_file(path, box):
+    """Reads a file with the reader for its extension."""
+    reader = READERS[os.path.splitext(path)[1].lower()]
+    return reader(path, box=box)
+
+def _records(path, future, names, tolerance):
+    """Creates the ScanRecords for a finished file."""
+    try:
+        sizes = future.result()
+    except Exception as error:
+        return [ScanRecord(path, None, None, None, None, str(error))]
+    if not sizes:
+        return [ScanRecord(path, None, None, None, None, 'no pages')]
+    records = []
+    for page, size in enumerate(sizes, 1):
+        width, height = size[0], size[1]
+        try:
+            name = names[width, height]
+        except KeyError:
+            name = names[width, height] = approx.catalog_name(
+                size, tolerance)
+        records.append(ScanRecord(path, page, width, height, name, None))
+    return records
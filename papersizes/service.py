@@ -0,0 +1,271 @@
+# -*- coding: utf-8 -*-
+"""
+A local service resolving and classifying paper sizes over a socket.
+
+Programs that only need papersizes to parse or name a few sizes can ask
+a shared service rather than each importing and warming up the library.
+The service listens on a Unix socket or a local TCP port, and speaks
+JSON lines: each request is one JSON object on a line, such as
+
+.. code-block:: none
+
+    {"id": 1, "method": "paper_size", "value": "A4 landscape"}
+
+and each response is one line with the same ``id`` and either a
+``result`` or an ``error``:
+
+.. code-block:: none
+
+    {"id": 1, "result": [841.889763779528, 595.2755905511812]}
+
+Responses to a connection's requests are sent as each is ready, so may
+be out of order. The methods are:
+
+``paper_size``
+    Parses a size string, as :func:`papersizes.parse.paper_size`.
+
+``dimension``
+    Parses a dimension string, as :func:`papersizes.parse.dimension`.
+
+``name``
+    Names a [width, height] size from the catalog, as
+    :func:`papersizes.approx.catalog_name`.
+
+``classify``
+    Classifies a [width, height] size: its catalog name, its nearest
+    ratio (from :func:`papersizes.ratios.classify_ratio`) and the
+    catalog size it is a scaled copy of, if any (from
+    :func:`papersizes.match.match_scaled`).
+
+``stats``
+    Returns the number of requests, errors and batches for each method,
+    and their mean and maximum latency in seconds.
+
+Requests for each method arriving within a short window of one another
+are collected and resolved as one batch, using the library's batch
+functions. Each connection can have a limited number of requests in
+progress; the service stops reading from a connection that reaches the
+limit until some of its requests are answered.
+
+It is run from the command line:
+
+.. code-block:: none
+
+    % python -m papersizes serve --socket /tmp/papersizes.sock
+"""
+import asyncio
+import json
+import os
+import time
+
+from . import parse
+from .aio import AsyncSizeResolver
+from .units import mm
+
+# ----------------------------------------------------------------------------
+# Service.
+# ----------------------------------------------------------------------------
+
+class EndpointStats(object):
+    """Counts and latencies of the requests to one method."""
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+    def record(self, latency, error):
+        """Records a finished request, and its latency in seconds."""
+        self.requests += 1
+        if error:
+            self.errors += 1
+        self.total_latency += latency
+        self.max_latency = max(self.max_latency, latency)
+
+    def as_dict(self):
+        """Returns the statistics as a dictionary."""
+        return {
+            'requests': self.requests,
+            'errors': self.errors,
+            'mean_latency':
+                self.total_latency / self.requests if self.requests else 0,
+            'max_latency': self.max_latency,
+            }
+
+class SizeService(object):
+    """Answers JSON lines requests to resolve and classify sizes.
+
+    Arguments:
+
+    ``window``
+        The longest time, in seconds, a request waits for others to be
+        batched with it.
+
+    ``max_batch``
+        The most requests resolved in one batch. A batch is resolved as
+        soon as it is this big, without waiting for the window.
+
+    ``max_pending``
+        The most requests from one connection in progress at once.
+
+    ``tolerance``
+        The tolerance for naming sizes from the catalog.
+    """
+    def __init__(self, window=0.002, max_batch=256, max_pending=1024,
+                 tolerance=0.5*mm):
+        self.max_pending = max_pending
+        self.resolver = AsyncSizeResolver(
+            window, max_batch, tolerance=tolerance)
+        self.stats = dict(
+            (method, EndpointStats())
+            for method in list(self.resolver.stats) + ['stats'])
+
+    async def start(self, host='127.0.0.1', port=0, path=None):
+        """Starts listening, returning the ``asyncio`` server.
+
+        Listens on the Unix socket at ``path`` if it is given, or the
+        TCP ``host`` and ``port`` otherwise.
+        """
+        if path is not None:
+            return await asyncio.start_unix_server(self.handle, path)
+        return await asyncio.start_server(self.handle, host, port)
+
+    async def handle(self, reader, writer):
+        """Answers the requests on one connection, until it is closed."""
+        limit = asyncio.Semaphore(self.max_pending)
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if not line.strip():
+                    continue
+                await limit.acquire()
+                task = asyncio.ensure_future(
+                    self._respond(line, writer, limit))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def request(self, method, value=None):
+        """Answers a single request, returning (result, error)."""
+        if method == 'stats':
+            return self._stats(), None
+        if not isinstance(method, str) or method not in self.resolver.stats:
+            return None, 'unknown method: {0!r}'.format(method)
+        try:
+            result = await getattr(self.resolver, method)(value)
+        except ValueError as error:
+            return None, str(error)
+        except Exception:
+            # Every request must get a response, or its client waits.
+            return None, 'internal error'
+        if method == 'paper_size':
+            result = list(result)
+        elif method == 'classify':
+            result = {
+                'name': result.name,
+                'ratio': result.ratio,
+                'ratio_error': result.ratio_error,
+                'scaled': None if result.scaled is None else {
+                    'name': result.scaled.name,
+                    'scale': result.scaled.scale},
+                }
+        return result, None
+
+    async def _respond(self, line, writer, limit):
+        started = time.monotonic()
+        identifier = method = error = None
+        try:
+            try:
+                message = json.loads(line.decode('utf-8'))
+                identifier = message.get('id')
+                method = message.get('method')
+            except (ValueError, AttributeError):
+                result, error = None, 'invalid request'
+            else:
+                result, error = await self.request(
+                    method, message.get('value'))
+            response = {'id': identifier}
+            if error is None:
+                response['result'] = result
+            else:
+                response['error'] = error
+            writer.write(json.dumps(response).encode('utf-8') + b'\n')
+            await writer.drain()
+        finally:
+            limit.release()
+            if isinstance(method, str) and method in self.stats:
+                self.stats[method].record(
+                    time.monotonic() - started, error is not None)
+
+    def _stats(self):
+        result = {}
+        for method, stats in self.stats.items():
+            result[method] = stats.as_dict()
+            batches = self.resolver.stats.get(method)
+            if batches is not None:
+                result[method]['batches'] = batches.batches
+                result[method]['mean_batch'] = batches.mean_batch
+        return result
+
+def serve(host='127.0.0.1', port=8765, path=None, **kwargs):
+    """Runs a :class:`SizeService` until interrupted.
+
+    Keyword arguments are passed to :class:`SizeService`.
+    """
+    async def _serve():
+        server = await SizeService(**kwargs).start(host, port, path)
+        async with server:
+            await server.serve_forever()
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+    finally:
+        if path is not None and os.path.exists(path):
+            os.remove(path)
+
+# ----------------------------------------------------------------------------
+# Command line.
+# ----------------------------------------------------------------------------
+
+def add_command(commands):
+    """Adds the ``serve`` command to an argparse subparsers object."""
+    parser = commands.add_parser(
+        'serve', help='resolve and classify sizes for other programs')
+    parser.add_argument(
+        '--socket', help='listen on this Unix socket, rather than TCP')
+    parser.add_argument(
+        '--host', default='127.0.0.1',
+        help='the address to listen on (default: 127.0.0.1)')
+    parser.add_argument(
+        '--port', type=int, default=8765,
+        help='the TCP port to listen on (default: 8765)')
+    parser.add_argument(
+        '--window', type=float, default=2.0,
+        help='milliseconds to wait to batch requests (default: 2)')
+    parser.add_argument(
+        '--max-batch', type=int, default=256,
+        help='the most requests in a batch (default: 256)')
+    parser.add_argument(
+        '--max-pending', type=int, default=1024,
+        help='the most requests in progress per connection (default: 1024)')
+    parser.add_argument(
+        '--tolerance', type=parse.dimension, default=0.5*mm,
+        help='the tolerance for naming sizes (default: 0.5mm)')
+    parser.set_defaults(run=run_command)
+    return parser
+
+def run_command(args):
+    """Runs the ``serve`` command with parsed arguments."""
+    serve(args.host, args.port, args.socket, window=args.window / 1000.0,
+          max_batch=args.max_batch, max_pending=args.max_pending,
+          tolerance=args.tolerance)
+    return 0
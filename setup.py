@@ -33,6 +33,11 @@ setup(
 
     # Testing and documentation requirements can be installed with:
     # pip install -r dev-requirements.txt
-    install_requires=[]
+    install_requires=[],
+
+    # The pandas column type in papersizes.pandas_ext needs pandas.
+    extras_require={
+        'pandas': ['pandas'],
+        },
 
     )
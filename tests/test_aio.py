@@ -0,0 +1,78 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import concurrent.futures
+import unittest
+
+from papersizes import papersizes
+from papersizes.aio import AsyncSizeResolver
+
+class TestAsyncSizeResolver(unittest.TestCase):
+	def test_methods(self):
+		async def _run(resolver):
+			return await asyncio.gather(
+				resolver.paper_size('A4 landscape'),
+				resolver.dimension('3mm'),
+				resolver.name((612, 792)),
+				resolver.classify(papersizes.A5.landscape()))
+		size, dimension, name, classified = asyncio.run(
+			_run(AsyncSizeResolver()))
+		self.assertEqual(size, papersizes.A4.landscape())
+		self.assertAlmostEqual(dimension, 8.503937, 5)
+		self.assertEqual(name, 'LETTER')
+		self.assertEqual(classified.name, 'A5 landscape')
+		self.assertEqual(classified.ratio, 'ISO_RATIO')
+
+	def test_batches(self):
+		resolver = AsyncSizeResolver(window=0.05, max_batch=40)
+		async def _run():
+			return await asyncio.gather(*[
+				resolver.paper_size(name)
+				for name in ['A4', 'A5', 'LETTER'] * 30])
+		results = asyncio.run(_run())
+		self.assertEqual(results[:3], [
+			papersizes.A4, papersizes.A5, papersizes.LETTER])
+		stats = resolver.stats['paper_size']
+		self.assertEqual(stats.requests, 90)
+		self.assertEqual(stats.batches, 3)
+		self.assertEqual(stats.mean_batch, 30)
+
+	def test_errors(self):
+		resolver = AsyncSizeResolver()
+		async def _run():
+			return await asyncio.gather(
+				resolver.paper_size('nonsense'),
+				resolver.paper_size('A4'),
+				resolver.name('A4'),
+				return_exceptions=True)
+		bad, good, bad_size = asyncio.run(_run())
+		self.assertIsInstance(bad, ValueError)
+		self.assertEqual(good, papersizes.A4)
+		self.assertIsInstance(bad_size, ValueError)
+
+	def test_invalid_sizes(self):
+		resolver = AsyncSizeResolver()
+		async def _run():
+			return await asyncio.gather(
+				resolver.classify(papersizes.A4),
+				resolver.classify((100, 0)),
+				resolver.name((float('nan'), 1)),
+				resolver.name((-100, 141)),
+				return_exceptions=True)
+		good, zero, nan, negative = asyncio.run(_run())
+		self.assertEqual(good.name, 'A4')
+		self.assertIsInstance(zero, ValueError)
+		self.assertIsInstance(nan, ValueError)
+		self.assertIn('finite and positive', str(nan))
+		self.assertIsInstance(negative, ValueError)
+
+	def test_executor(self):
+		with concurrent.futures.ThreadPoolExecutor(2) as executor:
+			resolver = AsyncSizeResolver(executor=executor)
+			async def _run():
+				return await asyncio.gather(
+					resolver.paper_size('A3'),
+					resolver.paper_size('nonsense'),
+					return_exceptions=True)
+			good, bad = asyncio.run(_run())
+		self.assertEqual(good, papersizes.A3)
+		self.assertIsInstance(bad, ValueError)
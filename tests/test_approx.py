@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import papersizes
+from papersizes.approx import ApproxSizeDict, ApproxSizeCounter, catalog_name
+from papersizes.papersize import PaperSize
+from papersizes.units import mm
+
+class TestApproxSizeDict(unittest.TestCase):
+	def test_near_sizes_share_a_key(self):
+		d = ApproxSizeDict()
+		d[PaperSize(595.2756, 841.8898)] = 'a'
+		d[(595.28, 841.89)] = 'b'
+		self.assertEqual(len(d), 1)
+		self.assertEqual(d[(595.3, 841.9)], 'b')
+		self.assertEqual(list(d), [PaperSize(595.2756, 841.8898)])
+
+	def test_distinct_sizes(self):
+		d = ApproxSizeDict(tolerance=1.0)
+		d[(100, 200)] = 1
+		d[(102, 200)] = 2
+		d[(200, 100)] = 3
+		self.assertEqual(len(d), 3)
+		self.assertIn((100.9, 199.1), d)
+		self.assertNotIn((98.5, 200), d)
+		self.assertRaises(KeyError, d.__getitem__, (98.5, 200))
+
+	def test_across_cell_boundaries(self):
+		d = ApproxSizeDict(tolerance=1.0)
+		d[(9.9, 9.9)] = 1
+		self.assertEqual(d[(10.5, 10.5)], 1)
+		self.assertEqual(d.find_key((9.2, 10.8)), PaperSize(9.9, 9.9))
+		self.assertEqual(
+			d.find_item((9.2, 10.8)), (PaperSize(9.9, 9.9), 1))
+		self.assertEqual(d.find_item((20, 20)), None)
+
+	def test_delete(self):
+		d = ApproxSizeDict([((100, 200), 1)])
+		del d[(100.001, 200)]
+		self.assertEqual(len(d), 0)
+		self.assertRaises(KeyError, d.__delitem__, (100, 200))
+
+	def test_bad_tolerance(self):
+		self.assertRaises(ValueError, ApproxSizeDict, tolerance=0)
+
+class TestApproxSizeCounter(unittest.TestCase):
+	def test_counting(self):
+		counter = ApproxSizeCounter()
+		counter.update([
+			papersizes.A4, (595.28, 841.89), papersizes.LETTER,
+			(595.27, 841.88)])
+		self.assertEqual(counter[papersizes.A4], 3)
+		self.assertEqual(counter[papersizes.LETTER], 1)
+		self.assertEqual(counter[papersizes.A3], 0)
+		self.assertEqual(counter.most_common(1)[0][1], 3)
+		self.assertEqual(counter.get(papersizes.A4), 3)
+		self.assertEqual(counter.get(papersizes.A3), None)
+		self.assertEqual(counter.get(papersizes.A3, -1), -1)
+
+	def test_mapping_methods(self):
+		counter = ApproxSizeCounter([papersizes.A4, papersizes.A4])
+		self.assertEqual(counter.pop(papersizes.A3, 'none'), 'none')
+		self.assertRaises(KeyError, counter.pop, papersizes.A3)
+		self.assertEqual(counter.setdefault(papersizes.A3, 5), 5)
+		self.assertEqual(counter[papersizes.A3], 5)
+		self.assertEqual(counter.setdefault((595.28, 841.89), 7), 2)
+		self.assertEqual(counter.pop(papersizes.A4), 2)
+		self.assertNotIn(papersizes.A4, counter)
+		self.assertEqual(len(counter), 1)
+		self.assertRaises(TypeError, counter.update, [], a4=1)
+
+	def test_merge(self):
+		first = ApproxSizeCounter([papersizes.A4])
+		second = ApproxSizeCounter([(595.28, 841.89), papersizes.A5])
+		first.update(second)
+		self.assertEqual(first[papersizes.A4], 2)
+		self.assertEqual(first[papersizes.A5], 1)
+
+	def test_report(self):
+		counter = ApproxSizeCounter(tolerance=0.5*mm)
+		counter.add(papersizes.A4, 5)
+		counter.add(papersizes.A4.landscape(), 2)
+		counter.add((100, 100), 7)
+		self.assertEqual(
+			[(name, count) for name, _, count in counter.report()],
+			[(None, 7), ('A4', 5), ('A4 landscape', 2)])
+
+class TestCatalogName(unittest.TestCase):
+	def test_names(self):
+		self.assertEqual(catalog_name((595.28, 841.89)), 'A4')
+		self.assertEqual(catalog_name((841.89, 595.28)), 'A4 landscape')
+		self.assertEqual(catalog_name(papersizes.ANSI_A), 'LETTER')
+		self.assertEqual(catalog_name(papersizes.LEDGER), 'LEDGER')
+		self.assertEqual(catalog_name((10, 10)), None)
@@ -0,0 +1,75 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import boxes
+from papersizes import papersizes
+from papersizes.papersize import PaperSize, Margins
+from papersizes.units import mm
+
+class TestPageBoxes(unittest.TestCase):
+	def setUp(self):
+		self.page = boxes.PageBoxes(
+			PaperSize(100, 200), bleed=(0, 3, 3, 3), slug=10, safe=5,
+			printer=4)
+
+	def test_media(self):
+		self.assertEqual(self.page.media_size, PaperSize(123, 226))
+		self.assertEqual(self.page.media_box, (0, 0, 123, 226))
+
+	def test_boxes(self):
+		self.assertEqual(self.page.bleed_box, (10, 10, 113, 216))
+		self.assertEqual(self.page.trim_box, (10, 13, 110, 213))
+		self.assertEqual(self.page.safe_box, (15, 18, 105, 208))
+		self.assertEqual(self.page.imageable_box, (4, 4, 119, 222))
+		self.assertEqual(self.page.box('trim'), self.page.trim_box)
+		self.assertEqual(set(self.page.boxes()), set(boxes.BOXES))
+		self.assertRaises(ValueError, self.page.box, 'art')
+
+	def test_add_bleed(self):
+		page = boxes.PageBoxes(papersizes.A5, bleed=3*mm)
+		self.assertEqual(page.media_size, papersizes.A5.add_bleed(3*mm))
+
+	def test_printable(self):
+		self.assertTrue(self.page.is_printable())
+		page = boxes.PageBoxes(papersizes.A5, bleed=3*mm, printer=4*mm)
+		self.assertFalse(page.is_printable())
+
+	def test_mirrored(self):
+		mirrored = self.page.mirrored()
+		self.assertEqual(mirrored.bleed, Margins(3, 3, 0, 3))
+		self.assertEqual(mirrored.printer, self.page.printer)
+		self.assertEqual(mirrored.mirrored(), self.page)
+
+class TestPageBoxesArray(unittest.TestCase):
+	def test_shared_margins(self):
+		pages = boxes.PageBoxesArray(
+			[(100, 200)] * 4, bleed=(0, 3, 3, 3), slug=10, safe=5, printer=4,
+			mirror=True)
+		self.assertEqual(len(pages), 4)
+		single = boxes.PageBoxes(
+			(100, 200), bleed=(0, 3, 3, 3), slug=10, safe=5, printer=4)
+		self.assertEqual(pages[0], single)
+		self.assertEqual(pages[1], single.mirrored())
+		self.assertEqual(pages[-1], single.mirrored())
+		for name in boxes.BOXES:
+			x0s, y0s, x1s, y1s = pages.box_arrays(name)
+			for index, page in enumerate(pages):
+				self.assertEqual(
+					(x0s[index], y0s[index], x1s[index], y1s[index]),
+					page.box(name))
+
+	def test_from_pages(self):
+		first = boxes.PageBoxes(papersizes.A5, bleed=3*mm)
+		second = boxes.PageBoxes(papersizes.A4, slug=(1, 2, 3, 4))
+		pages = boxes.PageBoxesArray.from_pages([first, second])
+		self.assertEqual(list(pages), [first, second])
+		widths, heights = pages.media_sizes()
+		self.assertEqual(
+			(widths[1], heights[1]), tuple(second.media_size))
+		x0s, _, _, _ = pages.box_arrays('trim')
+		self.assertEqual(list(x0s), [3*mm, 1])
+
+	def test_errors(self):
+		pages = boxes.PageBoxesArray([(1, 1)])
+		self.assertRaises(IndexError, pages.__getitem__, 1)
+		self.assertRaises(ValueError, pages.box_arrays, 'art')
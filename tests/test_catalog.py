@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import catalog
+from papersizes import papersizes
+from papersizes import ratios
+from papersizes.units import mm
+
+class TestCatalog(unittest.TestCase):
+	def test_entries_include_synonyms(self):
+		names = [name for name, _ in catalog.entries()]
+		self.assertIn('LETTER', names)
+		self.assertIn('ANSI_A', names)
+
+	def test_canonical_entries(self):
+		names = [name for name, _ in catalog.canonical_entries()]
+		self.assertIn('LETTER', names)
+		self.assertNotIn('ANSI_A', names)
+		self.assertNotIn('JIS_A4', names)
+		self.assertEqual(len(names), len(set(
+			size for _, size in catalog.canonical_entries())))
+
+	def test_canonical_name(self):
+		self.assertEqual(catalog.canonical_name(papersizes.ANSI_A), 'LETTER')
+		self.assertEqual(catalog.canonical_name(papersizes.JIS_A4), 'A4')
+		self.assertEqual(catalog.canonical_name((1, 2)), None)
+
+class TestCatalogQuery(unittest.TestCase):
+	def test_name_family(self):
+		self.assertEqual(catalog.name_family('A4'), 'ISO')
+		self.assertEqual(catalog.name_family('SRA2'), 'ISO')
+		self.assertEqual(catalog.name_family('JIS_B5'), 'JIS')
+		self.assertEqual(catalog.name_family('SHIROKU_BAN5'), 'JIS')
+		self.assertEqual(catalog.name_family('LETTER'), 'US')
+		self.assertEqual(catalog.name_family('ANSI_A'), 'ANSI')
+		self.assertEqual(catalog.name_family('LARGE_SCRAPBOOK'), 'CRAFT')
+		self.assertEqual(catalog.name_family('US_BUSINESS_CARD'), 'CARD')
+		self.assertEqual(catalog.name_family('FOOLSCAP'), 'OTHER')
+		self.assertEqual(catalog.name_family('NOT_A_SIZE'), 'OTHER')
+
+	def test_columns(self):
+		table = catalog.Catalog([('A4', papersizes.A4)])
+		row = table[0]
+		self.assertEqual(row.name, 'A4')
+		self.assertEqual(row.family, 'ISO')
+		self.assertEqual(row.size, papersizes.A4)
+		self.assertAlmostEqual(row.ratio, papersizes.A4.ratio)
+		self.assertAlmostEqual(row.area, papersizes.A4.area_in_sq_pts)
+		self.assertEqual(row.orientation, 'portrait')
+		self.assertEqual(len(table), 1)
+
+	def test_query(self):
+		rows = catalog.query(
+			family=('ISO', 'JIS'), orientation='portrait',
+			width=(100*mm, 150*mm),
+			ratio=catalog.around(ratios.ISO_RATIO, 0.02))
+		names = [row.name for row in rows]
+		self.assertEqual(
+			names, ['A5', 'A6', 'B6', 'C6', 'JIS_A5', 'JIS_A6', 'JIS_B6'])
+
+	def test_query_matches_scan(self):
+		table = catalog.table()
+		low, high = 200*mm, 300*mm
+		expected = [
+			row for row in table
+			if low <= row.height <= high and row.family != 'ISO']
+		rows = table.query(
+			height=(low, high), where=lambda row: row.family != 'ISO')
+		self.assertEqual(rows, expected)
+
+	def test_open_ranges(self):
+		table = catalog.table()
+		rows = table.query(area=(None, 0), width=(1, None))
+		self.assertEqual(rows, [])
+		self.assertEqual(len(table.query(width=(None, None))), len(table))
+		self.assertEqual(len(table.query()), len(table))
+
+	def test_range(self):
+		table = catalog.table()
+		rows = table.range('width', 210*mm - 0.01, 210*mm + 0.01)
+		self.assertIn('A4', [table.names[row] for row in rows])
+		widths = [table.widths[row] for row in table.range('width')]
+		self.assertEqual(widths, sorted(widths))
+		self.assertRaises(ValueError, table.range, 'name')
+
+	def test_custom_entries(self):
+		table = catalog.Catalog()
+		row = table.add('STOCK_655', (655*mm, 455*mm), family='STOCK')
+		rows = table.query(family='STOCK', orientation='landscape')
+		self.assertEqual([table.names[row]], [r.name for r in rows])
+		rows = table.query(width=(654*mm, 656*mm))
+		self.assertEqual([r.name for r in rows], ['STOCK_655'])
+		self.assertNotIn('STOCK_655', catalog.table().names)
+		self.assertRaises(ValueError, table.add, 'EMPTY', (0, 10))
@@ -0,0 +1,115 @@
+# -*- coding: utf-8 -*-
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+from papersizes import catalogfile
+from papersizes import papersizes
+from papersizes import parse
+from papersizes.__main__ import main
+from papersizes.units import mm
+
+_CSV = """name,width,height,family,grade,grain
+SRA2 Silk 150,450mm,640mm,STOCK,Silk,long
+Offcut-7,300mm,200mm,STOCK,,
+"""
+
+class CatalogFileTest(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.csv = os.path.join(self.directory, 'stock.csv')
+		with open(self.csv, 'w', encoding='utf-8') as f:
+			f.write(_CSV)
+		self.path = os.path.join(self.directory, 'stock.pscat')
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+class TestCatalogFile(CatalogFileTest):
+	def test_read_entries(self):
+		entries = catalogfile.read_entries(self.csv)
+		self.assertEqual(len(entries), 2)
+		self.assertEqual(entries[0].name, 'SRA2 Silk 150')
+		self.assertAlmostEqual(entries[0].size.width, 450*mm)
+		self.assertEqual(entries[0].grain, 'long')
+		self.assertEqual(entries[1].grade, '')
+
+	def test_read_json(self):
+		path = os.path.join(self.directory, 'stock.json')
+		with open(path, 'w', encoding='utf-8') as f:
+			json.dump([{'name': 'Big', 'width': 1000, 'height': '2in'}], f)
+		entries = catalogfile.read_entries(path)
+		self.assertEqual(entries[0].size, (1000, 144))
+		with open(path, 'w', encoding='utf-8') as f:
+			json.dump([{'name': 'Broken', 'width': 'wide'}], f)
+		self.assertRaises(ValueError, catalogfile.read_entries, path)
+
+	def test_round_trip(self):
+		entries = catalogfile.read_entries(self.csv)
+		count = catalogfile.compile_catalog(self.path, entries)
+		with catalogfile.CatalogFile(self.path) as stock:
+			self.assertEqual(len(stock), count)
+			self.assertEqual(stock[0].name, 'A0')
+			self.assertEqual(stock[0].family, 'ISO')
+			self.assertEqual(stock[-1].name, 'Offcut-7')
+			self.assertEqual(stock[-2].size, entries[0].size)
+			self.assertEqual(list(stock)[-2], entries[0])
+			self.assertRaises(IndexError, lambda: stock[count])
+
+	def test_find(self):
+		catalogfile.compile_catalog(
+			self.path, catalogfile.read_entries(self.csv))
+		with catalogfile.CatalogFile(self.path) as stock:
+			self.assertEqual(stock.name(stock.find('sra2_silk_150')),
+				'SRA2 Silk 150')
+			self.assertEqual(stock.name(stock.find('a4')), 'A4')
+			self.assertEqual(stock.find('no such size'), None)
+
+	def test_parse(self):
+		catalogfile.compile_catalog(
+			self.path, catalogfile.read_entries(self.csv), builtin=False)
+		with catalogfile.CatalogFile(self.path) as stock:
+			size = parse.paper_size('offcut 7 portrait', catalog=stock)
+			self.assertAlmostEqual(size.width, 200*mm)
+			self.assertEqual(
+				parse.paper_size('A4', catalog=stock), papersizes.A4)
+			self.assertEqual(
+				parse.paper_size('2x3in', catalog=stock), (144, 216))
+
+	def test_catalog_name(self):
+		catalogfile.compile_catalog(
+			self.path, catalogfile.read_entries(self.csv))
+		with catalogfile.CatalogFile(self.path) as stock:
+			self.assertEqual(stock.catalog_name(papersizes.A4), 'A4')
+			self.assertEqual(
+				stock.catalog_name(papersizes.A4.landscape()),
+				'A4 landscape')
+			self.assertEqual(
+				stock.catalog_name((300*mm + 0.1, 200*mm)), 'Offcut-7')
+			self.assertEqual(stock.catalog_name((1, 1)), None)
+
+	def test_not_a_catalog(self):
+		with open(self.path, 'wb') as f:
+			f.write(b'not a catalog file, but long enough to have a header'
+				b' of the right size' * 4)
+		self.assertRaises(ValueError, catalogfile.CatalogFile, self.path)
+
+	def test_truncated(self):
+		catalogfile.compile_catalog(self.path)
+		with open(self.path, 'rb') as f:
+			data = f.read()
+		for length in (len(data) - 8, len(data) // 2, 200):
+			with open(self.path, 'wb') as f:
+				f.write(data[:length])
+			self.assertRaises(ValueError, catalogfile.CatalogFile, self.path)
+
+	def test_command(self):
+		with redirect_stderr(io.StringIO()):
+			result = main(['compile-catalog', self.path, self.csv])
+		self.assertEqual(result, 0)
+		with catalogfile.CatalogFile(self.path) as stock:
+			self.assertIsNotNone(stock.find('SRA2 Silk 150'))
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import catalog
+from papersizes import fixed
+from papersizes import papersizes
+from papersizes.papersize import PaperSize
+from papersizes.units import mm, inch
+
+class TestConversion(unittest.TestCase):
+	def test_exact_units(self):
+		self.assertEqual(fixed.to_fixed(210*mm), 210000)
+		self.assertEqual(fixed.to_fixed(8.5*inch), 215900)
+		self.assertEqual(fixed.to_points(215900), 612.0)
+
+	def test_inexact_floats_are_equal(self):
+		first = PaperSize(210*mm, 297*mm)
+		second = PaperSize(21.0*10*mm + 1e-12, 0.297*1000*mm)
+		self.assertEqual(
+			fixed.FixedSize.from_size(first),
+			fixed.FixedSize.from_size(second))
+
+	def test_round_trip(self):
+		for _, size in catalog.canonical_entries():
+			value = fixed.FixedSize.from_size(size)
+			self.assertEqual(fixed.FixedSize.from_size(value.to_size()), value)
+			self.assertTrue(value.to_size().is_approximately(size, 0.001*mm))
+
+class TestFixedSize(unittest.TestCase):
+	def test_key(self):
+		size = fixed.FixedSize.from_size(papersizes.A4)
+		self.assertEqual(fixed.FixedSize.from_key(size.key), size)
+		self.assertNotEqual(size.key, size.flip().key)
+
+	def test_key_range(self):
+		largest = fixed.FixedSize((1 << 31) - 1, (1 << 32) - 1)
+		self.assertEqual(fixed.FixedSize.from_key(largest.key), largest)
+		for size in ((1 << 31, 1), (1, 1 << 32), (-1, 1), (1, -1)):
+			with self.assertRaises(ValueError):
+				fixed.FixedSize(*size).key
+
+	def test_orientation(self):
+		size = fixed.FixedSize(2, 1)
+		self.assertEqual(size.portrait(), fixed.FixedSize(1, 2))
+		self.assertEqual(size.landscape(), size)
+
+class TestFixedSizeArray(unittest.TestCase):
+	def test_array(self):
+		sizes = [papersizes.A4, papersizes.LETTER, papersizes.A4]
+		values = fixed.FixedSizeArray.from_sizes(sizes)
+		self.assertEqual(len(values), 3)
+		self.assertEqual(values.widths.typecode, 'q')
+		self.assertEqual(values[1], fixed.FixedSize(215900, 279400))
+		self.assertEqual(list(values)[2], values[0])
+		self.assertEqual(values.to_sizes()[1], papersizes.LETTER)
+		self.assertEqual(
+			list(values.counts().items()),
+			[(values[0], 2), (values[1], 1)])
+
+	def test_mismatched(self):
+		self.assertRaises(ValueError, fixed.FixedSizeArray, [1], [])
+
+class TestCatalogName(unittest.TestCase):
+	def test_names(self):
+		self.assertEqual(fixed.catalog_name(papersizes.A4), 'A4')
+		self.assertEqual(
+			fixed.catalog_name(fixed.FixedSize(297000, 210000)),
+			'A4 landscape')
+		self.assertEqual(fixed.catalog_name(PaperSize(1, 2)), None)
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import catalog
+from papersizes import formatting
+from papersizes import papersizes
+from papersizes import parse
+from papersizes.papersize import PaperSize
+from papersizes.units import mm, inch
+
+class TestFormatSize(unittest.TestCase):
+	def test_units(self):
+		self.assertEqual(formatting.format_size(papersizes.A4), '210x297mm')
+		self.assertEqual(
+			formatting.format_size(papersizes.A4, 'cm'), '21.0x29.7cm')
+		self.assertEqual(
+			formatting.format_size(papersizes.LETTER, '"'), '8½x11"')
+		self.assertEqual(
+			formatting.format_size(papersizes.LETTER, 'in'), '8½x11in')
+		self.assertEqual(
+			formatting.format_size(papersizes.LETTER, 'pt'), '612x792pt')
+		self.assertEqual(
+			formatting.format_size(papersizes.LETTER, 'in', 2), '8.50x11.00in')
+
+	def test_matches_methods(self):
+		size = PaperSize(100*mm, 150*mm)
+		self.assertEqual(formatting.format_size(size), size.as_mm_str())
+		self.assertEqual(
+			formatting.format_size(size, '"'), size.as_inch_str())
+		self.assertEqual(
+			formatting.format_size(size, 'pt'), size.as_pt_str())
+
+	def test_eighths(self):
+		self.assertEqual(formatting.format_eighths(8.96), '9')
+		self.assertEqual(formatting.format_eighths(8.1), '8⅛')
+		self.assertEqual(formatting.format_eighths(0.4), '0⅜')
+
+	def test_dimension(self):
+		self.assertEqual(formatting.format_dimension(3*mm), '3mm')
+		self.assertEqual(formatting.format_dimension(36, 'pt', 1), '36.0pt')
+
+	def test_unknown_unit(self):
+		self.assertRaises(
+			ValueError, formatting.format_size, papersizes.A4, 'furlong')
+		self.assertRaises(
+			ValueError, formatting.format_sizes, [papersizes.A4], 'furlong')
+
+class TestFormatSizes(unittest.TestCase):
+	def test_batch(self):
+		sizes = [papersizes.A4, papersizes.A5, papersizes.A4]
+		self.assertEqual(
+			formatting.format_sizes(sizes),
+			['210x297mm', '148x210mm', '210x297mm'])
+		self.assertEqual(formatting.format_sizes([]), [])
+
+	def test_round_trip(self):
+		sizes = [size for _, size in catalog.canonical_entries()]
+		for unit, precision, tolerance in (
+				('mm', 3, 0.001*mm), ('pt', 3, 0.001), ('cm', 4, 0.001*mm),
+				('"', None, inch / 16), ('in', 4, 0.0001*inch)):
+			labels = formatting.format_sizes(sizes, unit, precision)
+			for size, label in zip(sizes, labels):
+				self.assertTrue(
+					parse.paper_size(label).is_approximately(size, tolerance),
+					(size, label))
@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import grid
+from papersizes import papersizes
+from papersizes.papersize import PaperSize, Margins
+
+class TestMargins(unittest.TestCase):
+	def test_van_de_graaf(self):
+		margins = grid.van_de_graaf_margins(PaperSize(180, 270))
+		self.assertEqual(margins, Margins(20, 60, 40, 30))
+		self.assertEqual(
+			grid.van_de_graaf_margins(PaperSize(180, 270), verso=True),
+			Margins(40, 60, 20, 30))
+
+	def test_golden_canon(self):
+		self.assertEqual(
+			grid.golden_canon_margins(PaperSize(180, 270)),
+			grid.van_de_graaf_margins(PaperSize(180, 270)))
+		margins = grid.golden_canon_margins(papersizes.A4)
+		self.assertAlmostEqual(margins.bottom / margins.left, 3)
+		self.assertAlmostEqual(margins.top / margins.left, 1.5)
+
+class TestGrid(unittest.TestCase):
+	def test_columns(self):
+		spec = grid.GridSpec(columns=3, gutter=10)
+		page = grid.grid(PaperSize(210, 300), 20, spec)
+		self.assertEqual(page.text_box, (20, 20, 190, 280))
+		self.assertEqual(list(page.column_x0), [20, 80, 140])
+		self.assertEqual(list(page.column_x1), [70, 130, 190])
+		self.assertEqual(page.column_width, 50)
+		self.assertEqual(list(page.row_y1), [280])
+
+	def test_rows_and_modules(self):
+		spec = grid.GridSpec(columns=2, gutter=10, rows=2, row_gutter=20)
+		page = grid.grid(PaperSize(200, 300), 20, spec)
+		self.assertEqual(list(page.row_y1), [280, 140])
+		self.assertEqual(list(page.row_y0), [160, 20])
+		self.assertEqual(page.module(1, 0), (105, 160, 180, 280))
+		self.assertEqual(page.span(0, 1), (20, 20, 180, 280))
+
+	def test_baselines(self):
+		spec = grid.GridSpec(baseline=12)
+		page = grid.grid(PaperSize(100, 100), 20, spec)
+		self.assertEqual(list(page.baselines), [68, 56, 44, 32, 20])
+
+	def test_margin_function(self):
+		page = grid.grid(PaperSize(180, 270), grid.van_de_graaf_margins)
+		self.assertEqual(page.text_box, (20, 60, 140, 240))
+
+	def test_cached(self):
+		spec = grid.GridSpec(columns=2)
+		self.assertIs(
+			grid.grid(papersizes.A4, 10, spec),
+			grid.grid(tuple(papersizes.A4), (10, 10, 10, 10), spec))
+
+	def test_many(self):
+		spec = grid.GridSpec(columns=2, gutter=10)
+		sizes = [PaperSize(100, 100), PaperSize(200, 100)]
+		pages = grid.grids(sizes, 10, spec)
+		self.assertEqual([page.column_width for page in pages], [35, 85])
+		x0s, x1s = grid.column_edges(sizes, 10, spec)
+		self.assertEqual(list(x0s), [10, 55, 10, 105])
+		self.assertEqual(list(x1s), [45, 90, 95, 190])
+
+	def test_no_room(self):
+		spec = grid.GridSpec(columns=5, gutter=50)
+		self.assertRaises(
+			ValueError, grid.grid, PaperSize(100, 100), 10, spec)
+		self.assertRaises(ValueError, grid.GridSpec, columns=0)
@@ -0,0 +1,93 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import guillotine
+from papersizes import papersizes
+from papersizes.units import mm
+
+def _cards(columns, rows, x=0, y=0, gutter=0):
+	return [
+		(x + column * (85*mm + gutter), y + row * (55*mm + gutter),
+			85*mm, 55*mm)
+		for column in range(columns) for row in range(rows)]
+
+class TestGuillotine(unittest.TestCase):
+	def test_single_piece(self):
+		plan = guillotine.plan_cuts((100, 50), [(0, 0, 100, 50)])
+		self.assertEqual(plan, guillotine.CutPlan([], 0, 0))
+
+	def test_trim(self):
+		plan = guillotine.plan_cuts((100, 50), [(10, 0, 80, 50)])
+		self.assertEqual([cut.position for cut in plan.cuts], [10, 90])
+		self.assertEqual(plan.strokes, 2)
+		self.assertEqual(plan.rotations, 0)
+
+	def test_identical_strips_are_stacked(self):
+		cards = _cards(3, 4)
+		plan = guillotine.plan_cuts((255*mm, 220*mm), cards)
+		# Two cuts separate the columns, which are stacked and cut
+		# into cards with three more.
+		self.assertEqual(plan.strokes, 5)
+		self.assertEqual(plan.rotations, 1)
+		self.assertEqual([cut.stack for cut in plan.cuts], [1, 1, 3, 3, 3])
+
+	def test_staged_plans_are_not_always_fewest(self):
+		# Halving the sheet and stacking the halves would take two
+		# cuts, but each stage cuts at every strip boundary.
+		columns = [(x * 15, 0, 15, 100) for x in range(4)]
+		plan = guillotine.plan_cuts((60, 100), columns)
+		self.assertEqual([cut.position for cut in plan.cuts], [15, 30, 45])
+		self.assertEqual(plan.strokes, 3)
+
+	def test_gutters_and_margins(self):
+		cards = _cards(2, 2, x=5*mm, y=5*mm, gutter=4*mm)
+		plan = guillotine.plan_cuts(papersizes.A4, cards)
+		# Columns: left trim, two gutter cuts and right trim.
+		self.assertEqual(plan.cuts[0].axis, 'x')
+		self.assertEqual(plan.strokes, 4 + 4)
+		for x, y, width, height in cards:
+			self.assertTrue(any(
+				cut.axis == 'x' and abs(cut.position - x) < 1e-3
+				for cut in plan.cuts))
+
+	def test_lift(self):
+		cards = _cards(3, 4)
+		plan = guillotine.plan_cuts(
+			(255*mm, 220*mm), cards, sheets=500, lift=600)
+		self.assertEqual([cut.strokes for cut in plan.cuts], [1, 1, 3, 3, 3])
+		self.assertEqual(plan.strokes, 11)
+
+	def test_mixed_layout(self):
+		pieces = [
+			(0, 0, 100, 50), (0, 50, 100, 50), (100, 0, 50, 100),
+			(150, 0, 50, 30)]
+		plan = guillotine.plan_cuts((200, 100), pieces)
+		self.assertEqual(plan.strokes, 4)
+		self.assertEqual(
+			[(cut.axis, cut.position) for cut in plan.cuts],
+			[('x', 100), ('x', 150), ('y', 50), ('y', 30)])
+
+	def test_not_guillotine(self):
+		pinwheel = [
+			(0, 0, 2, 1), (2, 0, 1, 2), (1, 2, 2, 1), (0, 1, 1, 2)]
+		self.assertRaises(
+			ValueError, guillotine.plan_cuts, (3, 3), pinwheel)
+
+	def test_invalid_pieces(self):
+		self.assertRaises(
+			ValueError, guillotine.plan_cuts, (10, 10), [(5, 5, 10, 1)])
+		self.assertRaises(
+			ValueError, guillotine.plan_cuts, (10, 10),
+			[(0, 0, 5, 5), (4, 4, 5, 5)])
+		self.assertRaises(
+			ValueError, guillotine.plan_cuts, (10, 10), [(0, 0, 5, 5)],
+			lift=0)
+
+	def test_plan_many(self):
+		plans = guillotine.plan_many([
+			((100, 50), [(10, 0, 80, 50)]),
+			((3, 3), [(0, 0, 2, 1), (2, 0, 1, 2), (1, 2, 2, 1),
+				(0, 1, 1, 2)]),
+			])
+		self.assertEqual(plans[0].strokes, 2)
+		self.assertEqual(plans[1], None)
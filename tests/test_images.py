@@ -0,0 +1,141 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+import zlib
+
+from papersizes import images
+from papersizes import papersizes
+from papersizes.units import inch
+
+def _png(width, height, pixels_per_metre=None):
+	def chunk(kind, data):
+		return struct.pack('>I', len(data)) + kind + data + \
+			struct.pack('>I', zlib.crc32(kind + data))
+	data = b'\x89PNG\r\n\x1a\n'
+	data += chunk(b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+	data += chunk(b'tEXt', b'Comment\x00hello')
+	if pixels_per_metre is not None:
+		data += chunk(b'pHYs', struct.pack(
+			'>IIB', pixels_per_metre, pixels_per_metre, 1))
+	data += chunk(b'IDAT', zlib.compress(b''))
+	return data + chunk(b'IEND', b'')
+
+def _tiff(width, height, dpi, endian='<', unit=2):
+	order = b'II' if endian == '<' else b'MM'
+	entries = [
+		(256, 4, 1, struct.pack(endian + 'I', width)),
+		(257, 3, 1, struct.pack(endian + 'HH', height, 0)),
+		(282, 5, 1, struct.pack(endian + 'I', 8 + 2 + 5 * 12 + 4)),
+		(283, 5, 1, struct.pack(endian + 'I', 8 + 2 + 5 * 12 + 4 + 8)),
+		(296, 3, 1, struct.pack(endian + 'HH', unit, 0)),
+		]
+	data = order + struct.pack(endian + 'HI', 42, 8)
+	data += struct.pack(endian + 'H', len(entries))
+	for tag, kind, count, value in entries:
+		data += struct.pack(endian + 'HHI', tag, kind, count) + value
+	data += struct.pack(endian + 'I', 0)
+	data += struct.pack(endian + 'II', dpi, 1) * 2
+	return data
+
+def _jpeg(width, height, jfif_dpi=None, exif_dpi=None):
+	data = b'\xff\xd8'
+	if jfif_dpi is not None:
+		body = b'JFIF\x00\x01\x02' + struct.pack('>BHH', 1, jfif_dpi, jfif_dpi) \
+			+ b'\x00\x00'
+		data += b'\xff\xe0' + struct.pack('>H', len(body) + 2) + body
+	if exif_dpi is not None:
+		body = b'Exif\x00\x00' + _tiff(width, height, exif_dpi, '>')
+		data += b'\xff\xe1' + struct.pack('>H', len(body) + 2) + body
+	frame = struct.pack('>BHHB', 8, height, width, 3) + b'\x01\x11\x00' * 3
+	data += b'\xff\xc0' + struct.pack('>H', len(frame) + 2) + frame
+	return data + b'\xff\xda\x00\x02' + b'\x00' * 100 + b'\xff\xd9'
+
+class TestParseInfo(unittest.TestCase):
+	def test_png(self):
+		info = images.parse_info(_png(2480, 3508, 11811))
+		self.assertEqual(info.format, 'png')
+		self.assertEqual((info.width_px, info.height_px), (2480, 3508))
+		self.assertAlmostEqual(info.x_dpi, 300, 0)
+		self.assertTrue(info.size().is_approximately(papersizes.A4, 1))
+
+	def test_png_without_resolution(self):
+		info = images.parse_info(_png(100, 200))
+		self.assertEqual(info.x_dpi, None)
+		self.assertRaises(images.ImageError, info.size)
+		self.assertEqual(info.size(100), (72, 144))
+
+	def test_jpeg_jfif(self):
+		info = images.parse_info(_jpeg(850, 1100, jfif_dpi=100))
+		self.assertEqual(info.format, 'jpeg')
+		self.assertEqual(info.size(), papersizes.LETTER)
+
+	def test_jpeg_exif(self):
+		info = images.parse_info(_jpeg(1700, 2200, exif_dpi=200))
+		self.assertEqual(info.size(), papersizes.LETTER)
+
+	def test_tiff(self):
+		for endian in '<>':
+			info = images.parse_info(_tiff(600, 300, 200, endian))
+			self.assertEqual(info.format, 'tiff')
+			self.assertEqual(info.size(), (3*inch, 1.5*inch))
+
+	def test_tiff_centimetres(self):
+		info = images.parse_info(_tiff(254, 254, 100, unit=3))
+		self.assertAlmostEqual(info.x_dpi, 254)
+		self.assertAlmostEqual(info.size().width, 72)
+
+	def test_unknown(self):
+		self.assertRaises(images.ImageError, images.parse_info, b'GIF89a')
+
+	def test_truncated(self):
+		self.assertRaises(
+			images.ImageError, images.parse_info, _png(1, 1, 1)[:20])
+
+class TestImageFiles(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def write(self, name, data):
+		path = os.path.join(self.directory, name)
+		with open(path, 'wb') as f:
+			f.write(data)
+		return path
+
+	def test_reads_past_header(self):
+		path = self.write('big.jpg', _jpeg(
+			850, 1100, exif_dpi=100).replace(
+				b'\xff\xc0', b'\xff\xe2\x80\x02' + b'\x00' * 0x8000 + b'\xff\xc0'))
+		info = images.read_info(path, header_bytes=64)
+		self.assertEqual(info.size(), papersizes.LETTER)
+
+	def test_image_sizes(self):
+		paths = [
+			self.write('a.png', _png(2480, 3508, 11811)),
+			self.write('b.jpg', _jpeg(850, 1100, jfif_dpi=100)),
+			self.write('c.tif', _tiff(100, 100, 0)),
+			os.path.join(self.directory, 'missing.png'),
+			]
+		results = list(images.image_sizes(paths))
+		self.assertEqual([r.path for r in results], paths)
+		self.assertEqual(results[0].name, 'A4')
+		self.assertEqual(results[1].name, 'LETTER')
+		self.assertTrue(results[2].error)
+		self.assertTrue(results[3].error)
+
+	def test_image_sizes_lazy(self):
+		path = self.write('a.png', _png(2480, 3508, 11811))
+		consumed = []
+		def paths():
+			for index in range(100):
+				consumed.append(index)
+				yield path
+		results = images.image_sizes(paths(), workers=1, max_in_flight=2)
+		self.assertEqual(next(results).name, 'A4')
+		self.assertLessEqual(len(consumed), 3)
+		self.assertEqual(len(list(results)), 99)
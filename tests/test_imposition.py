@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import imposition
+from papersizes import papersizes
+from papersizes.imposition import FRONT, BACK
+
+class TestSignatureLayout(unittest.TestCase):
+	def test_folio(self):
+		self.assertEqual(
+			imposition.signature_layout(4),
+			[(FRONT, 1, 0, 0), (BACK, 0, 0, 0),
+				(BACK, 1, 0, 0), (FRONT, 0, 0, 0)])
+
+	def test_every_cell_used_once(self):
+		for pages, scheme in imposition.SCHEMES.items():
+			layout = imposition.signature_layout(pages)
+			cells = set((side, column, row)
+				for side, column, row, _ in layout)
+			self.assertEqual(len(cells), pages)
+
+	def test_leaves(self):
+		# Each leaf carries a right hand page and the next left hand page,
+		# in the same cell, on opposite sides, the same way up.
+		for pages in imposition.SCHEMES:
+			layout = imposition.signature_layout(pages)
+			columns = max(column for _, column, _, _ in layout) + 1
+			for index in range(0, pages, 2):
+				recto, verso = layout[index], layout[index + 1]
+				self.assertEqual(recto[0], 1 - verso[0])
+				self.assertEqual(recto[1], columns - 1 - verso[1])
+				self.assertEqual(recto[2], verso[2])
+				self.assertEqual(recto[3], verso[3])
+
+	def test_spine_pairs(self):
+		# Pages facing each other across the spine add up to one more
+		# than the pages in the signature.
+		layout = imposition.signature_layout(16)
+		grid = dict(
+			((side, column, row), page)
+			for page, (side, column, row, _) in enumerate(layout, 1))
+		self.assertEqual(grid[FRONT, 0, 0] + grid[FRONT, 1, 0], 17)
+		self.assertEqual(grid[BACK, 2, 1] + grid[BACK, 3, 1], 17)
+
+	def test_unsupported(self):
+		self.assertRaises(ValueError, imposition.signature_layout, 12)
+
+class TestImpose(unittest.TestCase):
+	def test_book(self):
+		book = imposition.impose(
+			1000, papersizes.A_FORMAT_PAPERBACK, papersizes.SRA2, 16,
+			gutter=5)
+		self.assertEqual(book.signatures, 63)
+		self.assertEqual(len(book), 1008)
+		self.assertEqual(book.blank_pages, 8)
+		self.assertEqual(list(book.page[-8:]), [0] * 8)
+		first = book.placement(1)
+		later = book.placement(17)
+		self.assertEqual(first.side, FRONT)
+		self.assertEqual(later.signature, 1)
+		self.assertEqual((first.x, first.y), (later.x, later.y))
+		self.assertEqual(len(book.sheet(0, FRONT)), 8)
+		self.assertRaises(IndexError, book.placement, 1001)
+
+	def test_centred(self):
+		book = imposition.impose(4, (100, 200), (300, 300), 4, gutter=10)
+		xs = sorted(set(book.x))
+		self.assertEqual(xs, [45, 155])
+		self.assertEqual(set(book.y), set([50]))
+
+	def test_creep(self):
+		plain = imposition.impose(8, (100, 100), (200, 200), 8)
+		crept = imposition.impose(8, (100, 100), (200, 200), 8, creep=1)
+		for before, after in zip(plain, crept):
+			self.assertLessEqual(abs(after.x - before.x), 1)
+		# The outer leaves don't move; the inner ones move to the spine.
+		self.assertEqual(crept.placement(1), plain.placement(1))
+		self.assertNotEqual(crept.placement(3).x, plain.placement(3).x)
+
+	def test_does_not_fit(self):
+		self.assertRaises(
+			ValueError, imposition.impose, 100, papersizes.A4,
+			papersizes.A4, 16)
@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import papersizes
+from papersizes.match import ScaledMatcher, match_scaled
+from papersizes.papersize import PaperSize
+
+def _scaled(size, scale):
+	return PaperSize(size.width * scale, size.height * scale)
+
+class TestScaledMatcher(unittest.TestCase):
+	def test_exact(self):
+		result = ScaledMatcher().match(papersizes.LETTER)
+		self.assertEqual(result.name, 'LETTER')
+		self.assertAlmostEqual(result.scale, 1.0)
+		self.assertFalse(result.is_scaled())
+
+	def test_scaled(self):
+		result = ScaledMatcher().match(_scaled(papersizes.A4, 0.97))
+		self.assertEqual(result.name, 'A4')
+		self.assertAlmostEqual(result.scale, 0.97)
+		self.assertTrue(result.is_scaled())
+		self.assertLess(result.residual, 0.5)
+
+	def test_landscape(self):
+		result = ScaledMatcher().match(
+			_scaled(papersizes.LETTER, 0.9).landscape())
+		self.assertEqual(result.name, 'LETTER')
+		self.assertAlmostEqual(result.scale, 0.9)
+
+	def test_prefers_same_orientation(self):
+		self.assertEqual(
+			ScaledMatcher().match(papersizes.TABLOID).name, 'TABLOID')
+		self.assertEqual(
+			ScaledMatcher().match(papersizes.LEDGER).name, 'LEDGER')
+
+	def test_no_match(self):
+		self.assertEqual(ScaledMatcher().match(PaperSize(100, 1000)), None)
+		self.assertEqual(ScaledMatcher().match(PaperSize(0, 100)), None)
+
+	def test_scale_limits(self):
+		matcher = ScaledMatcher(
+			[('A4', papersizes.A4)], min_scale=0.9, max_scale=1.1)
+		self.assertEqual(matcher.match(_scaled(papersizes.A4, 0.5)), None)
+		self.assertEqual(matcher.match(_scaled(papersizes.A4, 1.05)).name, 'A4')
+
+	def test_out_of_range_candidate_ignored(self):
+		x = ('X', PaperSize(100, 141.4 * 1.00499))
+		y = ('Y', PaperSize(100 / 1.052, 141.4 / 1.052))
+		matcher = ScaledMatcher([x, y], min_scale=0.95, max_scale=1.05)
+		self.assertEqual(matcher.match(PaperSize(100, 141.4)).name, 'X')
+
+class TestMatchScaled(unittest.TestCase):
+	def test_batch(self):
+		results = match_scaled([
+			papersizes.A4, _scaled(papersizes.A5, 1.02), PaperSize(1, 50)])
+		self.assertEqual(results[0].name, 'A4')
+		self.assertEqual(results[1].name, 'A5')
+		self.assertEqual(results[2], None)
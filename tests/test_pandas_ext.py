@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+try:
+	import pandas as pd
+except ImportError:
+	pd = None
+
+from papersizes import papersizes
+from papersizes.units import mm
+
+if pd is not None:
+	from papersizes import pandas_ext
+
+@unittest.skipUnless(pd is not None, 'pandas is not installed')
+class TestPaperSizeArray(unittest.TestCase):
+	def test_astype(self):
+		series = pd.Series(['A4', 'A5 landscape', 'A4', None])
+		sizes = series.astype('papersize')
+		self.assertIsInstance(sizes.dtype, pandas_ext.PaperSizeDtype)
+		self.assertEqual(sizes[0], papersizes.A4)
+		self.assertEqual(sizes[1], papersizes.A5.landscape())
+		self.assertTrue(sizes.isna()[3])
+
+	def test_parse_sizes(self):
+		array = pandas_ext.parse_sizes(['A4', '100x200', 'A4', None])
+		self.assertEqual(len(array), 4)
+		self.assertEqual(array[1], (100, 200))
+		self.assertEqual(list(array.isna()), [False, False, False, True])
+
+	def test_from_sizes(self):
+		sizes = pd.Series(
+			[papersizes.A4, papersizes.LETTER], dtype='papersize')
+		self.assertEqual(list(sizes.array.widths),
+			[papersizes.A4.width, papersizes.LETTER.width])
+		self.assertEqual(sizes.array.nbytes, 32)
+
+	def test_take_and_concat(self):
+		sizes = pd.Series([papersizes.A4, papersizes.A5], dtype='papersize')
+		taken = sizes.array.take([1, -1], allow_fill=True)
+		self.assertEqual(taken[0], papersizes.A5)
+		self.assertTrue(taken.isna()[1])
+		joined = pd.concat([sizes, sizes], ignore_index=True)
+		self.assertEqual(len(joined), 4)
+		self.assertEqual(joined[2], papersizes.A4)
+
+	def test_equality_and_unique(self):
+		sizes = pd.Series(
+			[papersizes.A4, papersizes.A5, papersizes.A4], dtype='papersize')
+		self.assertEqual(
+			list(sizes.array == papersizes.A4), [True, False, True])
+		self.assertEqual(len(sizes.unique()), 2)
+		self.assertEqual(list(sizes.value_counts()), [2, 1])
+
+@unittest.skipUnless(pd is not None, 'pandas is not installed')
+class TestPaperAccessor(unittest.TestCase):
+	def setUp(self):
+		self.sizes = pd.Series(
+			[papersizes.A4, papersizes.A5.landscape(), None],
+			dtype='papersize', index=['a', 'b', 'c'])
+
+	def test_numbers(self):
+		self.assertAlmostEqual(self.sizes.paper.width['a'], 210*mm)
+		self.assertAlmostEqual(
+			self.sizes.paper.ratio['b'], papersizes.A5.ratio)
+		self.assertEqual(list(self.sizes.paper.is_landscape()),
+			[False, True, False])
+
+	def test_sizes(self):
+		landscape = self.sizes.paper.landscape()
+		self.assertEqual(landscape['a'], papersizes.A4.landscape())
+		self.assertEqual(list(landscape.index), ['a', 'b', 'c'])
+		bled = self.sizes.paper.add_bleed(3*mm).paper.round_to_mm()
+		self.assertEqual(
+			bled['a'], papersizes.A4.add_bleed(3*mm).round_to_mm())
+		self.assertEqual(self.sizes.paper.flip()['b'], papersizes.A5)
+		self.assertTrue(self.sizes.paper.portrait().isna()['c'])
+
+	def test_format_and_names(self):
+		labels = self.sizes.paper.format('mm')
+		self.assertEqual(list(labels[:2]), ['210x297mm', '210x148mm'])
+		self.assertTrue(labels.isna()['c'])
+		names = self.sizes.paper.catalog_name()
+		self.assertEqual(list(names[:2]), ['A4', 'A5 landscape'])
+		self.assertTrue(names.isna()['c'])
+
+	def test_needs_papersize(self):
+		self.assertRaises(
+			AttributeError, lambda: pd.Series([1.0]).paper)
@@ -1,7 +1,8 @@
 # -*- coding: utf-8 -*-
 import unittest
 
-from papersizes.papersize import PaperSize
+from papersizes.papersize import PaperSize, RatioSeries, Margins
+from papersizes.ratios import ISO_RATIO, GOLDEN_RATIO
 from papersizes.units import mm, inch
 
 class PaperSizeTest(unittest.TestCase):
@@ -94,6 +95,16 @@ class PaperSizeTest(unittest.TestCase):
 		self.assertEqual(PaperSize(8*inch, 5*inch).as_inch_str(), '8x5"')
 		self.assertEqual(PaperSize(8*inch, 5*inch).as_inch_str('in'), '8x5in')
 		self.assertEqual(PaperSize(8.1*inch, 5.51*inch).as_inch_str(), '8⅛x5½"')
+		self.assertEqual(PaperSize(8.96*inch, 4.99*inch).as_inch_str(), '9x5"')
+
+	def test_from_ratio(self):
+		self.assertEqual(
+			PaperSize.from_ratio(width=100, ratio=1.5), PaperSize(100, 150))
+		self.assertEqual(
+			PaperSize.from_ratio(height=150, ratio=1.5), PaperSize(100, 150))
+		self.assertRaises(ValueError, PaperSize.from_ratio, ratio=1.5)
+		self.assertRaises(
+			ValueError, PaperSize.from_ratio, width=1, height=1, ratio=1.5)
 
 	def test_from_inch(self):
 		self.assertEqual(
@@ -112,3 +123,75 @@ class PaperSizeTest(unittest.TestCase):
 			str(PaperSize(8.125*inch, 5.5*inch)),
 			'585x396pt (206x140mm, 8⅛x5½")')
 
+
+	def test_to_pixels(self):
+		self.assertEqual(
+			PaperSize(8.5*inch, 11*inch).to_pixels(300), (2550, 3300))
+		self.assertEqual(
+			PaperSize(8.5*inch, 11*inch).to_pixels((300, 600)), (2550, 6600))
+		a4 = PaperSize(210*mm, 297*mm)
+		self.assertEqual(a4.to_pixels(300), (2480, 3508))
+		self.assertEqual(a4.to_pixels(300, 'up'), (2481, 3508))
+		self.assertEqual(a4.to_pixels(300, 'down'), (2480, 3507))
+		self.assertRaises(ValueError, a4.to_pixels, 300, 'sideways')
+
+class RatioSeriesTest(unittest.TestCase):
+	def test_iso_halving(self):
+		series = RatioSeries(PaperSize(841*mm, 1189*mm), ISO_RATIO)
+		self.assertTrue(series[4].is_approximately((210*mm, 297*mm), mm))
+		self.assertTrue(series[-1].is_approximately((1189*mm, 1682*mm), mm))
+		self.assertAlmostEqual(series[4].ratio, ISO_RATIO)
+
+	def test_rounding(self):
+		series = RatioSeries(
+			PaperSize(841*mm, 1189*mm), ISO_RATIO, rounding='mm')
+		self.assertEqual(series[4], PaperSize.from_mm(210, 297))
+
+	def test_golden_remove_square(self):
+		series = RatioSeries(
+			PaperSize.from_ratio(width=100, ratio=GOLDEN_RATIO),
+			rule=RatioSeries.REMOVE_SQUARE)
+		# Removing a 100x100 square leaves the next size, rotated.
+		self.assertAlmostEqual(series[1].width, 161.8034 - 100, 3)
+		self.assertAlmostEqual(series[1].height, 100)
+
+	def test_thirds(self):
+		series = RatioSeries(PaperSize(300, 400), rule=RatioSeries.THIRDS)
+		self.assertAlmostEqual(series[2].area_in_sq_pts, 120000 / 9)
+		self.assertAlmostEqual(series[2].ratio, 400 / 300)
+
+	def test_initial_number(self):
+		series = RatioSeries(PaperSize(100, 200), initial_number=3)
+		self.assertEqual(series[3], PaperSize(100, 200))
+		self.assertAlmostEqual(series[4].area_in_sq_pts, 10000)
+
+	def test_number_for_area(self):
+		series = RatioSeries(PaperSize(841*mm, 1189*mm), ISO_RATIO)
+		self.assertEqual(series.number_for_area((210*297)*mm*mm), 4)
+
+	def test_between(self):
+		series = RatioSeries(PaperSize(100, 200))
+		self.assertEqual(
+			[number for number, _ in series.between(2500, 40000)],
+			[-1, 0, 1, 2, 3])
+		self.assertEqual(list(series.between(4000, 3000)), [])
+
+	def test_bad_arguments(self):
+		self.assertRaises(
+			ValueError, RatioSeries, PaperSize(100, 200), rule='quarters')
+		self.assertRaises(
+			ValueError, RatioSeries, PaperSize(100, 100),
+			rule=RatioSeries.REMOVE_SQUARE)
+		self.assertRaises(
+			ValueError, RatioSeries, PaperSize(100, 200), rounding='cm')
+
+class MarginsTest(unittest.TestCase):
+	def test_from_value(self):
+		self.assertEqual(Margins.from_value(3), Margins(3, 3, 3, 3))
+		self.assertEqual(Margins.from_value((1, 2, 3, 4)), Margins(1, 2, 3, 4))
+		self.assertTrue(Margins.from_value(3).is_uniform())
+		self.assertFalse(Margins(1, 2, 3, 4).is_uniform())
+
+	def test_is_within(self):
+		self.assertTrue(Margins(0, 0.1, 0, 0).is_within(0.5))
+		self.assertFalse(Margins(0, 1, 0, 0).is_within(0.5))
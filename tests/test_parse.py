@@ -2,7 +2,7 @@
 import unittest
 
 from papersizes.units import *
-from papersizes.parse import dimension, paper_size
+from papersizes.parse import dimension, compile_dimension, paper_size
 from papersizes import papersizes
 
 class TestParseDimension(unittest.TestCase):
@@ -35,6 +35,12 @@ class TestParseDimension(unittest.TestCase):
 		self.assertEqual(dimension('⅞"'), 0.875 * inch)
 		self.assertEqual(dimension('2½"'), 2.5 * inch)
 
+	def test_spaced_fractional_value(self):
+		self.assertEqual(dimension('8 ½in'), 8.5 * inch)
+		self.assertEqual(dimension('8 ½"'), 8.5 * inch)
+		self.assertEqual(dimension('2 ½ inch'), 2.5 * inch)
+		self.assertEqual(dimension('8 ½in + ½in'), 9 * inch)
+
 	def test_cm_and_m(self):
 		self.assertEqual(dimension('cm'), cm)
 		self.assertEqual(dimension('m'), m)
@@ -42,6 +48,33 @@ class TestParseDimension(unittest.TestCase):
 		self.assertEqual(dimension('1.5cm'), 1.5 * cm)
 		self.assertEqual(dimension('1.5 m'), 1.5 * m)
 
+class TestDimensionExpression(unittest.TestCase):
+	def test_arithmetic(self):
+		self.assertAlmostEqual(dimension('210mm + 2*3mm'), 216 * mm)
+		self.assertAlmostEqual(dimension('8½in / 2'), 4.25 * inch)
+		self.assertAlmostEqual(dimension('(8½ + ½)in / 2'), 4.5 * inch)
+		self.assertAlmostEqual(dimension('-3mm + 1cm'), 7 * mm)
+		self.assertEqual(dimension('2 * 3 - 4 / 2'), 4)
+
+	def test_paper_sizes(self):
+		self.assertAlmostEqual(
+			dimension('A4.width - 20mm'), papersizes.A4.width - 20 * mm)
+		self.assertEqual(
+			dimension('letter.HEIGHT'), papersizes.LETTER.height)
+
+	def test_variables(self):
+		function = compile_dimension('trim + 2*bleed')
+		self.assertEqual(function(trim=100, bleed=3), 106)
+		self.assertRaises(ValueError, function, trim=100)
+
+	def test_cached(self):
+		self.assertIs(compile_dimension('1mm'), compile_dimension('1mm'))
+
+	def test_invalid(self):
+		for expression in ('', '3 3', '(1', '2 $', 'A4.depth', 'XX.width'):
+			self.assertRaises(ValueError, dimension, expression)
+		self.assertRaises(ValueError, dimension, '1mm / 0')
+
 class TestParsePaperSize(unittest.TestCase):
 	def test_aX(self):
 		self.assertEqual(paper_size('a4'), papersizes.A4)
@@ -68,9 +101,43 @@ class TestParsePaperSize(unittest.TestCase):
 		self.assertEqual(
 			paper_size('LETTER landscape'), papersizes.LETTER.landscape())
 
+	def test_aliases(self):
+		self.assertEqual(paper_size('DIN A4'), papersizes.A4)
+		self.assertEqual(paper_size('US Letter'), papersizes.LETTER)
+		self.assertEqual(paper_size('B5判'), papersizes.JIS_B5)
+		self.assertEqual(paper_size('4x6/5'), papersizes.SHIROKU_BAN5)
+		self.assertEqual(paper_size('Ａ４'), papersizes.A4)
+
+	def test_pwg_names(self):
+		self.assertEqual(paper_size('iso_a4_210x297mm'), papersizes.A4)
+		self.assertEqual(
+			paper_size('jis_b5_182x257mm'), papersizes.JIS_B5)
+		self.assertEqual(
+			paper_size('na_letter_8.5x11in'), papersizes.LETTER)
+		self.assertEqual(
+			paper_size('na_index-4x6_4x6in'),
+			papersizes.INDEX_CARD_6X4.portrait())
+
+	def test_orientation_words(self):
+		self.assertEqual(
+			paper_size('A4 Hochformat'), papersizes.A4.portrait())
+		self.assertEqual(
+			paper_size('A4 Querformat'), papersizes.A4.landscape())
+		self.assertEqual(
+			paper_size('A4 paysage'), papersizes.A4.landscape())
+		self.assertEqual(paper_size('A4横'), papersizes.A4.landscape())
+		self.assertEqual(
+			paper_size('B5判 縦'), papersizes.JIS_B5.portrait())
+
+	def test_real_names_win(self):
+		self.assertEqual(paper_size('legal'), papersizes.LEGAL)
+		self.assertEqual(paper_size('ledger'), papersizes.LEDGER)
+
 	def test_given_size(self):
 		self.assertEqual(paper_size('8.5x11"'), papersizes.LETTER)
 		self.assertEqual(paper_size('8.5 x 11"'), papersizes.LETTER)
+		self.assertEqual(paper_size('8.5 x 11 in.'), papersizes.LETTER)
+		self.assertEqual(paper_size('8.5 × 11 in'), papersizes.LETTER)
 		self.assertEqual(
 			paper_size('8.5 inch x 11 inch'), papersizes.LETTER)
 		self.assertEqual(paper_size('210 x 297mm'), papersizes.A4)
@@ -0,0 +1,248 @@
+# -*- coding: utf-8 -*-
+import os
+import shutil
+import tempfile
+import unittest
+import zlib
+
+from papersizes import pdfscan
+from papersizes import papersizes
+from papersizes.papersize import PaperSize
+
+def _classic_pdf(objects, root=1):
+	"""Builds a PDF with a classic cross-reference table."""
+	output = bytearray(b'%PDF-1.4\n')
+	offsets = []
+	for number, body in enumerate(objects, 1):
+		offsets.append(len(output))
+		output += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+	start = len(output)
+	output += b'xref\n0 %d\n0000000000 65535 f \n' % (len(objects) + 1)
+	for offset in offsets:
+		output += b'%010d 00000 n \n' % offset
+	output += b'trailer\n<< /Size %d /Root %d 0 R >>\n' % (
+		len(objects) + 1, root)
+	output += b'startxref\n%d\n%%%%EOF\n' % start
+	return bytes(output)
+
+def _compressed_pdf(objects):
+	"""Builds a PDF 1.5 file, with every object in an object stream.
+
+	The cross-reference stream uses the PNG Up predictor, as most PDF
+	writers do."""
+	header = b' '.join(
+		b'%d %d' % (number, offset)
+		for number, offset in zip(
+			range(1, len(objects) + 1),
+			_running_offsets(objects)))
+	content = header + b'\n' + b'\n'.join(objects)
+	first = len(header) + 1
+	stream = zlib.compress(content)
+	stream_number = len(objects) + 1
+	xref_number = len(objects) + 2
+
+	output = bytearray(b'%PDF-1.5\n')
+	stream_offset = len(output)
+	output += b'%d 0 obj\n<< /Type /ObjStm /N %d /First %d /Length %d ' \
+		b'/Filter /FlateDecode >>\nstream\n' % (
+			stream_number, len(objects), first, len(stream))
+	output += stream + b'\nendstream\nendobj\n'
+
+	xref_offset = len(output)
+	rows = [(0, 0, 255)]
+	rows += [(2, stream_number, index) for index in range(len(objects))]
+	rows += [(1, stream_offset, 0), (1, xref_offset, 0)]
+	raw = bytearray()
+	previous = bytes(5)
+	for kind, field, index in rows:
+		row = bytes([kind]) + field.to_bytes(3, 'big') + bytes([index])
+		raw += b'\x02' + bytes((a - b) & 0xff for a, b in zip(row, previous))
+		previous = row
+	stream = zlib.compress(bytes(raw))
+	output += b'%d 0 obj\n<< /Type /XRef /Size %d /W [1 3 1] /Root 1 0 R ' \
+		b'/Filter /FlateDecode /DecodeParms << /Predictor 12 /Columns 5 >> ' \
+		b'/Length %d >>\nstream\n' % (xref_number, xref_number + 1, len(stream))
+	output += stream + b'\nendstream\nendobj\n'
+	output += b'startxref\n%d\n%%%%EOF\n' % xref_offset
+	return bytes(output)
+
+def _hybrid_pdf(objects, direct=2):
+	"""Builds a hybrid-reference PDF, with a table and an /XRefStm.
+
+	The first ``direct`` objects are in the file and its table; the rest
+	are in an object stream, which the table marks as free."""
+	compressed = objects[direct:]
+	header = b' '.join(
+		b'%d %d' % (number, offset)
+		for number, offset in zip(
+			range(direct + 1, len(objects) + 1),
+			_running_offsets(compressed)))
+	content = header + b'\n' + b'\n'.join(compressed)
+	stream = zlib.compress(content)
+	stream_number = len(objects) + 1
+	xref_number = len(objects) + 2
+
+	output = bytearray(b'%PDF-1.5\n')
+	offsets = []
+	for number, body in enumerate(objects[:direct], 1):
+		offsets.append(len(output))
+		output += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+	stream_offset = len(output)
+	output += b'%d 0 obj\n<< /Type /ObjStm /N %d /First %d /Length %d ' \
+		b'/Filter /FlateDecode >>\nstream\n' % (
+			stream_number, len(compressed), len(header) + 1, len(stream))
+	output += stream + b'\nendstream\nendobj\n'
+
+	xref_stream_offset = len(output)
+	rows = b''.join(
+		bytes([2]) + stream_number.to_bytes(3, 'big') + bytes([index])
+		for index in range(len(compressed)))
+	output += b'%d 0 obj\n<< /Type /XRef /Size %d /W [1 3 1] ' \
+		b'/Index [%d %d] /Length %d >>\nstream\n' % (
+			xref_number, xref_number + 1, direct + 1, len(compressed),
+			len(rows))
+	output += rows + b'\nendstream\nendobj\n'
+
+	start = len(output)
+	output += b'xref\n0 %d\n0000000000 65535 f \n' % (xref_number + 1)
+	for offset in offsets:
+		output += b'%010d 00000 n \n' % offset
+	for _ in compressed:
+		output += b'0000000000 00001 f \n'
+	for offset in (stream_offset, xref_stream_offset):
+		output += b'%010d 00000 n \n' % offset
+	output += b'trailer\n<< /Size %d /Root 1 0 R /XRefStm %d >>\n' % (
+		xref_number + 1, xref_stream_offset)
+	output += b'startxref\n%d\n%%%%EOF\n' % start
+	return bytes(output)
+
+def _updated_pdf(data, number, body):
+	"""Appends an incremental update replacing one object."""
+	previous = int(data.rsplit(b'startxref', 1)[1].split()[0])
+	size = int(data.rsplit(b'/Size', 1)[1].split()[0])
+	output = bytearray(data)
+	offset = len(output)
+	output += b'%d 0 obj\n%s\nendobj\n' % (number, body)
+	start = len(output)
+	output += b'xref\n%d 1\n%010d 00000 n \n' % (number, offset)
+	output += b'trailer\n<< /Size %d /Root 1 0 R /Prev %d >>\n' % (
+		size, previous)
+	output += b'startxref\n%d\n%%%%EOF\n' % start
+	return bytes(output)
+
+def _running_offsets(objects):
+	offset = 0
+	for body in objects:
+		yield offset
+		offset += len(body) + 1
+
+_TREE = [
+	b'<< /Type /Catalog /Pages 2 0 R >>',
+	b'<< /Type /Pages /Kids [3 0 R 4 0 R] /Count 3 '
+	b'/MediaBox [0 0 595.276 841.89] /Rotate 0 >>',
+	b'<< /Type /Page /Parent 2 0 R /TrimBox [10 10 585.276 831.89] >>',
+	b'<< /Type /Pages /Parent 2 0 R /Kids [5 0 R 6 0 R] /Count 2 '
+	b'/Rotate 90 >>',
+	b'<< /Type /Page /Parent 4 0 R /MediaBox [0 0 612 792] >>',
+	b'<< /Type /Page /Parent 4 0 R /Rotate -180 /CropBox 7 0 R >>',
+	b'[0 0 300 400]',
+	]
+
+class PdfTest(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def write(self, data, name='test.pdf'):
+		path = os.path.join(self.directory, name)
+		with open(path, 'wb') as f:
+			f.write(data)
+		return path
+
+class TestClassicPdf(PdfTest):
+	def test_pages(self):
+		pages = list(pdfscan.pages(self.write(_classic_pdf(_TREE))))
+		self.assertEqual([page.number for page in pages], [1, 2, 3])
+		self.assertEqual(pages[0].media_box, (0, 0, 595.276, 841.89))
+		self.assertEqual(pages[0].trim_box, (10, 10, 585.276, 831.89))
+		self.assertEqual(pages[0].bleed_box, pages[0].media_box)
+		self.assertEqual(pages[0].rotate, 0)
+		self.assertEqual(pages[1].rotate, 90)
+		self.assertEqual(pages[2].rotate, 180)
+		self.assertEqual(pages[2].crop_box, (0, 0, 300, 400))
+		self.assertEqual(pages[2].trim_box, (0, 0, 300, 400))
+
+	def test_page_sizes(self):
+		path = self.write(_classic_pdf(_TREE))
+		sizes = list(pdfscan.page_sizes(path))
+		self.assertTrue(sizes[0].is_approximately(papersizes.A4))
+		self.assertEqual(sizes[1], papersizes.LETTER.landscape())
+		self.assertTrue(sizes[2].is_approximately(papersizes.A4))
+		self.assertEqual(
+			list(pdfscan.page_sizes(path, rotate=False))[1],
+			papersizes.LETTER)
+		self.assertEqual(
+			list(pdfscan.page_sizes(path, box='TrimBox'))[0],
+			PaperSize(575.276, 821.89))
+
+	def test_chunks(self):
+		path = self.write(_classic_pdf(_TREE))
+		chunks = list(pdfscan.page_size_chunks(path, chunk_size=2))
+		self.assertEqual([len(widths) for widths, _ in chunks], [2, 1])
+		self.assertEqual(chunks[0][0][1], 792)
+
+	def test_broken_xref(self):
+		data = _classic_pdf(_TREE).replace(
+			b'startxref\n', b'startxref\n9')
+		sizes = list(pdfscan.page_sizes(self.write(data)))
+		self.assertEqual(len(sizes), 3)
+
+	def test_bad_box_name(self):
+		page = next(pdfscan.pages(self.write(_classic_pdf(_TREE))))
+		self.assertRaises(ValueError, page.size, 'SlugBox')
+
+	def test_incremental_update(self):
+		data = _updated_pdf(
+			_classic_pdf(_TREE), 5,
+			b'<< /Type /Page /Parent 4 0 R /MediaBox [0 0 612 1008] >>')
+		sizes = list(pdfscan.page_sizes(self.write(data), rotate=False))
+		self.assertEqual(len(sizes), 3)
+		self.assertEqual(sizes[1], papersizes.LEGAL)
+		self.assertTrue(sizes[0].is_approximately(papersizes.A4))
+
+	def test_not_a_pdf(self):
+		self.assertRaises(
+			pdfscan.PdfError, pdfscan.PdfScanner, self.write(b'hello'))
+		self.assertRaises(
+			pdfscan.PdfError, pdfscan.PdfScanner, self.write(b''))
+
+class TestCompressedPdf(PdfTest):
+	def test_page_sizes(self):
+		path = self.write(_compressed_pdf(_TREE))
+		sizes = list(pdfscan.page_sizes(path))
+		self.assertEqual(len(sizes), 3)
+		self.assertEqual(sizes[1], papersizes.LETTER.landscape())
+		with pdfscan.PdfScanner(path) as scanner:
+			pages = list(scanner.pages())
+		self.assertEqual(pages[2].crop_box, (0, 0, 300, 400))
+
+class TestHybridPdf(PdfTest):
+	def test_page_sizes(self):
+		path = self.write(_hybrid_pdf(_TREE))
+		sizes = list(pdfscan.page_sizes(path))
+		self.assertEqual(len(sizes), 3)
+		self.assertEqual(sizes[1], papersizes.LETTER.landscape())
+		with pdfscan.PdfScanner(path) as scanner:
+			pages = list(scanner.pages())
+		self.assertEqual(pages[2].crop_box, (0, 0, 300, 400))
+
+	def test_incremental_update(self):
+		data = _updated_pdf(
+			_hybrid_pdf(_TREE), 5,
+			b'<< /Type /Page /Parent 4 0 R /MediaBox [0 0 612 1008] >>')
+		sizes = list(pdfscan.page_sizes(self.write(data), rotate=False))
+		self.assertEqual(len(sizes), 3)
+		self.assertEqual(sizes[1], papersizes.LEGAL)
+		self.assertTrue(sizes[2].is_approximately(papersizes.A4))
@@ -0,0 +1,80 @@
+# -*- coding: utf-8 -*-
+import array
+import unittest
+
+from papersizes import papersizes
+from papersizes.papersize import PaperSize
+from papersizes.pipeline import Pipeline
+from papersizes.units import mm
+
+class TestPipeline(unittest.TestCase):
+	def test_matches_methods(self):
+		pipeline = Pipeline().landscape().half().flip().add_bleed(3*mm) \
+			.round_to_mm()
+		size = papersizes.A4
+		expected = size.landscape().half().flip().add_bleed(3*mm) \
+			.round_to_mm()
+		self.assertEqual(pipeline(size), expected)
+
+	def test_squares(self):
+		size = PaperSize(100, 200)
+		self.assertEqual(Pipeline().small_square()(size), size.small_square())
+		self.assertEqual(Pipeline().large_square()(size), size.large_square())
+
+	def test_empty(self):
+		self.assertEqual(Pipeline()(papersizes.A4), papersizes.A4)
+
+	def test_immutable(self):
+		base = Pipeline().portrait()
+		extended = base.add_bleed(3*mm)
+		self.assertEqual(base.operations, (('portrait',),))
+		self.assertEqual(len(extended.operations), 2)
+
+	def test_equal_and_cached(self):
+		first = Pipeline().portrait().round_to_mm()
+		second = Pipeline().portrait().round_to_mm()
+		self.assertEqual(first, second)
+		self.assertEqual(hash(first), hash(second))
+		self.assertIs(first.function, second.function)
+		self.assertNotEqual(first, Pipeline().landscape().round_to_mm())
+
+	def test_simplified(self):
+		pipeline = Pipeline().flip().landscape().portrait() \
+			.add_bleed(1).add_bleed(2).flip().flip().round_to_mm() \
+			.round_to_mm().scale(2).scale(3)
+		self.assertEqual(
+			pipeline.simplified().operations,
+			(('portrait',), ('add_bleed', 3), ('round_to_mm',),
+				('scale', 6)))
+		size = PaperSize(300, 100)
+		self.assertEqual(pipeline(size), pipeline.simplified()(size))
+
+	def test_apply_many(self):
+		pipeline = Pipeline().portrait().add_bleed(3*mm)
+		sizes = [papersizes.A4.landscape(), papersizes.LETTER]
+		self.assertEqual(
+			pipeline.apply_many(sizes),
+			[papersizes.A4.add_bleed(3*mm),
+				papersizes.LETTER.add_bleed(3*mm)])
+
+	def test_apply_arrays(self):
+		pipeline = Pipeline().landscape().scale(2)
+		widths = array.array('d', [1, 4])
+		heights = array.array('d', [2, 3])
+		out_widths, out_heights = pipeline.apply_arrays(widths, heights)
+		self.assertEqual(list(out_widths), [4, 8])
+		self.assertEqual(list(out_heights), [2, 6])
+		pipeline.apply_arrays(widths, heights, widths, heights)
+		self.assertEqual(list(widths), [4, 8])
+		self.assertRaises(
+			ValueError, pipeline.apply_arrays, [1], [1, 2])
+
+	def test_classify_many(self):
+		pipeline = Pipeline().portrait().round_to_mm()
+		results = pipeline.classify_many(
+			[(842, 595), (595, 842), (100, 100)])
+		self.assertEqual(
+			[name for _, name in results], ['A4', 'A4', None])
+
+	def test_unknown_operation(self):
+		self.assertRaises(ValueError, Pipeline, [('crumple',)])
@@ -0,0 +1,95 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import papersizes
+from papersizes import postage
+from papersizes.units import inch, mm
+
+class TestFolds(unittest.TestCase):
+	def test_folded(self):
+		size, layers = postage.folded(papersizes.A4, 'tri')
+		self.assertAlmostEqual(size[0], 99*mm)
+		self.assertAlmostEqual(size[1], 210*mm)
+		self.assertEqual(layers, 3)
+		size, layers = postage.folded(papersizes.A4, 'quarter')
+		self.assertAlmostEqual(size[0], 105*mm)
+		self.assertAlmostEqual(size[1], 148.5*mm)
+		self.assertEqual(layers, 4)
+		self.assertEqual(postage.folded((10, 20)), ((10, 20), 1))
+		self.assertRaises(ValueError, postage.folded, (10, 20), 'origami')
+
+	def test_weight(self):
+		# A0 is a square metre.
+		self.assertAlmostEqual(postage.weight(papersizes.A0, 80), 80, 1)
+		self.assertAlmostEqual(postage.weight(papersizes.A4, 80, 2), 10, 1)
+
+class TestBands(unittest.TestCase):
+	def test_royal_mail(self):
+		band = postage.ROYAL_MAIL.band(210*mm, 99*mm, 1*mm, 20)
+		self.assertEqual(band.name, 'Letter')
+		band = postage.ROYAL_MAIL.band(297*mm, 210*mm, 1*mm, 20)
+		self.assertEqual(band.name, 'Large Letter')
+		band = postage.ROYAL_MAIL.band(240*mm, 165*mm, 6*mm, 20)
+		self.assertEqual(band.name, 'Large Letter')
+		band = postage.ROYAL_MAIL.band(240*mm, 165*mm, 5*mm, 100)
+		self.assertEqual(band.name, 'Letter')
+		self.assertEqual(
+			postage.ROYAL_MAIL.band(1000*mm, 100*mm, 1*mm, 10), None)
+		# Too small to post.
+		self.assertEqual(
+			postage.ROYAL_MAIL.band(100*mm, 80*mm, 1*mm, 10), None)
+
+	def test_usps(self):
+		band = postage.USPS.band(9*inch, 4*inch, 0.01*inch, 20)
+		self.assertEqual(band.name, 'Letter')
+		band = postage.USPS.band(9*inch, 4*inch, 0.01*inch, 200)
+		self.assertEqual(band.name, 'Flat')
+		self.assertEqual(
+			postage.USPS.band(9*inch, 4*inch, 0.005*inch, 20), None)
+
+	def test_limits_must_increase(self):
+		self.assertRaises(ValueError, postage.BandTable, 'Bad', [
+			postage.PostalBand('Big', 100, 100, 10, 100),
+			postage.PostalBand('Small', 50, 100, 10, 100),
+			])
+
+class TestMailing(unittest.TestCase):
+	def test_mailing(self):
+		result = postage.mailing(
+			[papersizes.A4] * 4, gsm=90, sheets=[1, 3, 10, 100],
+			fold=['tri', 'flat', 'half', 'flat'])
+		self.assertEqual(len(result), 4)
+		self.assertEqual(
+			result.band_names(),
+			['Letter', 'Large Letter', 'Letter', 'Large Letter'])
+		self.assertAlmostEqual(result.weights[1], 3 * 90 / 16.0, 1)
+		self.assertAlmostEqual(result.thicknesses[0], 3 * 0.09*mm)
+		self.assertAlmostEqual(result.thicknesses[2], 20 * 0.09*mm)
+		self.assertAlmostEqual(result.widths[0], 99*mm)
+		self.assertEqual(result.band(3).name, 'Large Letter')
+
+	def test_caliper(self):
+		result = postage.mailing(
+			[papersizes.A4], gsm=90, sheets=50, caliper=0.2*mm)
+		self.assertAlmostEqual(result.thicknesses[0], 10*mm)
+		self.assertEqual(result.band_names(), ['Large Letter'])
+
+	def test_band_counts(self):
+		result = postage.mailing(
+			[papersizes.A4, papersizes.A4, papersizes.A0, papersizes.A4],
+			gsm=80, fold=['tri', 'flat', 'flat', 'tri'])
+		self.assertEqual(
+			list(result.band_counts().items()),
+			[('Letter', 2), ('Large Letter', 1), (None, 1)])
+		self.assertAlmostEqual(
+			result.total_weight(), sum(result.weights))
+
+	def test_lengths_must_match(self):
+		self.assertRaises(
+			ValueError, postage.mailing, [papersizes.A4] * 5, gsm=[80, 90])
+		self.assertRaises(
+			ValueError, postage.mailing, [papersizes.A4] * 2, gsm=80,
+			sheets=iter([1, 2, 3]))
+		result = postage.mailing(
+			(size for size in [papersizes.A4] * 2), gsm=(80, 90))
+		self.assertEqual(len(result), 2)
@@ -0,0 +1,122 @@
+# -*- coding: utf-8 -*-
+import gzip
+import os
+import shutil
+import tempfile
+import unittest
+
+from papersizes import ppd
+from papersizes import papersizes
+from papersizes.papersize import Margins
+from papersizes.units import mm
+
+_PPD = '''*PPD-Adobe: "4.3"
+*ModelName: "Example Press"
+*NickName: "Example Press 9000"
+*OpenUI *PageSize/Media Size: PickOne
+*PageSize A4/A4: "<</PageSize[595 842]>>setpagedevice"
+*CloseUI: *PageSize
+*PaperDimension A4/A4: "595 842"
+*PaperDimension SRA3/SRA3: "907 1276"
+*PaperDimension SRA3.Borderless/SRA3 (Borderless): "907 1276"
+*PaperDimension Custom/Custom: "100 100"
+*ImageableArea A4/A4: "12 12 583 830"
+*ImageableArea SRA3/SRA3: "12 12 895 1264"
+*ImageableArea SRA3.Borderless/SRA3 (Borderless): "0 0 907 1276"
+'''
+
+class TestParsePpd(unittest.TestCase):
+	def test_parse(self):
+		result = ppd.parse_ppd(_PPD)
+		self.assertEqual(result.model, 'Example Press')
+		self.assertEqual(result.printer, 'Example Press 9000')
+		self.assertEqual(
+			[media.name for media in result.media],
+			['A4', 'SRA3', 'SRA3.Borderless', 'Custom'])
+		a4 = result.media[0]
+		self.assertEqual(a4.catalog_name, 'A4')
+		self.assertEqual(a4.margins, Margins(12, 12, 12, 12))
+		self.assertFalse(a4.is_borderless())
+		self.assertEqual(result.media[1].catalog_name, 'SRA3')
+		self.assertTrue(result.media[2].is_borderless())
+		self.assertEqual(result.media[2].translation, 'SRA3 (Borderless)')
+		self.assertEqual(result.media[3].catalog_name, None)
+		self.assertEqual(result.media[3].margins, None)
+		self.assertFalse(result.media[3].is_borderless())
+
+	def test_no_imageable_area(self):
+		result = ppd.parse_ppd('*PaperDimension SRA3/SRA3: "907 1276"\n')
+		self.assertEqual(result.media[0].margins, None)
+		self.assertFalse(result.media[0].is_borderless())
+
+class TestPpdFiles(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		self.path = os.path.join(self.directory, 'press.ppd')
+		with open(self.path, 'w') as f:
+			f.write(_PPD)
+		with gzip.open(os.path.join(self.directory, 'office.ppd.gz'), 'wt') as f:
+			f.write(
+				'*NickName: "Office Laser"\n'
+				'*PaperDimension A4/A4: "595 842"\n'
+				'*ImageableArea A4/A4: "10 10 585 832"\n')
+		with open(os.path.join(self.directory, 'proof.ppd'), 'w') as f:
+			f.write(
+				'*NickName: "Proofer"\n'
+				'*PaperDimension SRA3/SRA3: "907 1276"\n')
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+	def test_find_ppds(self):
+		self.assertEqual(
+			[os.path.basename(path)
+			 for path in ppd.find_ppds(self.directory)],
+			['office.ppd.gz', 'press.ppd', 'proof.ppd'])
+		self.assertEqual(ppd.find_ppds(os.path.join(self.directory, 'x')), [])
+
+	def test_load_caches(self):
+		cache = os.path.join(self.directory, 'cache')
+		first = ppd.load(self.path, cache)
+		self.assertEqual(len(os.listdir(cache)), 1)
+		ppd._memory_cache.clear()
+		self.assertEqual(ppd.load(self.path, cache), first)
+		self.assertEqual(first.media[3].margins, None)
+		self.assertIs(ppd.load(self.path, cache), ppd.load(self.path))
+
+	def test_load_notices_changes(self):
+		ppd.load(self.path)
+		with open(self.path, 'a') as f:
+			f.write('*PaperDimension A5/A5: "420 595"\n')
+		os.utime(self.path, ns=(0, 0))
+		self.assertEqual(len(ppd.load(self.path).media), 5)
+
+	def test_printer_index(self):
+		index = ppd.PrinterIndex(ppd.find_ppds(self.directory))
+		self.assertEqual(
+			index.printers_for('A4'), ['Example Press 9000', 'Office Laser'])
+		self.assertEqual(
+			index.printers_for(papersizes.A4.landscape()),
+			['Example Press 9000', 'Office Laser'])
+		self.assertEqual(
+			index.printers_for('SRA3', borderless=True),
+			['Example Press 9000'])
+		self.assertEqual(index.printers_for('A4', borderless=True), [])
+		self.assertEqual(index.printers_for('A0'), [])
+		self.assertEqual(
+			index.printers_for('SRA3'), ['Example Press 9000', 'Proofer'])
+		self.assertEqual(len(index.media_for('SRA3')), 3)
+
+	def test_borderless_tolerance(self):
+		# Margins of about 0.8mm are within the size tolerance, but
+		# aren't borderless.
+		index = ppd.PrinterIndex()
+		index.add(ppd.parse_ppd(
+			'*NickName: "Narrow Margins"\n'
+			'*PaperDimension A4/A4: "595 842"\n'
+			'*ImageableArea A4/A4: "2.27 2.27 592.73 839.73"\n'))
+		self.assertEqual(index.printers_for('A4'), ['Narrow Margins'])
+		self.assertEqual(index.printers_for('A4', borderless=True), [])
+		index.borderless_tolerance = 1*mm
+		self.assertEqual(
+			index.printers_for('A4', borderless=True), ['Narrow Margins'])
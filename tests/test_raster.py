@@ -0,0 +1,66 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import raster
+from papersizes import papersizes
+from papersizes.units import inch
+
+class TestBufferBytes(unittest.TestCase):
+	def test_row_stride(self):
+		self.assertEqual(raster.row_stride(100), 400)
+		self.assertEqual(raster.row_stride(100, 1, 1), 13)
+		self.assertEqual(raster.row_stride(100, 3, 8, 4), 300)
+		self.assertEqual(raster.row_stride(101, 3, 8, 4), 304)
+
+	def test_buffer_bytes(self):
+		self.assertEqual(raster.buffer_bytes(100, 50, 4, 16), 40000)
+
+class TestPlan(unittest.TestCase):
+	def test_full_page(self):
+		plan = raster.plan(papersizes.LETTER, 100, channels=1)
+		self.assertEqual(plan.width_px, 850)
+		self.assertEqual(plan.height_px, 1100)
+		self.assertEqual(plan.bytes, 850 * 1100)
+		self.assertFalse(plan.is_banded())
+		self.assertEqual(list(plan.band_rows()), [(0, 1100)])
+
+	def test_banded(self):
+		plan = raster.plan(
+			(10*inch, 10*inch), 100, channels=1, budget=1000*300)
+		self.assertEqual(plan.band_height, 300)
+		self.assertEqual(plan.bands, 4)
+		self.assertEqual(plan.bytes, 1000*300)
+		self.assertEqual(plan.full_page_bytes, 1000*1000)
+		self.assertEqual(
+			list(plan.band_rows()),
+			[(0, 300), (300, 600), (600, 900), (900, 1000)])
+
+	def test_a0_at_1200dpi_is_banded(self):
+		plan = raster.plan(papersizes.A0, 1200, budget=512 * 1024**2)
+		self.assertTrue(plan.is_banded())
+		self.assertLessEqual(plan.bytes, 512 * 1024**2)
+
+	def test_budget_too_small(self):
+		self.assertRaises(
+			ValueError, raster.plan, papersizes.A4, 300, budget=10)
+
+class TestPlanMany(unittest.TestCase):
+	def test_single_dpi(self):
+		sizes = [papersizes.A4, papersizes.LETTER, papersizes.A4]
+		plans = raster.plan_many(sizes, 72)
+		self.assertEqual(
+			[(p.width_px, p.height_px) for p in plans],
+			[(595, 842), (612, 792), (595, 842)])
+		self.assertEqual(
+			raster.total_bytes(plans), 4 * (2 * 595 * 842 + 612 * 792))
+
+	def test_dpi_per_size(self):
+		plans = raster.plan_many(
+			[papersizes.LETTER, papersizes.LETTER], [72, (144, 72)])
+		self.assertEqual(
+			[(p.width_px, p.height_px) for p in plans],
+			[(612, 792), (1224, 792)])
+
+	def test_mismatched_lengths(self):
+		self.assertRaises(
+			ValueError, raster.plan_many, [papersizes.A4], [72, 300])
@@ -0,0 +1,58 @@
+# -*- coding: utf-8 -*-
+import unittest
+
+from papersizes import papersizes
+from papersizes.papersize import PaperSize
+from papersizes.ratios import *
+
+class TestRatioClassifier(unittest.TestCase):
+	def test_standard_sizes(self):
+		self.assertEqual(
+			RatioClassifier().classify(papersizes.A4)[0], 'ISO_RATIO')
+		self.assertEqual(
+			RatioClassifier().classify(
+				papersizes.A4.landscape())[0], 'ISO_RATIO')
+		self.assertEqual(
+			RatioClassifier().classify(PaperSize(300, 400))[0],
+			'FOUR_THIRDS')
+		self.assertEqual(
+			RatioClassifier().classify(PaperSize(200, 300))[0], 'TWO_THIRDS')
+
+	def test_error(self):
+		name, error = RatioClassifier().classify(PaperSize(100, 151.5))
+		self.assertEqual(name, 'TWO_THIRDS')
+		self.assertAlmostEqual(error, 0.01)
+
+	def test_tolerance(self):
+		classifier = RatioClassifier(tolerance=0.01)
+		self.assertEqual(classifier.classify(papersizes.LETTER)[0], None)
+		self.assertEqual(classifier.classify(papersizes.B5)[0], 'ISO_RATIO')
+
+	def test_custom_ratios(self):
+		classifier = RatioClassifier({'square': 1.0, 'double': 0.5})
+		self.assertEqual(classifier.classify((100, 110))[0], 'square')
+		self.assertEqual(classifier.classify((100, 190))[0], 'double')
+
+	def test_no_ratios(self):
+		self.assertRaises(ValueError, RatioClassifier, [])
+
+	def test_invalid_size(self):
+		classifier = RatioClassifier()
+		self.assertRaises(ValueError, classifier.classify, (100, 0))
+		self.assertRaises(ValueError, classifier.classify, (-100, 141))
+		self.assertRaises(
+			ValueError, classifier.classify, (float('nan'), 141))
+
+class TestClassifyRatio(unittest.TestCase):
+	def test_batch(self):
+		results = classify_ratio(
+			[papersizes.A4, papersizes.LETTER, papersizes.A4])
+		self.assertEqual(
+			[name for name, _ in results],
+			['ISO_RATIO', 'FOUR_THIRDS', 'ISO_RATIO'])
+
+	def test_batch_with_tolerance(self):
+		results = classify_ratio(
+			[papersizes.A4, papersizes.LETTER], tolerance=0.001)
+		self.assertEqual(
+			[name for name, _ in results], ['ISO_RATIO', None])
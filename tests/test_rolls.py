@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from papersizes import papersizes
+from papersizes import rolls
+from papersizes.units import mm
+
+def _pieces_made(plan):
+	made = {}
+	for pattern in plan.patterns:
+		for lane in pattern.lanes:
+			made[lane.job] = made.get(lane.job, 0) + lane.pieces
+	return made
+
+class TestRolls(unittest.TestCase):
+	def test_single_job(self):
+		plan = rolls.plan_roll([((100, 200), 10)], 500)
+		# Five lanes across, two pieces each.
+		self.assertEqual(len(plan.patterns), 1)
+		self.assertEqual(len(plan.patterns[0].lanes), 5)
+		self.assertEqual(plan.length, 400)
+		self.assertEqual(plan.lower_bound, 400)
+		self.assertEqual(plan.gap, 0)
+		self.assertEqual(plan.efficiency, 1)
+
+	def test_rotation(self):
+		plan = rolls.plan_roll([((300, 100), 6)], 300)
+		self.assertEqual(plan.patterns[0].lanes[0].width, 300)
+		self.assertEqual(plan.length, 600)
+		plan = rolls.plan_roll([((200, 100), 6)], 300, rotate=False)
+		self.assertEqual(plan.patterns[0].lanes[0].width, 200)
+		self.assertRaises(
+			ValueError, rolls.plan_roll, [((400, 100), 1)], 300,
+			rotate=False)
+
+	def test_gap(self):
+		plan = rolls.plan_roll([((100, 100), 3)], 310, gap=5)
+		lanes = plan.patterns[0].lanes
+		self.assertEqual([lane.x for lane in lanes], [0, 105, 210])
+
+	def test_mixed_jobs(self):
+		jobs = [(papersizes.A3, 400), (papersizes.A2, 150)]
+		plan = rolls.plan_roll(jobs, 610*mm)
+		made = _pieces_made(plan)
+		self.assertEqual(made, {0: 400, 1: 150})
+		self.assertGreaterEqual(plan.length, plan.lower_bound)
+		self.assertLess(plan.gap, 0.05)
+
+	def test_quantities_met(self):
+		generator = random.Random(7)
+		jobs = [
+			((generator.randint(50, 400)*mm, generator.randint(50, 600)*mm),
+				generator.randint(0, 50))
+			for _ in range(200)]
+		plan = rolls.plan_roll(jobs, 914*mm, gap=2*mm)
+		made = _pieces_made(plan)
+		for index, (_, quantity) in enumerate(jobs):
+			self.assertGreaterEqual(made.get(index, 0), quantity)
+		for pattern in plan.patterns:
+			right = max(lane.x + lane.width for lane in pattern.lanes)
+			self.assertLessEqual(right, 914*mm + 1e-6)
+		self.assertAlmostEqual(
+			plan.length, sum(pattern.length for pattern in plan.patterns))
+		self.assertGreaterEqual(plan.length, plan.lower_bound)
+		for pattern in plan.patterns:
+			for lane in pattern.lanes:
+				self.assertGreater(lane.pieces, 0)
+
+	def test_long_pieces_left_out(self):
+		# The short job finishes first, so the long one waits for a
+		# pattern it can fill, rather than taking an empty lane.
+		plan = rolls.plan_roll([((100, 500), 1), ((100, 50), 2)], 200)
+		for pattern in plan.patterns:
+			for lane in pattern.lanes:
+				self.assertGreater(lane.pieces, 0)
+		self.assertEqual(_pieces_made(plan), {0: 1, 1: 2})
+
+	def test_invalid_jobs(self):
+		for jobs in ([((0, 100), 1)], [((100, -1), 1)], [((100, 100), 1.5)],
+				[((100, 100), -1)]):
+			self.assertRaises(ValueError, rolls.plan_roll, jobs, 300)
+		self.assertEqual(rolls.plan_rolls([((0, 100), 1)], [300]), [])
+
+	def test_best_roll(self):
+		jobs = [(papersizes.A3, 400), (papersizes.A2, 150)]
+		widths = [400*mm, 610*mm, 914*mm, 1067*mm]
+		plans = rolls.plan_rolls(jobs, widths)
+		self.assertEqual(len(plans), 3)
+		self.assertEqual(
+			[plan.waste for plan in plans],
+			sorted(plan.waste for plan in plans))
+		self.assertEqual(rolls.best_roll(jobs, widths), plans[0])
+		self.assertRaises(ValueError, rolls.best_roll, jobs, [100*mm])
+
+	def test_no_jobs(self):
+		plan = rolls.plan_roll([], 100)
+		self.assertEqual(plan.patterns, [])
+		self.assertEqual(plan.length, 0)
+		self.assertEqual(plan.efficiency, 1.0)
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+import csv
+import io
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+
+from papersizes import scan
+from papersizes.__main__ import main
+from tests.test_pdfscan import _classic_pdf, _TREE
+
+class ScanTest(unittest.TestCase):
+	def setUp(self):
+		self.directory = tempfile.mkdtemp()
+		os.mkdir(os.path.join(self.directory, 'sub'))
+		for name in ('a.pdf', os.path.join('sub', 'b.PDF')):
+			with open(os.path.join(self.directory, name), 'wb') as f:
+				f.write(_classic_pdf(_TREE))
+		for name in ('broken.pdf', 'notes.txt'):
+			with open(os.path.join(self.directory, name), 'wb') as f:
+				f.write(b'not a pdf')
+
+	def tearDown(self):
+		shutil.rmtree(self.directory)
+
+class TestScan(ScanTest):
+	def test_find_files(self):
+		self.assertEqual(
+			[os.path.relpath(path, self.directory)
+			 for path in scan.find_files(self.directory)],
+			['a.pdf', 'broken.pdf', os.path.join('sub', 'b.PDF')])
+
+	def test_scan(self):
+		stats = scan.ScanStats()
+		results = dict(scan.scan(
+			scan.find_files(self.directory), workers=2, max_in_flight=1,
+			stats=stats))
+		records = results[os.path.join(self.directory, 'a.pdf')]
+		self.assertEqual(
+			[record.name for record in records],
+			['A4', 'LETTER landscape', 'A4'])
+		broken = results[os.path.join(self.directory, 'broken.pdf')]
+		self.assertEqual(broken[0].page, None)
+		self.assertTrue(broken[0].error)
+		self.assertEqual(
+			(stats.files, stats.pages, stats.errors), (3, 6, 1))
+
+	def test_skip(self):
+		path = os.path.join(self.directory, 'a.pdf')
+		results = dict(scan.scan(scan.find_files(self.directory), skip={path}))
+		self.assertNotIn(path, results)
+		self.assertEqual(len(results), 2)
+
+class TestScanCommand(ScanTest):
+	def test_jsonl(self):
+		output = io.StringIO()
+		with redirect_stdout(output):
+			self.assertEqual(main(['scan', self.directory]), 0)
+		records = [json.loads(line) for line in output.getvalue().splitlines()]
+		self.assertEqual(len(records), 7)
+		self.assertEqual(
+			sorted(record.get('name') for record in records
+				if record.get('name'))[0], 'A4')
+
+	def test_csv_with_checkpoint(self):
+		output = os.path.join(self.directory, 'out.csv')
+		checkpoint = os.path.join(self.directory, 'done.txt')
+		arguments = [
+			'scan', self.directory, '--format', 'csv', '--output', output,
+			'--checkpoint', checkpoint]
+		self.assertEqual(main(arguments), 0)
+		with open(checkpoint) as f:
+			self.assertEqual(len(f.read().splitlines()), 3)
+
+		# Resuming should find nothing more to do.
+		self.assertEqual(main(arguments), 0)
+		with open(output) as f:
+			rows = list(csv.DictReader(f))
+		self.assertEqual(len(rows), 7)
+		self.assertIn('A4', [row['name'] for row in rows])
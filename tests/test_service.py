@@ -0,0 +1,120 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from papersizes import papersizes
+from papersizes import service
+
+async def _exchange(reader, writer, requests):
+	"""Sends requests at once, returning the responses keyed by id."""
+	writer.write(b''.join(
+		json.dumps(request).encode('utf-8') + b'\n' for request in requests))
+	await writer.drain()
+	responses = {}
+	for _ in requests:
+		response = json.loads((await reader.readline()).decode('utf-8'))
+		responses[response['id']] = response
+	return responses
+
+class TestSizeService(unittest.TestCase):
+	def run_client(self, client, **kwargs):
+		async def _run():
+			size_service = service.SizeService(**kwargs)
+			server = await size_service.start()
+			port = server.sockets[0].getsockname()[1]
+			reader, writer = await asyncio.open_connection('127.0.0.1', port)
+			try:
+				return size_service, await client(reader, writer)
+			finally:
+				writer.close()
+				await writer.wait_closed()
+				server.close()
+				await server.wait_closed()
+		return asyncio.run(_run())
+
+	def test_methods(self):
+		async def client(reader, writer):
+			return await _exchange(reader, writer, [
+				{'id': 1, 'method': 'paper_size', 'value': 'A4 landscape'},
+				{'id': 2, 'method': 'dimension', 'value': '3mm'},
+				{'id': 3, 'method': 'name', 'value': [612, 792]},
+				{'id': 4, 'method': 'classify',
+					'value': list(papersizes.A5.landscape())},
+				{'id': 5, 'method': 'paper_size', 'value': 'nonsense'},
+				{'id': 6, 'method': 'teleport'},
+				])
+		_, responses = self.run_client(client)
+		self.assertEqual(
+			responses[1]['result'], list(papersizes.A4.landscape()))
+		self.assertAlmostEqual(responses[2]['result'], 8.503937, 5)
+		self.assertEqual(responses[3]['result'], 'LETTER')
+		self.assertEqual(responses[4]['result']['name'], 'A5 landscape')
+		self.assertEqual(responses[4]['result']['ratio'], 'ISO_RATIO')
+		self.assertIn('error', responses[5])
+		self.assertIn('error', responses[6])
+
+	def test_batching_and_stats(self):
+		async def client(reader, writer):
+			await _exchange(reader, writer, [
+				{'id': index, 'method': 'paper_size', 'value': 'A4'}
+				for index in range(20)])
+			return await _exchange(
+				reader, writer, [{'id': 'stats', 'method': 'stats'}])
+		size_service, responses = self.run_client(
+			client, window=0.05, max_batch=8)
+		stats = responses['stats']['result']['paper_size']
+		self.assertEqual(stats['requests'], 20)
+		self.assertEqual(stats['errors'], 0)
+		self.assertLess(stats['batches'], 20)
+		self.assertGreater(stats['mean_batch'], 1)
+
+	def test_invalid_size(self):
+		async def client(reader, writer):
+			return await _exchange(reader, writer, [
+				{'id': 1, 'method': 'classify', 'value': [595, 842]},
+				{'id': 2, 'method': 'classify', 'value': [100, 0]},
+				])
+		_, responses = self.run_client(client, window=0.05)
+		self.assertEqual(responses[1]['result']['name'], 'A4')
+		self.assertIn('error', responses[2])
+
+	def test_internal_error(self):
+		async def failing(value):
+			raise ZeroDivisionError()
+		size_service = service.SizeService()
+		size_service.resolver.classify = failing
+		self.assertEqual(
+			asyncio.run(size_service.request('classify', [100, 0])),
+			(None, 'internal error'))
+
+	def test_invalid_json(self):
+		async def client(reader, writer):
+			writer.write(b'{not json\n')
+			return json.loads((await reader.readline()).decode('utf-8'))
+		_, response = self.run_client(client)
+		self.assertEqual(response, {'id': None, 'error': 'invalid request'})
+
+	@unittest.skipUnless(hasattr(asyncio, 'start_unix_server'), 'no sockets')
+	def test_unix_socket(self):
+		directory = tempfile.mkdtemp()
+		path = os.path.join(directory, 'sizes.sock')
+		async def _run():
+			server = await service.SizeService().start(path=path)
+			reader, writer = await asyncio.open_unix_connection(path)
+			try:
+				return await _exchange(reader, writer, [
+					{'id': 1, 'method': 'name', 'value': [595, 842]}])
+			finally:
+				writer.close()
+				await writer.wait_closed()
+				server.close()
+				await server.wait_closed()
+		try:
+			responses = asyncio.run(_run())
+		finally:
+			shutil.rmtree(directory)
+		self.assertEqual(responses[1]['result'], 'A4')